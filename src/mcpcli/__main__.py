@@ -6,7 +6,7 @@ import logging
 import os
 import signal
 import sys
-from typing import List
+from typing import List, Optional
 
 import anyio
 
@@ -16,15 +16,22 @@ from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Prompt
 
-from mcpcli.chat_handler import handle_chat_mode
-from mcpcli.config import load_config
 from mcpcli.messages.send_ping import send_ping
 from mcpcli.messages.send_prompts import send_prompts_list
 from mcpcli.messages.send_resources import send_resources_list
-from mcpcli.messages.send_initialize_message import send_initialize
-from mcpcli.messages.send_call_tool import send_call_tool
 from mcpcli.messages.send_tools_list import send_tools_list
-from mcpcli.transport.stdio.stdio_client import stdio_client
+from mcpcli.catalog_cache import CatalogCache
+from mcpcli.daemon import MCPDaemon
+from mcpcli.server_manager import (
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_STARTUP_CONCURRENCY,
+    ServerConnection,
+    ServerManager,
+)
+from mcpcli.tool_catalog import ToolCatalog
+from mcpcli.tools_handler import call_route
+from mcpcli.transport.daemon.daemon_client import daemon_supported, default_socket_path
 
 # Default path for the configuration file
 DEFAULT_CONFIG_FILE = "server_config.json"
@@ -52,13 +59,44 @@ def signal_handler(sig, frame):
 signal.signal(signal.SIGINT, signal_handler)
 
 
-async def handle_command(command: str, server_streams: List[tuple]) -> bool:
+async def fetch_list(
+    server: ServerConnection,
+    kind: str,
+    send_list,
+    catalog_cache: Optional[CatalogCache] = None,
+):
+    """
+    Fetch a tools/prompts/resources list, from the catalog cache when enabled.
+
+    `send_list` is called with the server's streams, e.g. send_tools_list, and the
+    bare list under `kind` is returned, the shape ToolCatalog caches tools in. A
+    deferred server is started only if the list has to come from it. The cache
+    may revalidate the list in the background, after the caller has moved on.
+    """
+
+    async def fetch_started():
+        await server.ensure_started()
+        response = await send_list(*server.streams)
+        items = response.get(kind) if isinstance(response, dict) else None
+        return items if isinstance(items, list) else None
+
+    if catalog_cache:
+        return await catalog_cache.get_list(server, kind, fetch_started)
+    return await fetch_started()
+
+
+async def handle_command(
+    command: str,
+    servers: List[ServerConnection],
+    catalog_cache: Optional[CatalogCache] = None,
+) -> bool:
     """Handle specific commands dynamically with multiple servers."""
     try:
         if command == "ping":
             print("[cyan]\nPinging Servers...[/cyan]")
-            for i, (read_stream, write_stream) in enumerate(server_streams):
-                result = await send_ping(read_stream, write_stream)
+            for i, server in enumerate(servers):
+                await server.ensure_started()
+                result = await send_ping(*server.streams)
                 server_num = i + 1
                 if result:
                     ping_md = f"## Server {server_num} Ping Result\n\n✅ **Server is up and running**"
@@ -69,9 +107,13 @@ async def handle_command(command: str, server_streams: List[tuple]) -> bool:
 
         elif command == "list-tools":
             print("[cyan]\nFetching Tools List from all servers...[/cyan]")
-            for i, (read_stream, write_stream) in enumerate(server_streams):
-                response = await send_tools_list(read_stream, write_stream)
-                tools_list = response.get("tools", [])
+            for i, server in enumerate(servers):
+                tools_list = await fetch_list(
+                    server,
+                    "tools",
+                    send_tools_list,
+                    catalog_cache,
+                )
                 server_num = i + 1
 
                 if not tools_list:
@@ -118,7 +160,15 @@ async def handle_command(command: str, server_streams: List[tuple]) -> bool:
                 )
             )
 
-            result = await send_call_tool(tool_name, arguments, server_streams)
+            # send the call only to the server that owns the tool
+            catalog = ToolCatalog(servers, cache=catalog_cache)
+            await catalog.refresh()
+            route = catalog.resolve(tool_name)
+            if not route:
+                print(f"[red]Unknown tool:[/red] {tool_name}")
+                return True
+
+            result = await call_route(route, arguments, catalog)
             if result.get("isError"):
                 print(f"[red]Error calling tool:[/red] {result.get('error')}")
             else:
@@ -132,9 +182,13 @@ async def handle_command(command: str, server_streams: List[tuple]) -> bool:
 
         elif command == "list-resources":
             print("[cyan]\nFetching Resources List from all servers...[/cyan]")
-            for i, (read_stream, write_stream) in enumerate(server_streams):
-                response = await send_resources_list(read_stream, write_stream)
-                resources_list = response.get("resources", []) if response else None
+            for i, server in enumerate(servers):
+                resources_list = await fetch_list(
+                    server,
+                    "resources",
+                    send_resources_list,
+                    catalog_cache,
+                )
                 server_num = i + 1
 
                 if not resources_list:
@@ -157,9 +211,13 @@ async def handle_command(command: str, server_streams: List[tuple]) -> bool:
 
         elif command == "list-prompts":
             print("[cyan]\nFetching Prompts List from all servers...[/cyan]")
-            for i, (read_stream, write_stream) in enumerate(server_streams):
-                response = await send_prompts_list(read_stream, write_stream)
-                prompts_list = response.get("prompts", [])
+            for i, server in enumerate(servers):
+                prompts_list = await fetch_list(
+                    server,
+                    "prompts",
+                    send_prompts_list,
+                    catalog_cache,
+                )
                 server_num = i + 1
 
                 if not prompts_list:
@@ -178,6 +236,37 @@ async def handle_command(command: str, server_streams: List[tuple]) -> bool:
                     )
                 )
 
+        elif command == "stats":
+            for i, server in enumerate(servers):
+                stats = server.session.stream_stats()
+                stats_md = f"## Server {i + 1} Streams\n\n"
+                stats_md += f"State: {server.state} ({server.restarts} restarts)\n\n"
+                if server.idle_stops:
+                    stats_md += (
+                        f"Stopped {server.idle_stops} times while idle, reclaiming "
+                        f"{server.reclaimed_bytes / 2**20:.1f} MiB\n\n"
+                    )
+                stats_md += f"Pending requests: {server.session.pending_count}\n"
+                if server.result_cache.ttls:
+                    cache_stats = server.result_cache.stats()
+                    stats_md += (
+                        f"\nResult cache: {cache_stats['hits']} hits, "
+                        f"{cache_stats['misses']} misses, {cache_stats['entries']} "
+                        f"entries, {cache_stats['evictions']} evictions\n"
+                    )
+                if len(server.replicas) > 1:
+                    stats_md += "\nReplicas (state, pending requests): " + ", ".join(
+                        f"#{r.replica} {r.state} {r.session.pending_count}"
+                        for r in server.replicas
+                    ) + "\n"
+                for direction, counters in stats.items():
+                    stats_md += f"\n### {direction}\n\n" + "\n".join(
+                        f"- **{name}**: {value}" for name, value in counters.items()
+                    )
+                if not stats:
+                    stats_md += "\nNo stream metrics for this transport."
+                print(Panel(Markdown(stats_md), style="bold cyan"))
+
         elif command == "chat":
             provider = os.getenv("LLM_PROVIDER", "openai")
             model = os.getenv("LLM_MODEL", "gpt-4o-mini")
@@ -202,7 +291,42 @@ async def handle_command(command: str, server_streams: List[tuple]) -> bool:
                     title_align="center",
                 )
             )
-            await handle_chat_mode(server_streams, provider, model)
+            # the LLM client libraries are slow to import, so only load them for chat
+            from mcpcli.chat_handler import (
+                DEFAULT_CHAT_TOOL_RENDERING,
+                DEFAULT_CONTEXT_BUDGET,
+                DEFAULT_MAX_TOOLS,
+                DEFAULT_SPILL_THRESHOLD,
+                DEFAULT_TURN_TIMEOUT,
+                handle_chat_mode,
+            )
+
+            stream = os.getenv("LLM_STREAM", "1") != "0"
+            turn_timeout = float(os.getenv("LLM_TURN_TIMEOUT", DEFAULT_TURN_TIMEOUT))
+            context_budget = int(
+                os.getenv("LLM_CONTEXT_BUDGET", DEFAULT_CONTEXT_BUDGET)
+            )
+            summarize_context = os.getenv("LLM_SUMMARIZE_CONTEXT", "0") == "1"
+            spill_threshold = int(
+                os.getenv("LLM_SPILL_THRESHOLD", DEFAULT_SPILL_THRESHOLD)
+            )
+            max_tools = int(os.getenv("LLM_MAX_TOOLS", DEFAULT_MAX_TOOLS))
+            tool_rendering = os.getenv(
+                "LLM_TOOL_RENDERING", DEFAULT_CHAT_TOOL_RENDERING
+            )
+            await handle_chat_mode(
+                servers,
+                provider,
+                model,
+                stream,
+                catalog_cache,
+                turn_timeout or None,
+                context_budget,
+                summarize_context,
+                spill_threshold,
+                max_tools,
+                tool_rendering,
+            )
 
         elif command in ["quit", "exit"]:
             print("\n[bold red]Goodbye![/bold red]")
@@ -222,6 +346,7 @@ async def handle_command(command: str, server_streams: List[tuple]) -> bool:
 - **list-tools**: Display available tools
 - **list-resources**: Display available resources
 - **list-prompts**: Display available prompts
+- **stats**: Show stream buffer and backpressure counters
 - **chat**: Enter chat mode
 - **clear**: Clear the screen
 - **help**: Show this help message
@@ -246,7 +371,9 @@ async def get_input():
     return await loop.run_in_executor(None, lambda: input().strip().lower())
 
 
-async def interactive_mode(server_streams: List[tuple]):
+async def interactive_mode(
+    servers: List[ServerConnection], catalog_cache: Optional[CatalogCache] = None
+):
     """Run the CLI in interactive mode with multiple servers."""
     welcome_text = """
 # Welcome to the Interactive MCP Command-Line Tool (Multi-Server Mode)
@@ -260,7 +387,7 @@ Type 'help' for available commands or 'quit' to exit.
             command = Prompt.ask("[bold green]\n>[/bold green]").strip().lower()
             if not command:
                 continue
-            should_continue = await handle_command(command, server_streams)
+            should_continue = await handle_command(command, servers, catalog_cache)
             if not should_continue:
                 return
         except EOFError:
@@ -275,7 +402,17 @@ class GracefulExit(Exception):
     pass
 
 
-async def run(config_path: str, server_names: List[str], command: str = None) -> None:
+async def run(
+    config_path: str,
+    server_names: List[str],
+    command: str = None,
+    startup_concurrency: int = DEFAULT_STARTUP_CONCURRENCY,
+    daemon_socket: str = None,
+    use_catalog_cache: bool = True,
+    heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+    lazy: bool = False,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+) -> None:
     """Main function to manage server initialization, communication, and shutdown."""
     # Clear screen before rendering anything
     if sys.platform == "win32":
@@ -283,35 +420,90 @@ async def run(config_path: str, server_names: List[str], command: str = None) ->
     else:
         os.system("clear")
 
-    # Load server configurations and establish connections for all servers
-    server_streams = []
-    context_managers = []
-    for server_name in server_names:
-        server_params = await load_config(config_path, server_name)
-
-        # Establish stdio communication for each server
-        cm = stdio_client(server_params)
-        (read_stream, write_stream) = await cm.__aenter__()
-        context_managers.append(cm)
-        server_streams.append((read_stream, write_stream))
-
-        init_result = await send_initialize(read_stream, write_stream)
-        if not init_result:
-            print(f"[red]Server initialization failed for {server_name}[/red]")
+    # Spawn and initialize all servers concurrently, or attach to the daemon's.
+    # Lazily, only servers whose tools are not cached are started up front; the
+    # rest are spawned by the first call to one of their tools.
+    lazy = lazy and use_catalog_cache
+    async with ServerManager(
+        config_path,
+        server_names,
+        startup_concurrency=startup_concurrency,
+        daemon_socket=daemon_socket,
+        heartbeat_interval=heartbeat_interval,
+        lazy=lazy,
+        idle_timeout=idle_timeout,
+    ) as manager, anyio.create_task_group() as background:
+        # serve cached lists instantly, revalidating them in the background
+        catalog_cache = CatalogCache(background) if use_catalog_cache else None
+        servers = manager.ordered_connections()
+        if lazy:
+            await manager.start(
+                [
+                    server.name
+                    for server in servers
+                    if not catalog_cache.has_list(server, "tools")
+                ]
+            )
+            servers = [s for s in servers if s.name not in manager.failures]
+
+        print_startup_summary(manager)
+        if manager.failures and not servers:
             return
 
-    try:
+        if catalog_cache:
+            for server in servers:
+                catalog_cache.watch(server)
+
         if command:
             # Single command mode
-            await handle_command(command, server_streams)
+            await handle_command(command, servers, catalog_cache)
         else:
             # Interactive mode
-            await interactive_mode(server_streams)
-    finally:
-        # Clean up all streams
-        for cm in context_managers:
-            with anyio.move_on_after(1):  # wait up to 1 second
-                await cm.__aexit__()
+            await interactive_mode(servers, catalog_cache)
+
+
+async def serve(
+    config_path: str,
+    server_names: List[str],
+    socket_path: str,
+    startup_concurrency: int = DEFAULT_STARTUP_CONCURRENCY,
+    heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+) -> int:
+    """Keep the servers running and serve them to thin clients over a Unix socket."""
+    async with ServerManager(
+        config_path,
+        server_names,
+        startup_concurrency=startup_concurrency,
+        heartbeat_interval=heartbeat_interval,
+    ) as manager:
+        print_startup_summary(manager)
+        if not manager.connections:
+            return 1
+
+        print(f"[cyan]Serving {len(manager.connections)} server(s) on {socket_path}[/cyan]")
+        await MCPDaemon(manager, socket_path).serve()
+
+
+def print_startup_summary(manager: ServerManager) -> None:
+    """Report each server's handshake time, or why it failed to start."""
+    for server_name in manager.server_names:
+        conn = manager.get(server_name)
+        if server_name in manager.failures:
+            print(
+                f"[red]Server initialization failed for {server_name}:[/red] "
+                f"{manager.failures[server_name]}"
+            )
+        elif conn and conn.state == "stopped":
+            print(f"[green]Server {server_name} will start on first use[/green]")
+        elif conn and conn.transport == "daemon":
+            print(
+                f"[green]Server {server_name} attached via daemon in {conn.startup_time:.2f}s[/green]"
+            )
+        elif conn:
+            print(
+                f"[green]Server {server_name} initialized in {conn.startup_time:.2f}s[/green]"
+            )
+
 
 def cli_main():
     # setup the parser
@@ -331,11 +523,69 @@ def cli_main():
         default=[],
     )
 
+    parser.add_argument(
+        "--startup-concurrency",
+        type=int,
+        default=DEFAULT_STARTUP_CONCURRENCY,
+        help="Maximum number of servers to spawn and initialize at the same time.",
+    )
+
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help=(
+            "Start a server only when one of its tools is first called, advertising "
+            "its tools from the catalog cache until then."
+        ),
+    )
+
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help=(
+            "Seconds without requests after which a server is stopped; it is "
+            "respawned by the next request. Defaults to 0, which never stops it."
+        ),
+    )
+
+    parser.add_argument(
+        "--heartbeat-interval",
+        type=float,
+        default=DEFAULT_HEARTBEAT_INTERVAL,
+        help=(
+            "Seconds between pings that check each server is alive; unresponsive or "
+            "exited servers are restarted. 0 disables the pings."
+        ),
+    )
+
     parser.add_argument(
         "command",
         nargs="?",
-        choices=["ping", "list-tools", "list-resources", "list-prompts"],
-        help="Command to execute (optional - if not provided, enters interactive mode).",
+        choices=[
+            "ping",
+            "list-tools",
+            "list-resources",
+            "list-prompts",
+            "stats",
+            "serve",
+        ],
+        help=(
+            "Command to execute (optional - if not provided, enters interactive mode). "
+            "'serve' runs a daemon that keeps the servers warm for later invocations."
+        ),
+    )
+
+    parser.add_argument(
+        "--daemon-socket",
+        default=default_socket_path() if daemon_supported() else None,
+        help="Unix socket of the 'serve' daemon. Defaults to a per-user socket.",
+    )
+
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Always spawn servers directly, even if the daemon is running.",
     )
 
     parser.add_argument(
@@ -350,6 +600,70 @@ def cli_main():
         help=("Model to use. Defaults to 'gpt-4o-mini' for openai, 'claude-3-5-haiku-latest' for anthropic and 'qwen2.5-coder' for ollama"),
     )
 
+    parser.add_argument(
+        "--no-catalog-cache",
+        action="store_true",
+        help="Always fetch tool, prompt and resource lists from the servers.",
+    )
+
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Wait for complete LLM responses instead of streaming them in chat mode.",
+    )
+
+    parser.add_argument(
+        "--turn-timeout",
+        type=float,
+        help=(
+            "Seconds a chat turn may take, including all of its tool calls. "
+            "Defaults to 300; 0 disables the limit."
+        ),
+    )
+
+    parser.add_argument(
+        "--context-budget",
+        type=int,
+        help=(
+            "Tokens of conversation history sent with each chat request; older "
+            "turns are compacted to fit. Defaults to 100000; 0 disables the limit."
+        ),
+    )
+
+    parser.add_argument(
+        "--summarize-context",
+        action="store_true",
+        help="Summarize earlier chat turns with the LLM instead of dropping them.",
+    )
+
+    parser.add_argument(
+        "--spill-threshold",
+        type=int,
+        help=(
+            "Characters above which a tool result is kept on disk and only a "
+            "preview is sent to the LLM. Defaults to 32768; 0 disables spilling."
+        ),
+    )
+
+    parser.add_argument(
+        "--max-tools",
+        type=int,
+        help=(
+            "Tools sent with each chat request, picked by relevance to the message "
+            "plus the recently used ones. Defaults to 0, which sends every tool."
+        ),
+    )
+
+    parser.add_argument(
+        "--tool-rendering",
+        choices=["full", "compact", "names"],
+        help=(
+            "How tools are written into the chat system prompt: indented JSON, "
+            "minified JSON in a stable order (the default), or only their names "
+            "and descriptions."
+        ),
+    )
+
     args = parser.parse_args()
 
     # Set default model based on provider
@@ -360,9 +674,44 @@ def cli_main():
     )
     os.environ["LLM_PROVIDER"] = args.provider
     os.environ["LLM_MODEL"] = model
+    os.environ["LLM_STREAM"] = "0" if args.no_stream else "1"
+    if args.turn_timeout is not None:
+        os.environ["LLM_TURN_TIMEOUT"] = str(args.turn_timeout)
+    if args.context_budget is not None:
+        os.environ["LLM_CONTEXT_BUDGET"] = str(args.context_budget)
+    os.environ["LLM_SUMMARIZE_CONTEXT"] = "1" if args.summarize_context else "0"
+    if args.spill_threshold is not None:
+        os.environ["LLM_SPILL_THRESHOLD"] = str(args.spill_threshold)
+    if args.max_tools is not None:
+        os.environ["LLM_MAX_TOOLS"] = str(args.max_tools)
+    if args.tool_rendering:
+        os.environ["LLM_TOOL_RENDERING"] = args.tool_rendering
 
     try:
-        result = anyio.run(run, args.config_file, args.servers, args.command)
+        if args.command == "serve":
+            if not args.daemon_socket:
+                parser.error("The 'serve' daemon requires Unix socket support.")
+            result = anyio.run(
+                serve,
+                args.config_file,
+                args.servers,
+                args.daemon_socket,
+                args.startup_concurrency,
+                args.heartbeat_interval,
+            )
+        else:
+            result = anyio.run(
+                run,
+                args.config_file,
+                args.servers,
+                args.command,
+                args.startup_concurrency,
+                None if args.no_daemon else args.daemon_socket,
+                not args.no_catalog_cache,
+                args.heartbeat_interval,
+                args.lazy,
+                args.idle_timeout,
+            )
         sys.exit(result)
     except Exception as e:
         print(f"[red]Error occurred:[/red] {e}")
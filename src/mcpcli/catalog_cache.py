@@ -0,0 +1,237 @@
+# catalog_cache.py
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from anyio.abc import TaskGroup
+
+from mcpcli.server_manager import ServerConnection
+from mcpcli.transport.http.http_server_parameters import HttpServerParameters
+from mcpcli.transport.inprocess.inprocess_server_parameters import (
+    InProcessServerParameters,
+)
+
+# Default directory for cached server catalogs
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "mcp-cli",
+    "catalog",
+)
+
+# Bump when the on-disk format changes; older files are ignored
+CACHE_FORMAT_VERSION = 1
+
+# The lists that can be cached, and the notification that invalidates each
+LIST_CHANGED_NOTIFICATIONS = {
+    "tools": "notifications/tools/list_changed",
+    "prompts": "notifications/prompts/list_changed",
+    "resources": "notifications/resources/list_changed",
+}
+
+
+# File mapping launch identities to the server identity last seen for each
+LAUNCH_INDEX_FILE = "launches.json"
+
+
+def _launch_key(server: ServerConnection) -> dict:
+    if isinstance(server.params, HttpServerParameters):
+        return {"url": server.params.url}
+    if isinstance(server.params, InProcessServerParameters):
+        return {"entry_point": server.params.entry_point}
+    return {
+        "command": server.params.command,
+        "args": server.params.args,
+        "env": server.params.env or {},
+    }
+
+
+def server_identity(server: ServerConnection) -> str:
+    """
+    Identify a server by how it is launched and what it reports itself to be.
+
+    A change to the command, arguments or environment (the URL of an HTTP server, the
+    entry point of an in-process one),
+    or a new server name or version in the initialize result, yields a new identity
+    and so a fresh cache.
+    """
+    server_info = server.init_result.serverInfo
+    key = {
+        **_launch_key(server),
+        "name": server_info.name,
+        "version": server_info.version,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def launch_identity(server: ServerConnection) -> str:
+    """Identify a server by how it is launched alone, as known before it starts."""
+    key = json.dumps(_launch_key(server), sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class CatalogCache:
+    """
+    Persistent cache of the tool, prompt and resource lists of each server.
+
+    Cached lists are served immediately and revalidated once per session in the
+    background (stale-while-revalidate). A `notifications/*/list_changed` from the
+    server drops the matching list, so the next read fetches it from the server.
+
+    Lists of a server that has not been started yet are found through the identity
+    it had the last time it ran with the same launch settings. Such lists are not
+    revalidated until the server is running, so serving them never spawns it.
+    """
+
+    def __init__(self, task_group: TaskGroup, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.task_group = task_group
+        self.cache_dir = cache_dir
+        self._entries: Dict[str, dict] = {}
+        self._launches: Optional[Dict[str, str]] = None
+        self._revalidated = set()
+
+    def _path(self, identity: str) -> str:
+        return os.path.join(self.cache_dir, f"{identity}.json")
+
+    def _entry(self, identity: str) -> dict:
+        """Return the cached lists of a server, reading them from disk on first use."""
+        if identity not in self._entries:
+            entry = {}
+            try:
+                with open(self._path(identity), "r") as cache_file:
+                    data = json.load(cache_file)
+                if data.get("version") == CACHE_FORMAT_VERSION:
+                    entry = data.get("lists", {})
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logging.debug(f"Ignoring unreadable catalog cache {identity}: {e}")
+            self._entries[identity] = entry
+        return self._entries[identity]
+
+    def _save(self, identity: str) -> None:
+        """Write a server's cached lists atomically."""
+        self._write(
+            self._path(identity),
+            {"version": CACHE_FORMAT_VERSION, "lists": self._entries[identity]},
+        )
+
+    def _write(self, path: str, data: dict) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as cache_file:
+                json.dump(data, cache_file)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Unable to write catalog cache {path}: {e}")
+
+    def _launch_index(self) -> Dict[str, str]:
+        """Return the launch identity -> server identity index, reading it on first use."""
+        if self._launches is None:
+            self._launches = {}
+            try:
+                with open(os.path.join(self.cache_dir, LAUNCH_INDEX_FILE)) as index_file:
+                    data = json.load(index_file)
+                if data.get("version") == CACHE_FORMAT_VERSION:
+                    self._launches = data.get("launches", {})
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logging.debug(f"Ignoring unreadable catalog launch index: {e}")
+        return self._launches
+
+    def identity(self, server: ServerConnection) -> Optional[str]:
+        """
+        Return the identity a server's lists are cached under.
+
+        For a server that has not been initialized, this is the identity it last ran
+        with, or None if it never ran with its current launch settings.
+        """
+        launches = self._launch_index()
+        if server.init_result is None:
+            return launches.get(launch_identity(server))
+
+        identity = server_identity(server)
+        launch = launch_identity(server)
+        if launches.get(launch) != identity:
+            launches[launch] = identity
+            self._write(
+                os.path.join(self.cache_dir, LAUNCH_INDEX_FILE),
+                {"version": CACHE_FORMAT_VERSION, "launches": launches},
+            )
+        return identity
+
+    def has_list(self, server: ServerConnection, kind: str) -> bool:
+        """Whether a list of `kind` is cached for the server."""
+        identity = self.identity(server)
+        return identity is not None and self.load(identity, kind) is not None
+
+    def load(self, identity: str, kind: str) -> Optional[Any]:
+        """Return a cached list, or None if it is not cached."""
+        return self._entry(identity).get(kind)
+
+    def store(self, identity: str, kind: str, value: Any) -> None:
+        self._entry(identity)[kind] = value
+        self._save(identity)
+
+    def invalidate(self, identity: str, kind: str) -> None:
+        if self._entry(identity).pop(kind, None) is not None:
+            logging.debug(f"Invalidated cached {kind} list of {identity}")
+            self._save(identity)
+
+    def watch(self, server: ServerConnection) -> None:
+        """Drop cached lists when the server reports that they changed."""
+        for kind, method in LIST_CHANGED_NOTIFICATIONS.items():
+            server.session.on_notification(
+                method,
+                lambda message, kind=kind: self.invalidate(self.identity(server), kind),
+            )
+
+    async def get_list(
+        self,
+        server: ServerConnection,
+        kind: str,
+        fetch: Callable[[], Awaitable[Any]],
+        on_change: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """
+        Return a server's list of `kind`, from the cache when possible.
+
+        On a hit, the list is refetched in the background; if it differs, the cache is
+        updated and `on_change` is called. On a miss, the list is fetched and cached.
+        """
+        identity = self.identity(server)
+        cached = self.load(identity, kind) if identity else None
+        if cached is None:
+            value = await fetch()
+            # fetching may have started the server, and so settled its identity
+            identity = self.identity(server)
+            if value is not None and identity:
+                self.store(identity, kind, value)
+            self._revalidated.add((identity, kind))
+            return value
+
+        if server.state != "stopped" and (identity, kind) not in self._revalidated:
+            self._revalidated.add((identity, kind))
+            self.task_group.start_soon(
+                self._revalidate, identity, kind, fetch, cached, on_change
+            )
+        return cached
+
+    async def _revalidate(self, identity, kind, fetch, cached, on_change) -> None:
+        try:
+            value = await fetch()
+        except Exception as e:
+            logging.debug(f"Unable to revalidate cached {kind} list: {e}")
+            return
+
+        if value is None or value == cached:
+            return
+
+        logging.debug(f"Cached {kind} list of {identity} was out of date")
+        self.store(identity, kind, value)
+        if on_change:
+            on_change()
@@ -1,32 +1,85 @@
 # chat_handler.py
 import json
+import time
 
-from rich import print
+import anyio
+
+from rich import get_console, print
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Prompt
 
+from mcpcli.context_budget import DEFAULT_CONTEXT_BUDGET, ContextBudget, llm_summarizer
 from mcpcli.llm_client import LLMClient
+from mcpcli.result_spill import DEFAULT_SPILL_THRESHOLD, ResultSpill
 from mcpcli.system_prompt_generator import SystemPromptGenerator
-from mcpcli.tools_handler import convert_to_openai_tools, fetch_tools, handle_tool_call
+from mcpcli.tool_catalog import ToolCatalog
+from mcpcli.tool_selector import DEFAULT_MAX_TOOLS, ToolSelector
+from mcpcli.tools_handler import convert_to_openai_tools, handle_tool_calls
+
+# Seconds between Markdown re-renders of a streaming response
+STREAM_RENDER_INTERVAL = 0.1
+
+# Seconds a chat turn may take, including every LLM and tool call it makes
+DEFAULT_TURN_TIMEOUT = 300
+
+# How tools are written into the system prompt; every provider also receives
+# them in the request's tools parameter
+DEFAULT_CHAT_TOOL_RENDERING = "compact"
+
+
+async def handle_chat_mode(
+    servers,
+    provider="openai",
+    model="gpt-4o-mini",
+    stream=True,
+    catalog_cache=None,
+    turn_timeout=DEFAULT_TURN_TIMEOUT,
+    context_budget=DEFAULT_CONTEXT_BUDGET,
+    summarize_context=False,
+    spill_threshold=DEFAULT_SPILL_THRESHOLD,
+    max_tools=DEFAULT_MAX_TOOLS,
+    tool_rendering=DEFAULT_CHAT_TOOL_RENDERING,
+):
+    """
+    Enter chat mode with multi-call support for autonomous tool chaining.
+
+    Each turn runs under one deadline of `turn_timeout` seconds. Requests to the
+    servers made during the turn are bounded by what is left of it, and a turn
+    that runs out is dropped from the conversation.
 
+    The history sent to the LLM is kept within `context_budget` tokens (0 for no
+    limit) by eliding old tool results, then summarizing earlier turns if
+    `summarize_context` is set, then dropping the oldest turns. Tool results over
+    `spill_threshold` characters (0 for no limit) are kept on disk for the session,
+    with a preview in the history that the LLM can page through.
 
-async def handle_chat_mode(server_streams, provider="openai", model="gpt-4o-mini"):
-    """Enter chat mode with multi-call support for autonomous tool chaining."""
+    With `max_tools`, each turn sends only the tools most relevant to the user's
+    message, plus the ones called recently, instead of the whole catalog.
+    `tool_rendering` sets how the tools are written into the system prompt.
+    """
+    spill = ResultSpill(spill_threshold) if spill_threshold else None
     try:
-        tools = []
-        for read_stream, write_stream in server_streams:
-            tools.extend(await fetch_tools(read_stream, write_stream))
+        # index every server's tools so each call goes straight to its owner
+        catalog = ToolCatalog(servers, cache=catalog_cache)
+        await catalog.refresh()
+        catalog.watch()
 
-        # for (read_stream, write_stream) in server_streams:
-        # tools = await fetch_tools(read_stream, write_stream)
-        if not tools:
+        if not catalog.tools:
             print("[red]No tools available. Exiting chat mode.[/red]")
             return
+        tools = advertised_tools(catalog.tools, spill)
+        selector = ToolSelector(catalog.tools, max_tools) if max_tools else None
 
-        system_prompt = generate_system_prompt(tools)
+        system_prompt = generate_system_prompt(tools, tool_rendering)
         openai_tools = convert_to_openai_tools(tools)
         client = LLMClient(provider=provider, model=model)
+        budget = None
+        if context_budget:
+            budget = ContextBudget(
+                context_budget, llm_summarizer(client) if summarize_context else None
+            )
         conversation_history = [{"role": "system", "content": system_prompt}]
 
         while True:
@@ -41,27 +94,158 @@ async def handle_chat_mode(server_streams, provider="openai", model="gpt-4o-mini
                 user_panel_text = user_message if user_message else "[No Message]"
                 print(Panel(user_panel_text, style="bold yellow", title="You"))
 
-                conversation_history.append({"role": "user", "content": user_message})
-                await process_conversation(
-                    client, conversation_history, openai_tools, server_streams
+                # pick up tool lists that changed since the last turn
+                if await catalog.refresh_if_stale() and selector:
+                    selector.index(catalog.tools)
+                turn_tools = advertised_tools(
+                    selector.select(user_message) if selector else catalog.tools, spill
                 )
+                if turn_tools != tools:
+                    tools = turn_tools
+                    conversation_history[0]["content"] = generate_system_prompt(
+                        tools, tool_rendering
+                    )
+                    openai_tools = convert_to_openai_tools(tools)
+
+                user_entry = {"role": "user", "content": user_message}
+                conversation_history.append(user_entry)
+                with anyio.move_on_after(turn_timeout) as turn:
+                    await process_conversation(
+                        client,
+                        conversation_history,
+                        openai_tools,
+                        catalog,
+                        stream,
+                        budget,
+                        spill,
+                    )
+                if turn.cancelled_caught:
+                    # keep tool calls and their results paired for the next turn;
+                    # compaction may have moved the turn's start
+                    turn_start = next(
+                        index
+                        for index, message in enumerate(conversation_history)
+                        if message is user_entry
+                    )
+                    del conversation_history[turn_start:]
+                    print(f"[red]Turn timed out after {turn_timeout} seconds.[/red]")
+                elif selector:
+                    record_tool_uses(selector, conversation_history, user_entry)
 
             except Exception as e:
                 print(f"[red]Error processing message:[/red] {e}")
                 continue
+
+        # release the pooled LLM connections
+        await client.aclose()
     except Exception as e:
         print(f"[red]Error in chat mode:[/red] {e}")
+    finally:
+        if spill:
+            spill.close()
+
+
+def advertised_tools(tools, spill=None):
+    """The tools to offer the LLM, plus the tool paging through spilled results."""
+    return tools + [spill.tool] if spill else tools
+
+
+def record_tool_uses(selector, conversation_history, user_entry):
+    """Tell the selector which tools were called since the turn's user message."""
+    turn_start = next(
+        index
+        for index, message in enumerate(conversation_history)
+        if message is user_entry
+    )
+    for message in conversation_history[turn_start + 1 :]:
+        for tool_call in message.get("tool_calls") or []:
+            selector.record_use(tool_call["function"]["name"])
+
+
+class StreamingMarkdownRenderer:
+    """
+    Render a streamed assistant response live in the terminal.
+
+    The Markdown is re-rendered at most once per `render_interval` and only the lines
+    that fit on screen are shown while streaming, so the cost of each render stays
+    bounded however long the response grows. The complete response is printed once
+    when the stream ends.
+    """
+
+    def __init__(self, render_interval: float = STREAM_RENDER_INTERVAL):
+        self.render_interval = render_interval
+        self.text = ""
+        self._console = get_console()
+        self._live = None
+        self._last_render = 0.0
+
+    def __enter__(self) -> "StreamingMarkdownRenderer":
+        self._live = Live(console=self._console, auto_refresh=False, transient=True)
+        self._live.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._live.stop()
+        if self.text:
+            print(Panel(Markdown(self.text), style="bold blue", title="Assistant"))
+
+    def append(self, delta: str) -> None:
+        self.text += delta
+        now = time.monotonic()
+        if now - self._last_render >= self.render_interval:
+            self._last_render = now
+            self._render()
+
+    def _render(self) -> None:
+        # leave room for the panel border
+        visible_lines = max(1, self._console.height - 4)
+        tail = "\n".join(self.text.rsplit("\n", visible_lines)[-visible_lines:])
+        self._live.update(
+            Panel(Markdown(tail), style="bold blue", title="Assistant"), refresh=True
+        )
+
+
+async def stream_completion(client, conversation_history, openai_tools):
+    """Stream a completion, rendering its text live, and return the assembled result."""
+    completion = {}
+    with StreamingMarkdownRenderer() as renderer:
+        async for event in client.astream_completion(
+            messages=conversation_history,
+            tools=openai_tools,
+        ):
+            if event["type"] == "delta":
+                renderer.append(event["text"])
+            else:
+                completion = event
+    return completion
 
 
 async def process_conversation(
-    client, conversation_history, openai_tools, server_streams
+    client,
+    conversation_history,
+    openai_tools,
+    catalog,
+    stream=False,
+    budget=None,
+    spill=None,
 ):
-    """Process the conversation loop, handling tool calls and responses."""
+    """
+    Process the conversation loop, handling tool calls and responses.
+
+    With a `budget`, the history is compacted to fit it before each request.
+    """
     while True:
-        completion = client.create_completion(
-            messages=conversation_history,
-            tools=openai_tools,
-        )
+        if budget:
+            await budget.enforce(conversation_history)
+        if stream:
+            completion = await stream_completion(
+                client, conversation_history, openai_tools
+            )
+        else:
+            completion = await client.acreate_completion(
+                messages=conversation_history,
+                tools=openai_tools,
+            )
 
         response_content = completion.get("response", "No response")
         tool_calls = completion.get("tool_calls", [])
@@ -98,25 +282,31 @@ async def process_conversation(
                     )
                 )
 
-                await handle_tool_call(tool_call, conversation_history, server_streams)
+            # run every tool call from this completion concurrently
+            await handle_tool_calls(tool_calls, conversation_history, catalog, spill)
             continue
 
-        # Assistant panel with Markdown
-        assistant_panel_text = response_content if response_content else "[No Response]"
-        print(
-            Panel(Markdown(assistant_panel_text), style="bold blue", title="Assistant")
-        )
+        # Assistant panel with Markdown (already shown if it was streamed)
+        if not (stream and response_content):
+            assistant_panel_text = (
+                response_content if response_content else "[No Response]"
+            )
+            print(
+                Panel(
+                    Markdown(assistant_panel_text), style="bold blue", title="Assistant"
+                )
+            )
         conversation_history.append({"role": "assistant", "content": response_content})
         break
 
 
-def generate_system_prompt(tools):
+def generate_system_prompt(tools, tool_rendering=DEFAULT_CHAT_TOOL_RENDERING):
     """
     Generate a concise system prompt for the assistant.
 
     This prompt is internal and not displayed to the user.
     """
-    prompt_generator = SystemPromptGenerator()
+    prompt_generator = SystemPromptGenerator(tool_rendering)
     tools_json = {"tools": tools}
 
     system_prompt = prompt_generator.generate_prompt(tools_json)
@@ -1,12 +1,56 @@
 # config.py
 import json
 import logging
+from typing import Union
 
+from mcpcli.deadline_policy import DEFAULT_RETRIES, DeadlinePolicy
+from mcpcli.transport.http.http_server_parameters import HttpServerParameters
+from mcpcli.transport.inprocess.inprocess_server_parameters import (
+    InProcessServerParameters,
+)
+from mcpcli.tool_result_cache import DEFAULT_MAX_ENTRIES, ToolResultCache
 from mcpcli.transport.stdio.stdio_server_parameters import StdioServerParameters
 
+# How to reach a server: spawn it (`command`), connect to it (`url`) or import it
+# into this process (`entryPoint`)
+ServerParameters = Union[
+    StdioServerParameters, HttpServerParameters, InProcessServerParameters
+]
 
-async def load_config(config_path: str, server_name: str) -> StdioServerParameters:
-    """Load the server configuration from a JSON file."""
+# Optional per-server settings and the StdioServerParameters fields they set
+SERVER_OPTIONS = {
+    "maxFrameBytes": "max_frame_bytes",
+    "readBufferSize": "read_buffer_size",
+    "writeBufferSize": "write_buffer_size",
+    "notificationPolicy": "notification_policy",
+}
+
+# Optional settings of servers reached over HTTP, and the fields they set
+HTTP_SERVER_OPTIONS = {
+    "headers": "headers",
+    "maxConnections": "max_connections",
+    "keepaliveExpiry": "keepalive_expiry",
+    "readBufferSize": "read_buffer_size",
+    "writeBufferSize": "write_buffer_size",
+    "notificationPolicy": "notification_policy",
+}
+
+# Optional settings of servers run in this process, and the fields they set
+INPROCESS_SERVER_OPTIONS = {
+    "readBufferSize": "read_buffer_size",
+    "writeBufferSize": "write_buffer_size",
+    "notificationPolicy": "notification_policy",
+}
+
+
+async def load_config(config_path: str, server_name: str) -> ServerParameters:
+    """
+    Load the server configuration from a JSON file.
+
+    A server with a `url` is reached over Streamable HTTP, and one with an
+    `entryPoint` (`module:object`) is imported and run in this process; otherwise
+    its `command` is spawned and spoken to over stdio.
+    """
     try:
         # debug
         logging.debug(f"Loading config from {config_path}")
@@ -22,11 +66,41 @@ async def load_config(config_path: str, server_name: str) -> StdioServerParamete
             logging.error(error_msg)
             raise ValueError(error_msg)
 
+        # A server already running as an HTTP service
+        if "url" in server_config:
+            options = {
+                field: server_config[key]
+                for key, field in HTTP_SERVER_OPTIONS.items()
+                if key in server_config
+            }
+            result = HttpServerParameters(url=server_config["url"], **options)
+            logging.debug(f"Loaded config: url='{result.url}'")
+            return result
+
+        # A Python server run in this process
+        if "entryPoint" in server_config:
+            options = {
+                field: server_config[key]
+                for key, field in INPROCESS_SERVER_OPTIONS.items()
+                if key in server_config
+            }
+            result = InProcessServerParameters(
+                entry_point=server_config["entryPoint"], **options
+            )
+            logging.debug(f"Loaded config: entry_point='{result.entry_point}'")
+            return result
+
         # Construct the server parameters
+        options = {
+            field: server_config[key]
+            for key, field in SERVER_OPTIONS.items()
+            if key in server_config
+        }
         result = StdioServerParameters(
             command=server_config["command"],
             args=server_config.get("args", []),
             env=server_config.get("env"),
+            **options,
         )
 
         # debug
@@ -51,3 +125,28 @@ async def load_config(config_path: str, server_name: str) -> StdioServerParamete
         # error
         logging.error(str(e))
         raise
+
+
+async def load_server_settings(config_path: str, server_name: str) -> dict:
+    """Return a server's entry from the JSON file, for its client-side settings."""
+    with open(config_path, "r") as config_file:
+        config = json.load(config_file)
+    return config.get("mcpServers", {}).get(server_name) or {}
+
+
+async def load_deadline_policy(config_path: str, server_name: str) -> DeadlinePolicy:
+    """Load a server's request timeouts and retries from the JSON file."""
+    server_config = await load_server_settings(config_path, server_name)
+    return DeadlinePolicy(
+        timeouts=server_config.get("timeouts"),
+        retries=int(server_config.get("retries", DEFAULT_RETRIES)),
+    )
+
+
+async def load_result_cache(config_path: str, server_name: str) -> ToolResultCache:
+    """Create a server's tool result cache from the tools allowlisted in the JSON file."""
+    server_config = await load_server_settings(config_path, server_name)
+    return ToolResultCache(
+        ttls=server_config.get("cacheTools"),
+        max_entries=int(server_config.get("cacheSize", DEFAULT_MAX_ENTRIES)),
+    )
@@ -0,0 +1,231 @@
+# context_budget.py
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Tokens of conversation history sent with each chat request
+DEFAULT_CONTEXT_BUDGET = 100_000
+
+# Rough size of a token when no tokenizer is installed
+CHARS_PER_TOKEN = 4
+
+# Tokens each message costs on top of its content (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Characters of an elided tool result kept in the history
+ELIDED_PREVIEW_CHARS = 500
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+SUMMARY_INSTRUCTIONS = (
+    "Summarize the following conversation between a user, an assistant and its "
+    "tools. Keep the user's goals, decisions made, facts learned from tool results "
+    "(names, identifiers, numbers) and anything left to do. Be concise."
+)
+
+# (messages to summarize) -> summary text
+Summarizer = Callable[[List[dict]], Awaitable[str]]
+
+_encoding = None
+_encoding_loaded = False
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a text.
+
+    Uses tiktoken's cl100k_base encoding when tiktoken is installed, and an
+    estimate of one token per four characters otherwise.
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = None
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def message_text(message: dict) -> str:
+    """The text of a message that counts against the context: content and tool calls."""
+    text = message.get("content") or ""
+    if not isinstance(text, str):
+        text = json.dumps(text)
+    if message.get("tool_calls"):
+        text += json.dumps(message["tool_calls"])
+    return text
+
+
+def elide(text: str, preview_chars: int = ELIDED_PREVIEW_CHARS) -> str:
+    """Keep the start of a long text and say how much was left out."""
+    return (
+        f"{text[:preview_chars]}\n[... {len(text) - preview_chars} more characters "
+        "elided to fit the context budget]"
+    )
+
+
+def render_transcript(messages: List[dict]) -> str:
+    """Render messages as plain text, for a summarizer to read."""
+    lines = []
+    for message in messages:
+        if message.get("tool_calls"):
+            for tool_call in message["tool_calls"]:
+                function = tool_call["function"]
+                lines.append(f"assistant called {function['name']}({function['arguments']})")
+        if message.get("content"):
+            label = message.get("name") if message["role"] == "tool" else message["role"]
+            lines.append(f"{label}: {message['content']}")
+    return "\n".join(lines)
+
+
+def llm_summarizer(client) -> Summarizer:
+    """A summarizer asking an LLMClient for a summary of the messages."""
+
+    async def summarize(messages: List[dict]) -> str:
+        completion = await client.acreate_completion(
+            messages=[
+                {"role": "system", "content": SUMMARY_INSTRUCTIONS},
+                {"role": "user", "content": render_transcript(messages)},
+            ]
+        )
+        return completion.get("response") or ""
+
+    return summarize
+
+
+class ContextBudget:
+    """
+    Keep a conversation history within a token budget.
+
+    `enforce` is called before each request to the LLM. While the history is over
+    `max_tokens`, it compacts the turns before the current one, in order:
+
+    1. Tool results are elided to a short preview, oldest first.
+    2. With a `summarize` function, the earlier turns are replaced by a summary.
+    3. The oldest turns are dropped whole.
+
+    Only then are tool results of the current turn elided. The system prompt is
+    kept, and tool calls are only ever removed together with their results, so
+    every tool_call_id still has its answer. Token counts are cached per message.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = DEFAULT_CONTEXT_BUDGET,
+        summarize: Optional[Summarizer] = None,
+    ):
+        self.max_tokens = max_tokens
+        self.summarize = summarize
+        self.elided = 0
+        self.summaries = 0
+        self.dropped_turns = 0
+        # id(message) -> (content, tool_calls, tokens)
+        self._counts: Dict[int, Tuple[Any, Any, int]] = {}
+
+    def message_tokens(self, message: dict) -> int:
+        content, tool_calls = message.get("content"), message.get("tool_calls")
+        cached = self._counts.get(id(message))
+        if cached and cached[0] is content and cached[1] is tool_calls:
+            return cached[2]
+        tokens = MESSAGE_OVERHEAD_TOKENS + count_tokens(message_text(message))
+        self._counts[id(message)] = (content, tool_calls, tokens)
+        return tokens
+
+    def total_tokens(self, history: List[dict]) -> int:
+        return sum(self.message_tokens(message) for message in history)
+
+    async def enforce(self, history: List[dict]) -> int:
+        """Compact the history in place until it fits the budget. Returns its tokens."""
+        total = self.total_tokens(history)
+        if total <= self.max_tokens:
+            return total
+        before = total
+
+        total = self._elide_tool_results(history, total, self._old_range(history))
+        if total > self.max_tokens and self.summarize:
+            total = await self._summarize_old_turns(history, total)
+        while total > self.max_tokens:
+            start, end = self._old_range(history)
+            if end <= start:
+                break
+            total = self._drop_oldest_turn(history, total)
+        if total > self.max_tokens:
+            _, current = self._old_range(history)
+            total = self._elide_tool_results(history, total, (current, len(history)))
+
+        # forget counts of messages no longer in the history
+        live = {id(message) for message in history}
+        self._counts = {key: value for key, value in self._counts.items() if key in live}
+
+        logging.info(f"Compacted conversation from {before} to {total} tokens")
+        if total > self.max_tokens:
+            logging.warning(
+                f"Conversation is still {total} tokens, over the {self.max_tokens} "
+                "token budget"
+            )
+        return total
+
+    def _old_range(self, history: List[dict]) -> Tuple[int, int]:
+        """The [start, end) slice of turns before the current one, after the system prompt."""
+        start = 1 if history and history[0]["role"] == "system" else 0
+        current = len(history)
+        for index in range(len(history) - 1, start - 1, -1):
+            if history[index]["role"] == "user":
+                current = index
+                break
+        return start, max(start, current)
+
+    def _elide_tool_results(
+        self, history: List[dict], total: int, span: Tuple[int, int]
+    ) -> int:
+        for index in range(*span):
+            if total <= self.max_tokens:
+                break
+            message = history[index]
+            content = message.get("content")
+            if (
+                message["role"] != "tool"
+                or not isinstance(content, str)
+                or len(content) <= 2 * ELIDED_PREVIEW_CHARS
+            ):
+                continue
+            elided = {**message, "content": elide(content)}
+            total += self.message_tokens(elided) - self.message_tokens(message)
+            history[index] = elided
+            self.elided += 1
+        return total
+
+    async def _summarize_old_turns(self, history: List[dict], total: int) -> int:
+        start, end = self._old_range(history)
+        if end - start < 2:
+            return total
+        old = history[start:end]
+        try:
+            summary = await self.summarize(old)
+        except Exception as exc:
+            logging.error(f"Could not summarize the conversation: {exc}")
+            return total
+        if not summary:
+            return total
+
+        message = {"role": "system", "content": SUMMARY_PREFIX + summary}
+        total += self.message_tokens(message) - sum(map(self.message_tokens, old))
+        history[start:end] = [message]
+        self.summaries += 1
+        return total
+
+    def _drop_oldest_turn(self, history: List[dict], total: int) -> int:
+        start, end = self._old_range(history)
+        # a turn runs from one user message to the next
+        stop = next(
+            (i for i in range(start + 1, end) if history[i]["role"] == "user"), end
+        )
+        total -= sum(self.message_tokens(message) for message in history[start:stop])
+        del history[start:stop]
+        self.dropped_turns += 1
+        return total
@@ -0,0 +1,221 @@
+# daemon.py
+import itertools
+import logging
+import os
+import traceback
+from typing import Awaitable, Callable, Dict, Set
+
+import anyio
+from anyio.streams.buffered import BufferedByteReceiveStream
+
+from mcpcli.messages.json_codec import decode_message, get_codec, message_to_dict
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+from mcpcli.server_manager import ServerConnection, ServerManager
+from mcpcli.transport.daemon.daemon_client import MAX_LINE_BYTES, read_line
+
+# Seconds the daemon waits on a server for a relayed request
+DAEMON_REQUEST_TIMEOUT = 300
+
+# Server notifications passed on to every client attached to the server
+FORWARDED_NOTIFICATIONS = (
+    "notifications/tools/list_changed",
+    "notifications/resources/list_changed",
+    "notifications/resources/updated",
+    "notifications/prompts/list_changed",
+    "notifications/progress",
+    "notifications/message",
+)
+
+
+class MCPDaemon:
+    """
+    Keep MCP servers warm and relay requests to them from `mcp-cli` thin clients.
+
+    Clients connect over a Unix socket, attach to one server by name, and then
+    exchange newline-delimited JSON-RPC messages. Relayed requests get daemon-unique
+    ids before they reach the server, so any number of clients can share a session.
+    The server's FORWARDED_NOTIFICATIONS go to every client attached to it, so their
+    list_changed watchers and caches keep working; progress tokens are the clients'
+    own, so a client ignores progress on another client's requests.
+    """
+
+    def __init__(self, manager: ServerManager, socket_path: str):
+        self.manager = manager
+        self.socket_path = socket_path
+        self._ids = itertools.count(1)
+        # send_line of each attached client, by server name
+        self._clients: Dict[str, Set[Callable[[dict], Awaitable[None]]]] = {}
+
+    async def serve(self) -> None:
+        """Listen on the Unix socket until cancelled."""
+        await self._remove_stale_socket()
+        listener = await anyio.create_unix_listener(self.socket_path, mode=0o600)
+        logging.info(f"Daemon listening on {self.socket_path}")
+        try:
+            await listener.serve(self.handle_client)
+        finally:
+            await listener.aclose()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _remove_stale_socket(self) -> None:
+        """Remove a socket left behind by a daemon that is no longer running."""
+        if not os.path.exists(self.socket_path):
+            return
+        try:
+            socket = await anyio.connect_unix(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+            return
+        await socket.aclose()
+        raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+
+    async def handle_client(self, socket) -> None:
+        """Attach a client to a server and relay its messages until it disconnects."""
+        # one misbehaving client must not take the daemon down
+        try:
+            await self._serve_client(socket)
+        except Exception as exc:
+            logging.error(f"Error serving daemon client: {exc}")
+            logging.debug(f"Traceback:\n{traceback.format_exc()}")
+
+    async def _serve_client(self, socket) -> None:
+        receiver = BufferedByteReceiveStream(socket)
+        send_lock = anyio.Lock()
+        codec = get_codec()
+
+        async def send_line(payload: dict) -> None:
+            async with send_lock:
+                await socket.send(codec.dumps(payload) + b"\n")
+
+        async with socket:
+            try:
+                hello = await read_line(receiver)
+            except (anyio.EndOfStream, anyio.IncompleteRead, ValueError):
+                return
+
+            if not isinstance(hello, dict) or not isinstance(hello.get("server"), str):
+                await send_line({"ok": False, "error": "Invalid hello from daemon client."})
+                return
+
+            conn = self.manager.get(hello["server"])
+            if conn is None:
+                await send_line(
+                    {
+                        "ok": False,
+                        "error": f"Server '{hello['server']}' is not running in the daemon.",
+                    }
+                )
+                return
+            if hello.get("params") != conn.params.model_dump():
+                await send_line(
+                    {
+                        "ok": False,
+                        "error": f"Server '{conn.name}' runs with different parameters in the daemon.",
+                    }
+                )
+                return
+            await send_line({"ok": True})
+            self._attach(conn, send_line)
+
+            # relayed requests of this client by its id, so it can cancel them
+            in_flight = {}
+            try:
+                async with anyio.create_task_group() as tg:
+                    while True:
+                        try:
+                            line = await receiver.receive_until(b"\n", MAX_LINE_BYTES)
+                        except (
+                            anyio.EndOfStream,
+                            anyio.IncompleteRead,
+                            anyio.BrokenResourceError,
+                        ):
+                            break
+                        try:
+                            message = decode_message(line, codec)
+                        except Exception as exc:
+                            logging.error(f"Invalid message from daemon client: {exc}")
+                            continue
+                        tg.start_soon(self._relay, conn, message, send_line, in_flight)
+                    tg.cancel_scope.cancel()
+            finally:
+                self._clients[conn.name].discard(send_line)
+
+    def _attach(self, conn: ServerConnection, send_line) -> None:
+        """Add a client to those the server's notifications are forwarded to."""
+        if conn.name not in self._clients:
+            self._clients[conn.name] = set()
+
+            async def forward(message: JSONRPCMessage) -> None:
+                payload = message_to_dict(message)
+                payload = {k: v for k, v in payload.items() if v is not None}
+                for client in list(self._clients[conn.name]):
+                    try:
+                        await client(payload)
+                    except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+                        self._clients[conn.name].discard(client)
+
+            # replicas run the same tools, and may report progress on calls
+            for replica in conn.replicas:
+                for method in FORWARDED_NOTIFICATIONS:
+                    replica.session.on_notification(method, forward)
+        self._clients[conn.name].add(send_line)
+
+    async def _relay(
+        self, conn: ServerConnection, message: JSONRPCMessage, send_line, in_flight
+    ) -> None:
+        """Forward one client message to the server and send back its response."""
+        # the server is already initialized; answer the handshake from the cached result
+        if message.method == "initialize":
+            await send_line(
+                JSONRPCMessage(
+                    id=message.id, result=conn.init_result.model_dump()
+                ).model_dump(exclude_none=True)
+            )
+            return
+        if message.method == "notifications/initialized":
+            return
+
+        # a client cancellation stops the relayed request, which cancels it upstream
+        if message.method == "notifications/cancelled":
+            scope = in_flight.get((message.params or {}).get("requestId"))
+            if scope:
+                scope.cancel()
+            return
+
+        if message.id is None:
+            await conn.session.send_notification(message)
+            return
+        if message.method is None:
+            # responses to server-initiated requests are not relayed
+            return
+
+        forwarded = message.model_copy(update={"id": f"daemon-{next(self._ids)}"})
+        with anyio.CancelScope() as scope:
+            in_flight[message.id] = scope
+            # tool calls are spread across the server's replicas
+            target = conn.pick_replica() if message.method == "tools/call" else conn
+            try:
+                await target.ensure_started()
+                response = await target.session.send_request(
+                    forwarded, timeout=DAEMON_REQUEST_TIMEOUT
+                )
+                response = response.model_copy(update={"id": message.id})
+            except Exception as exc:
+                logging.error(
+                    f"Error relaying '{message.method}' to '{conn.name}': {exc}"
+                )
+                logging.debug(f"Traceback:\n{traceback.format_exc()}")
+                response = JSONRPCMessage(
+                    id=message.id, error={"code": -32603, "message": str(exc)}
+                )
+            finally:
+                in_flight.pop(message.id, None)
+        if scope.cancelled_caught:
+            return
+
+        try:
+            payload = message_to_dict(response)
+            await send_line({k: v for k, v in payload.items() if v is not None})
+        except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+            logging.debug("Daemon client went away before its response was sent")
@@ -0,0 +1,124 @@
+# deadline_policy.py
+import collections
+import math
+import random
+from typing import Deque, Dict, Optional
+
+import anyio
+
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+
+# Seconds to wait for a response when nothing else is known about the method
+DEFAULT_TIMEOUT = 5.0
+
+# Built-in timeouts for methods whose latency differs a lot from the default
+DEFAULT_METHOD_TIMEOUTS = {
+    "ping": 2.0,
+    "initialize": 10.0,
+    "tools/call": 60.0,
+}
+
+# Attempts for requests that may be retried
+DEFAULT_RETRIES = 3
+
+# Latencies kept per method, and how many are needed before adapting to them
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+
+# An adapted timeout allows this multiple of the observed 99th percentile latency
+ADAPTIVE_PERCENTILE = 0.99
+ADAPTIVE_HEADROOM = 3.0
+MIN_ADAPTIVE_TIMEOUT = 1.0
+MAX_ADAPTIVE_TIMEOUT = 300.0
+
+# Exponential backoff between retries: base * 2^(attempt - 1), capped, full jitter
+BACKOFF_BASE = 0.25
+BACKOFF_CAP = 4.0
+
+
+def deadline_key(message: JSONRPCMessage) -> str:
+    """Key a request by method, and tool calls also by tool (`tools/call:name`)."""
+    if message.method == "tools/call" and isinstance(message.params, dict):
+        tool_name = message.params.get("name")
+        if tool_name:
+            return f"tools/call:{tool_name}"
+    return message.method or ""
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the enclosing cancel scopes' deadline, or None if unbounded."""
+    deadline = anyio.current_effective_deadline()
+    if math.isinf(deadline):
+        return None
+    return max(0.0, deadline - anyio.current_time())
+
+
+class DeadlinePolicy:
+    """
+    Per-server request timeouts and retry backoff.
+
+    A request's timeout is, in order of preference: the one configured for its key
+    (`tools/call:name` or the method), the one configured for its method, a timeout
+    adapted from the latencies observed for its key, the built-in default for its
+    method, and finally the configured or built-in `default`.
+
+    Adapted timeouts never go below the method's built-in default: a tool that
+    was fast so far may still be given heavier work, and tool calls are not
+    retried. Requests that time out are recorded as taking at least their
+    timeout, so an adapted timeout that turns out too tight grows again.
+
+    Timeouts are configured per server in server_config.json:
+
+        "timeouts": {"default": 5, "tools/call": 60, "tools/call:run_report": 120},
+        "retries": 3
+    """
+
+    def __init__(
+        self,
+        timeouts: Optional[Dict[str, float]] = None,
+        retries: int = DEFAULT_RETRIES,
+    ):
+        self.timeouts = dict(timeouts or {})
+        self.retries = max(1, retries)
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def timeout_for(self, message: JSONRPCMessage) -> float:
+        key = deadline_key(message)
+        for configured in (key, message.method):
+            if configured in self.timeouts:
+                return float(self.timeouts[configured])
+
+        adapted = self.adapted_timeout(key)
+        if adapted is not None:
+            return max(adapted, DEFAULT_METHOD_TIMEOUTS.get(message.method, 0.0))
+        if message.method in DEFAULT_METHOD_TIMEOUTS:
+            return DEFAULT_METHOD_TIMEOUTS[message.method]
+        return float(self.timeouts.get("default", DEFAULT_TIMEOUT))
+
+    def record(self, message: JSONRPCMessage, seconds: float) -> None:
+        """Record how long a request took, or its timeout if it timed out."""
+        key = deadline_key(message)
+        if key not in self._latencies:
+            self._latencies[key] = collections.deque(maxlen=LATENCY_WINDOW)
+        self._latencies[key].append(seconds)
+
+    def percentile(self, key: str, fraction: float) -> Optional[float]:
+        """Return a latency percentile for a key, once enough samples are recorded."""
+        samples = self._latencies.get(key)
+        if not samples or len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def adapted_timeout(self, key: str) -> Optional[float]:
+        p99 = self.percentile(key, ADAPTIVE_PERCENTILE)
+        if p99 is None:
+            return None
+        return min(
+            MAX_ADAPTIVE_TIMEOUT, max(MIN_ADAPTIVE_TIMEOUT, p99 * ADAPTIVE_HEADROOM)
+        )
+
+    @staticmethod
+    def backoff(attempt: int) -> float:
+        """Seconds to wait before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)))
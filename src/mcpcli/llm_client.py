@@ -1,25 +1,39 @@
 import logging
 import os
 import uuid
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List
 import json
 
 import ollama
 from dotenv import load_dotenv
-from openai import OpenAI
-from anthropic import Anthropic
+from openai import AsyncOpenAI, OpenAI
+from anthropic import Anthropic, AsyncAnthropic
 
 # Load environment variables
 load_dotenv()
 
 
 class LLMClient:
+    """
+    Chat completions against openai, anthropic or ollama.
+
+    The provider SDK clients are created on first use and reused for the lifetime of
+    the LLMClient, so their HTTP connections stay pooled across requests. Use
+    `acreate_completion` from async code; `create_completion` is the blocking
+    equivalent kept for synchronous callers. `astream_completion` yields the text as
+    it is generated.
+    """
+
     def __init__(self, provider="openai", model="gpt-4o-mini", api_key=None):
         # set the provider, model and api key
         self.provider = provider
         self.model = model
         self.api_key = api_key
 
+        # provider clients, created once and reused
+        self._client = None
+        self._async_client = None
+
         # ensure we have the api key for openai if set
         if provider == "openai":
             self.api_key = self.api_key or os.getenv("OPENAI_API_KEY")
@@ -37,7 +51,7 @@ class LLMClient:
     def create_completion(
         self, messages: List[Dict], tools: List = None
     ) -> Dict[str, Any]:
-        """Create a chat completion using the specified LLM provider."""
+        """Create a chat completion using the specified LLM provider (blocking)."""
         if self.provider == "openai":
             # perform an openai completion
             return self._openai_completion(messages, tools)
@@ -51,165 +65,407 @@ class LLMClient:
             # unsupported providers
             raise ValueError(f"Unsupported provider: {self.provider}")
 
+    async def acreate_completion(
+        self, messages: List[Dict], tools: List = None
+    ) -> Dict[str, Any]:
+        """Create a chat completion without blocking the event loop."""
+        if self.provider == "openai":
+            # perform an openai completion
+            return await self._openai_acompletion(messages, tools)
+        elif self.provider == "anthropic":
+            # perform an anthropic completion
+            return await self._anthropic_acompletion(messages, tools)
+        elif self.provider == "ollama":
+            # perform an ollama completion
+            return await self._ollama_acompletion(messages, tools)
+        else:
+            # unsupported providers
+            raise ValueError(f"Unsupported provider: {self.provider}")
+
+    async def astream_completion(
+        self, messages: List[Dict], tools: List = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat completion.
+
+        Yields {"type": "delta", "text": ...} for each text fragment as it arrives, then
+        a final {"type": "completion", "response": ..., "tool_calls": [...]} holding the
+        assembled text and tool calls in the same format as acreate_completion.
+        """
+        if self.provider == "openai":
+            # stream an openai completion
+            stream = self._openai_astream(messages, tools)
+        elif self.provider == "anthropic":
+            # stream an anthropic completion
+            stream = self._anthropic_astream(messages, tools)
+        elif self.provider == "ollama":
+            # stream an ollama completion
+            stream = self._ollama_astream(messages, tools)
+        else:
+            # unsupported providers
+            raise ValueError(f"Unsupported provider: {self.provider}")
+
+        async for event in stream:
+            yield event
+
+    def _get_client(self):
+        """Return the provider's blocking client, creating it on first use."""
+        if self._client is None:
+            if self.provider == "openai":
+                self._client = OpenAI(api_key=self.api_key)
+            elif self.provider == "anthropic":
+                self._client = Anthropic(api_key=self.api_key)
+            elif self.provider == "ollama":
+                self._client = ollama.Client()
+        return self._client
+
+    def _get_async_client(self):
+        """Return the provider's async client, creating it on first use."""
+        if self._async_client is None:
+            if self.provider == "openai":
+                self._async_client = AsyncOpenAI(api_key=self.api_key)
+            elif self.provider == "anthropic":
+                self._async_client = AsyncAnthropic(api_key=self.api_key)
+            elif self.provider == "ollama":
+                self._async_client = ollama.AsyncClient()
+        return self._async_client
+
+    def close(self) -> None:
+        """Close the blocking client's pooled connections."""
+        client, self._client = self._client, None
+        close = getattr(client, "close", None)
+        if close:
+            close()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of both clients."""
+        self.close()
+        client, self._async_client = self._async_client, None
+        close = getattr(client, "close", None)
+        if close:
+            await close()
+
     def _openai_completion(self, messages: List[Dict], tools: List) -> Dict[str, Any]:
         """Handle OpenAI chat completions."""
-        # get the openai client
-        client = OpenAI(api_key=self.api_key)
+        try:
+            # make a request, passing in tools
+            response = self._get_client().chat.completions.create(
+                **self._openai_request(messages, tools)
+            )
+            return self._openai_result(response)
+        except Exception as e:
+            # error
+            logging.error(f"OpenAI API Error: {str(e)}")
+            raise ValueError(f"OpenAI API Error: {str(e)}")
 
+    async def _openai_acompletion(
+        self, messages: List[Dict], tools: List
+    ) -> Dict[str, Any]:
+        """Handle OpenAI chat completions asynchronously."""
         try:
             # make a request, passing in tools
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                tools=tools or [],
+            response = await self._get_async_client().chat.completions.create(
+                **self._openai_request(messages, tools)
             )
+            return self._openai_result(response)
+        except Exception as e:
+            # error
+            logging.error(f"OpenAI API Error: {str(e)}")
+            raise ValueError(f"OpenAI API Error: {str(e)}")
 
-            # return the response
-            return {
-                "response": response.choices[0].message.content,
-                "tool_calls": getattr(response.choices[0].message, "tool_calls", []),
-            }
+    async def _openai_astream(
+        self, messages: List[Dict], tools: List
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream OpenAI chat completions, assembling tool call deltas by index."""
+        text_parts = []
+        tool_calls = {}
+        try:
+            stream = await self._get_async_client().chat.completions.create(
+                **self._openai_request(messages, tools), stream=True
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+
+                if delta.content:
+                    text_parts.append(delta.content)
+                    yield {"type": "delta", "text": delta.content}
+
+                # each tool call arrives in pieces: id and name first, then arguments
+                for tool_delta in delta.tool_calls or []:
+                    call = tool_calls.setdefault(
+                        tool_delta.index,
+                        {
+                            "id": None,
+                            "type": "function",
+                            "function": {"name": "", "arguments": ""},
+                        },
+                    )
+                    if tool_delta.id:
+                        call["id"] = tool_delta.id
+                    if tool_delta.function:
+                        call["function"]["name"] += tool_delta.function.name or ""
+                        call["function"]["arguments"] += (
+                            tool_delta.function.arguments or ""
+                        )
         except Exception as e:
             # error
             logging.error(f"OpenAI API Error: {str(e)}")
             raise ValueError(f"OpenAI API Error: {str(e)}")
 
+        yield {
+            "type": "completion",
+            "response": "".join(text_parts) or None,
+            "tool_calls": [tool_calls[index] for index in sorted(tool_calls)],
+        }
+
+    def _openai_request(self, messages: List[Dict], tools: List) -> Dict[str, Any]:
+        """Build the OpenAI request arguments."""
+        return {
+            "model": self.model,
+            "messages": messages,
+            "tools": tools or [],
+        }
+
+    def _openai_result(self, response) -> Dict[str, Any]:
+        """Convert an OpenAI response to our completion format."""
+        return {
+            "response": response.choices[0].message.content,
+            "tool_calls": getattr(response.choices[0].message, "tool_calls", []),
+        }
+
     def _anthropic_completion(self, messages: List[Dict], tools: List) -> Dict[str, Any]:
         """Handle Anthropic chat completions."""
-        # get the anthropic client
-        client = Anthropic(api_key=self.api_key)
+        try:
+            # make a request, passing in tools
+            response = self._get_client().messages.create(
+                **self._anthropic_request(messages, tools)
+            )
+            return self._anthropic_result(response)
+        except Exception as e:
+            # error
+            raise ValueError(f"Anthropic API Error: {repr(e)}")
 
+    async def _anthropic_acompletion(
+        self, messages: List[Dict], tools: List
+    ) -> Dict[str, Any]:
+        """Handle Anthropic chat completions asynchronously."""
         try:
-            # format messages for anthropic api
-            anthropic_messages = []
-            system_messages = []
-            for msg in messages:
-                if msg["role"] == "system":
-                    system_messages.append({
-                        "type": "text",
-                        "text": msg["content"]
-                    })
-                elif msg["role"] == "tool":
-                    anthropic_messages.append({
-                        "role": "user",
-                        "content": [{
-                            "type": "tool_result",
-                            "tool_use_id": msg["tool_call_id"],
-                            "content": msg["content"]
-                        }]
-                    })
-                elif msg["role"] == "assistant" and "tool_calls" in msg:
-                    content = []
-                    if msg["content"]:
-                        content.append({
-                            "type": "text",
-                            "content": msg["content"]
-                        })
-
-                    for tool_call in msg["tool_calls"]:
-                        content.append({
-                            "type": "tool_use",
-                            "id": tool_call["id"],
-                            "name": tool_call["function"]["name"],
-                            "input":(
-                                json.loads(tool_call["function"]["arguments"])
-                                if isinstance(tool_call["function"]["arguments"], str)
-                                else tool_call["function"]["arguments"]
-                            )
-                        })
+            # make a request, passing in tools
+            response = await self._get_async_client().messages.create(
+                **self._anthropic_request(messages, tools)
+            )
+            return self._anthropic_result(response)
+        except Exception as e:
+            # error
+            raise ValueError(f"Anthropic API Error: {repr(e)}")
 
-                    anthropic_messages.append({
-                        "role": msg["role"],
-                        "content": content
-                    })
+    async def _anthropic_astream(
+        self, messages: List[Dict], tools: List
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream Anthropic messages, assembling tool_use input JSON per content block."""
+        text_parts = []
+        tool_blocks = {}
+        try:
+            stream = await self._get_async_client().messages.create(
+                **self._anthropic_request(messages, tools), stream=True
+            )
+            async for event in stream:
+                if event.type == "content_block_start":
+                    block = event.content_block
+                    if block.type == "tool_use":
+                        tool_blocks[event.index] = {
+                            "id": block.id,
+                            "name": block.name,
+                            "input_json": "",
+                        }
+                elif event.type == "content_block_delta":
+                    delta = event.delta
+                    if delta.type == "text_delta":
+                        text_parts.append(delta.text)
+                        yield {"type": "delta", "text": delta.text}
+                    elif delta.type == "input_json_delta":
+                        tool_blocks[event.index]["input_json"] += delta.partial_json
+        except Exception as e:
+            # error
+            raise ValueError(f"Anthropic API Error: {repr(e)}")
+
+        # format tool calls
+        tool_calls = []
+        for index in sorted(tool_blocks):
+            block = tool_blocks[index]
+            tool_calls.append({
+                "id": block["id"],
+                "type": "function",
+                "function": {
+                    "name": block["name"],
+                    "arguments": json.loads(block["input_json"] or "{}")
+                }
+            })
+
+        yield {
+            "type": "completion",
+            "response": "".join(text_parts),
+            "tool_calls": tool_calls,
+        }
+
+    def _anthropic_request(self, messages: List[Dict], tools: List) -> Dict[str, Any]:
+        """Build the Anthropic request arguments from OpenAI-style messages and tools."""
+        # format messages for anthropic api
+        anthropic_messages = []
+        system_messages = []
+        for msg in messages:
+            if msg["role"] == "system":
+                system_messages.append({
+                    "type": "text",
+                    "text": msg["content"]
+                })
+            elif msg["role"] == "tool":
+                tool_result = {
+                    "type": "tool_result",
+                    "tool_use_id": msg["tool_call_id"],
+                    "content": msg["content"]
+                }
+                # results of parallel tool calls share one user turn
+                if (
+                    anthropic_messages
+                    and anthropic_messages[-1]["role"] == "user"
+                    and anthropic_messages[-1]["content"][-1]["type"] == "tool_result"
+                ):
+                    anthropic_messages[-1]["content"].append(tool_result)
                 else:
                     anthropic_messages.append({
-                        "role": msg["role"],
-                        "content": [{
-                            "type": "text",
-                            "text": msg["content"]
-                        }]
+                        "role": "user",
+                        "content": [tool_result]
+                    })
+            elif msg["role"] == "assistant" and "tool_calls" in msg:
+                content = []
+                if msg["content"]:
+                    content.append({
+                        "type": "text",
+                        "content": msg["content"]
                     })
 
-            # add prompt caching markers
-            if len(system_messages) > 0:
-                system_messages[-1]["cache_control"] = {"type": "ephemeral"}
-            if len(anthropic_messages) > 0:
-                anthropic_messages[-1]["content"][-1]["cache_control"] = {"type": "ephemeral"}
-            if len(anthropic_messages) > 2:
-                anthropic_messages[-3]["content"][-1]["cache_control"] = {"type": "ephemeral"}
-
-            # format tools for anthropic api
-            if tools:
-                anthropic_tools = []
-                for tool in tools:
-                    anthropic_tools.append({
-                        "name": tool["function"]["name"],
-                        "description": tool["function"]["description"],
-                        "input_schema": tool["function"]["parameters"]
+                for tool_call in msg["tool_calls"]:
+                    content.append({
+                        "type": "tool_use",
+                        "id": tool_call["id"],
+                        "name": tool_call["function"]["name"],
+                        "input":(
+                            json.loads(tool_call["function"]["arguments"])
+                            if isinstance(tool_call["function"]["arguments"], str)
+                            else tool_call["function"]["arguments"]
+                        )
                     })
-                # add prompt caching marker
-                if len(anthropic_tools) > 0:
-                    anthropic_tools[-1]["cache_control"] = {"type": "ephemeral"}
+
+                anthropic_messages.append({
+                    "role": msg["role"],
+                    "content": content
+                })
             else:
-                anthropic_tools = None
-
-            # make a reuest, passing in tools
-            response = client.messages.create(
-                model=self.model,
-                system=system_messages,
-                tools=anthropic_tools,
-                messages=anthropic_messages,
-                max_tokens=8192
-            )
+                anthropic_messages.append({
+                    "role": msg["role"],
+                    "content": [{
+                        "type": "text",
+                        "text": msg["content"]
+                    }]
+                })
 
-            # format tool calls
-            tool_calls = []
-            for block in response.content:
-                if block.type == "tool_use":
-                    tool_calls.append({
-                        "id": block.id,
-                        "type": "function",
-                        "function": {
-                            "name": block.name,
-                            "arguments": block.input
-                        }
-                    })
+        # add prompt caching markers
+        if len(system_messages) > 0:
+            system_messages[-1]["cache_control"] = {"type": "ephemeral"}
+        if len(anthropic_messages) > 0:
+            anthropic_messages[-1]["content"][-1]["cache_control"] = {"type": "ephemeral"}
+        if len(anthropic_messages) > 2:
+            anthropic_messages[-3]["content"][-1]["cache_control"] = {"type": "ephemeral"}
 
-            # return the response
-            return {
-                "response": response.content[0].text if response.content[0].type == "text" else "",
-                "tool_calls": tool_calls
-            }
-        except Exception as e:
-            # error
-            raise ValueError(f"Anthropic API Error: {repr(e)}")
+        # format tools for anthropic api
+        if tools:
+            anthropic_tools = []
+            for tool in tools:
+                anthropic_tools.append({
+                    "name": tool["function"]["name"],
+                    "description": tool["function"]["description"],
+                    "input_schema": tool["function"]["parameters"]
+                })
+            # add prompt caching marker
+            if len(anthropic_tools) > 0:
+                anthropic_tools[-1]["cache_control"] = {"type": "ephemeral"}
+        else:
+            anthropic_tools = None
+
+        return {
+            "model": self.model,
+            "system": system_messages,
+            "tools": anthropic_tools,
+            "messages": anthropic_messages,
+            "max_tokens": 8192,
+        }
+
+    def _anthropic_result(self, response) -> Dict[str, Any]:
+        """Convert an Anthropic response to our completion format."""
+        # format tool calls
+        tool_calls = []
+        for block in response.content:
+            if block.type == "tool_use":
+                tool_calls.append({
+                    "id": block.id,
+                    "type": "function",
+                    "function": {
+                        "name": block.name,
+                        "arguments": block.input
+                    }
+                })
+
+        # return the response
+        return {
+            "response": response.content[0].text if response.content[0].type == "text" else "",
+            "tool_calls": tool_calls
+        }
 
     def _ollama_completion(self, messages: List[Dict], tools: List) -> Dict[str, Any]:
         """Handle Ollama chat completions."""
-        # Format messages for Ollama
-        ollama_messages = [
-            {"role": msg["role"], "content": msg["content"]} for msg in messages
-        ]
+        try:
+            # Make API call with tools
+            response = self._get_client().chat(**self._ollama_request(messages, tools))
+            return self._ollama_result(response)
+        except Exception as e:
+            # error
+            logging.error(f"Ollama API Error: {str(e)}")
+            raise ValueError(f"Ollama API Error: {str(e)}")
 
+    async def _ollama_acompletion(
+        self, messages: List[Dict], tools: List
+    ) -> Dict[str, Any]:
+        """Handle Ollama chat completions asynchronously."""
         try:
             # Make API call with tools
-            response = ollama.chat(
-                model=self.model,
-                messages=ollama_messages,
-                stream=False,
-                tools=tools or [],
+            response = await self._get_async_client().chat(
+                **self._ollama_request(messages, tools)
             )
+            return self._ollama_result(response)
+        except Exception as e:
+            # error
+            logging.error(f"Ollama API Error: {str(e)}")
+            raise ValueError(f"Ollama API Error: {str(e)}")
 
-            logging.info(f"Ollama raw response: {response}")
-
-            # Extract the message and tool calls
-            message = response.message
-            tool_calls = []
+    async def _ollama_astream(
+        self, messages: List[Dict], tools: List
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream Ollama chat completions."""
+        text_parts = []
+        tool_calls = []
+        try:
+            request = {**self._ollama_request(messages, tools), "stream": True}
+            async for chunk in await self._get_async_client().chat(**request):
+                message = chunk.message
+                if message.content:
+                    text_parts.append(message.content)
+                    yield {"type": "delta", "text": message.content}
 
-            # Convert Ollama tool calls to OpenAI format
-            if hasattr(message, "tool_calls") and message.tool_calls:
-                for tool in message.tool_calls:
+                # Ollama sends each tool call whole; convert it to OpenAI format
+                for tool in message.tool_calls or []:
                     tool_calls.append(
                         {
                             "id": str(uuid.uuid4()),  # Generate unique ID
@@ -220,13 +476,53 @@ class LLMClient:
                             },
                         }
                     )
-
-            return {
-                "response": message.content if message else "No response",
-                "tool_calls": tool_calls,
-            }
-
         except Exception as e:
             # error
             logging.error(f"Ollama API Error: {str(e)}")
             raise ValueError(f"Ollama API Error: {str(e)}")
+
+        yield {
+            "type": "completion",
+            "response": "".join(text_parts),
+            "tool_calls": tool_calls,
+        }
+
+    def _ollama_request(self, messages: List[Dict], tools: List) -> Dict[str, Any]:
+        """Build the Ollama request arguments."""
+        # Format messages for Ollama
+        ollama_messages = [
+            {"role": msg["role"], "content": msg["content"]} for msg in messages
+        ]
+        return {
+            "model": self.model,
+            "messages": ollama_messages,
+            "stream": False,
+            "tools": tools or [],
+        }
+
+    def _ollama_result(self, response) -> Dict[str, Any]:
+        """Convert an Ollama response to our completion format."""
+        logging.info(f"Ollama raw response: {response}")
+
+        # Extract the message and tool calls
+        message = response.message
+        tool_calls = []
+
+        # Convert Ollama tool calls to OpenAI format
+        if hasattr(message, "tool_calls") and message.tool_calls:
+            for tool in message.tool_calls:
+                tool_calls.append(
+                    {
+                        "id": str(uuid.uuid4()),  # Generate unique ID
+                        "type": "function",
+                        "function": {
+                            "name": tool.function.name,
+                            "arguments": tool.function.arguments,
+                        },
+                    }
+                )
+
+        return {
+            "response": message.content if message else "No response",
+            "tool_calls": tool_calls,
+        }
@@ -0,0 +1,137 @@
+# messages/json_codec.py
+import json
+import os
+from typing import Any, Dict, Optional, Union
+
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+
+# Environment variable that forces a specific codec ("orjson", "msgspec" or "json")
+CODEC_ENV_VAR = "MCP_CLI_JSON_CODEC"
+
+# Preferred codecs, fastest first
+CODEC_PREFERENCE = ("orjson", "msgspec", "json")
+
+
+class JSONCodec:
+    """Encode and decode JSON with the standard library."""
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class OrjsonCodec(JSONCodec):
+    """Encode and decode JSON with orjson."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+
+class MsgspecCodec(JSONCodec):
+    """Encode and decode JSON with msgspec."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+
+CODECS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JSONCodec,
+}
+
+_default_codec: Optional[JSONCodec] = None
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """
+    Return a JSON codec by name, or the fastest one installed.
+
+    orjson and msgspec are optional; the standard library is always available.
+    The choice can be forced with the MCP_CLI_JSON_CODEC environment variable.
+    """
+    global _default_codec
+
+    name = name or os.environ.get(CODEC_ENV_VAR)
+    if name:
+        if name not in CODECS:
+            raise ValueError(f"Unknown JSON codec: {name}")
+        return CODECS[name]()
+
+    if _default_codec is None:
+        for candidate in CODEC_PREFERENCE:
+            try:
+                _default_codec = CODECS[candidate]()
+                break
+            except ImportError:
+                continue
+    return _default_codec
+
+
+def decode_message(
+    data: Union[bytes, str], codec: Optional[JSONCodec] = None
+) -> JSONRPCMessage:
+    """
+    Decode one JSON-RPC message without running pydantic validation on its payload.
+
+    Only the envelope is checked: the id must be a string, an integer or absent,
+    the method a string, and params, result and error objects. Their contents are
+    handed over as decoded, which matters for multi-megabyte tool results.
+    """
+    obj = (codec or get_codec()).loads(data)
+    if not isinstance(obj, dict):
+        raise ValueError("JSON-RPC message must be an object")
+    message_id = obj.get("id")
+    if message_id is not None and (
+        isinstance(message_id, bool) or not isinstance(message_id, (str, int))
+    ):
+        raise ValueError(f"Invalid JSON-RPC id: {message_id!r}")
+    if obj.get("method") is not None and not isinstance(obj["method"], str):
+        raise ValueError("JSON-RPC method must be a string")
+    for field in ("params", "result", "error"):
+        if obj.get(field) is not None and not isinstance(obj[field], dict):
+            raise ValueError(f"JSON-RPC {field} must be an object")
+    return JSONRPCMessage.model_construct(**obj)
+
+
+def message_to_dict(message: JSONRPCMessage) -> Dict[str, Any]:
+    """
+    Return a message as a dict without copying its payload.
+
+    Unlike model_dump(), params and result are returned as the same objects the
+    decoder produced, so large results are never walked or copied again.
+    """
+    return {
+        "jsonrpc": message.jsonrpc,
+        "id": message.id,
+        "method": message.method,
+        "params": message.params,
+        "result": message.result,
+        "error": message.error,
+        **(message.model_extra or {}),
+    }
@@ -0,0 +1,12 @@
+# messages/message_types/cancelled_message.py
+from typing import Optional, Union
+
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+
+class CancelledNotificationMessage(JSONRPCMessage):
+    def __init__(self, request_id: Union[str, int], reason: Optional[str] = None, **kwargs):
+        # tells the server to stop working on a request the client gave up on
+        params = {"requestId": request_id}
+        if reason:
+            params["reason"] = reason
+        super().__init__(method="notifications/cancelled", id=None, params=params, **kwargs)
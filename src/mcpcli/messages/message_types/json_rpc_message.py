@@ -1,10 +1,11 @@
 # messages/message_types/json_rpc_message.py
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 from pydantic import BaseModel, ConfigDict
 
 class JSONRPCMessage(BaseModel):
     jsonrpc: str = "2.0"
-    id: Optional[str] = None
+    # servers may number their own requests with integers
+    id: Optional[Union[str, int]] = None
     method: Optional[str] = None
     params: Optional[Dict[str, Any]] = None
     result: Optional[Dict[str, Any]] = None
@@ -8,6 +8,7 @@ async def send_call_tool(
     arguments: dict,
     read_stream: MemoryObjectReceiveStream,
     write_stream: MemoryObjectSendStream,
+    idempotent: bool = False,
 ) -> dict:
     # create the message
     message = CallToolMessage(tool_name=tool_name, arguments=arguments)
@@ -18,6 +19,7 @@ async def send_call_tool(
             read_stream=read_stream,
             write_stream=write_stream,
             message=message,
+            idempotent=idempotent,
         )
 
         # get the result
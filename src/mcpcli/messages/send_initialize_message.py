@@ -4,6 +4,7 @@ import anyio
 from typing import Optional
 from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
 
+from mcpcli.deadline_policy import DeadlinePolicy
 from mcpcli.messages.message_types.initialize_message import (
     InitializeMessage,
     InitializedNotificationMessage,
@@ -12,13 +13,19 @@ from mcpcli.messages.message_types.initialize_message import (
     MCPClientInfo,
     InitializeResult,
 )
+from mcpcli.transport.client_session import ClientSession
 
 
 async def send_initialize(
     read_stream: MemoryObjectReceiveStream,
     write_stream: MemoryObjectSendStream,
+    timeout: Optional[float] = None,
 ) -> Optional[InitializeResult]:
-    """Send an initialization request to the server and process its response."""
+    """
+    Send an initialization request to the server and process its response.
+
+    The timeout defaults to the session's deadline policy for `initialize`.
+    """
 
     # Set initialize params
     init_params = InitializeParams(
@@ -30,13 +37,20 @@ async def send_initialize(
     # Create the initialize message
     init_message = InitializeMessage(init_params)
 
+    # With a session attached, the response is correlated by id
+    session = ClientSession.for_stream(write_stream)
+    if timeout is None:
+        policy = session.deadlines if session else DeadlinePolicy()
+        timeout = policy.timeout_for(init_message)
+    if session:
+        return await _send_initialize_via_session(session, init_message, timeout)
+
     # Sending
     logging.debug("Sending initialize request")
     await write_stream.send(init_message)
 
     try:
-        # 5-second timeout for response
-        with anyio.fail_after(5):
+        with anyio.fail_after(timeout):
             # Get the response from the server
             async for response in read_stream:
                 # If the response is an exception, log it and continue
@@ -78,3 +92,34 @@ async def send_initialize(
     # Timeout
     logging.error("Initialization response timeout")
     return None
+
+
+async def _send_initialize_via_session(
+    session: ClientSession, init_message: InitializeMessage, timeout: float
+) -> Optional[InitializeResult]:
+    """Perform the initialize handshake through a ClientSession."""
+    logging.debug("Sending initialize request")
+    try:
+        response = await session.send_request(init_message, timeout=timeout)
+    except TimeoutError:
+        logging.error("Timeout waiting for server initialization response")
+        return None
+
+    logging.debug(f"Received: {response.model_dump()}")
+
+    # Check for error
+    if response.error:
+        logging.error(f"Server initialization error: {response.error}")
+        return None
+
+    try:
+        # Validate the result
+        init_result = InitializeResult.model_validate(response.result)
+        logging.debug("Server initialized successfully")
+    except Exception as e:
+        logging.error(f"Error processing init result: {e}")
+        return None
+
+    # Notify the server of successful initialization
+    await session.send_notification(InitializedNotificationMessage())
+    return init_result
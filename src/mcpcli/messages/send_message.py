@@ -1,58 +1,147 @@
 # messages/send_message.py
 import logging
+from typing import Optional
+
 import anyio
 from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcpcli.deadline_policy import DeadlinePolicy, remaining_time
+from mcpcli.messages.json_codec import message_to_dict
+from mcpcli.messages.message_types.cancelled_message import CancelledNotificationMessage
 from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+from mcpcli.transport.client_session import ClientSession
+
+# Methods that only read server state, so a request can safely be sent again
+IDEMPOTENT_METHODS = frozenset(
+    {
+        "ping",
+        "tools/list",
+        "prompts/list",
+        "prompts/get",
+        "resources/list",
+        "resources/templates/list",
+        "resources/read",
+    }
+)
+
+
+def retry_message(message: JSONRPCMessage, attempt: int) -> JSONRPCMessage:
+    """Copy a request under a fresh id, so a late reply to an earlier attempt can't answer it."""
+    if attempt == 1:
+        return message
+    return message.model_copy(update={"id": f"{message.id}-retry-{attempt - 1}"})
+
+
+def can_retry(attempt: int, attempts: int, delay: float) -> bool:
+    """Whether another attempt is allowed and fits in the overall deadline."""
+    remaining = remaining_time()
+    return attempt < attempts and (remaining is None or remaining > delay)
+
 
 async def send_message(
     read_stream: MemoryObjectReceiveStream,
     write_stream: MemoryObjectSendStream,
     message: JSONRPCMessage,
-    timeout: float = 5,
-    retries: int = 3,
+    timeout: Optional[float] = None,
+    retries: Optional[int] = None,
+    idempotent: Optional[bool] = None,
 ) -> dict:
     """
     Send a JSON-RPC message to the server and return the response.
 
+    If a ClientSession is attached to the streams, the request is correlated by id
+    through the session, so other requests may be in flight at the same time.
+    Otherwise messages are read from the read stream until the one answering the
+    request arrives; notifications and server requests are skipped.
+
+    A request that times out is cancelled on the server with
+    `notifications/cancelled`. Only idempotent requests are retried, each time
+    under a fresh id and after an exponential backoff with jitter; anything else,
+    such as a tool call, is sent exactly once. Timeouts and retries come from the
+    session's deadline policy, and no attempt outlives the deadline of the
+    enclosing cancel scope (for example the chat turn).
+
     Args:
         read_stream (MemoryObjectReceiveStream): The stream to read responses.
         write_stream (MemoryObjectSendStream): The stream to send requests.
         message (JSONRPCMessage): The JSON-RPC message to send.
-        timeout (float): Timeout in seconds to wait for a response.
-        retries (int): Number of retry attempts.
+        timeout (Optional[float]): Timeout in seconds to wait for a response.
+            Defaults to the deadline policy's timeout for the method.
+        retries (Optional[int]): Number of attempts for idempotent requests.
+            Defaults to the deadline policy's retries.
+        idempotent (Optional[bool]): Whether the request may be retried. Defaults to
+            whether its method is in IDEMPOTENT_METHODS.
 
     Returns:
         dict: The server's response as a dictionary.
 
     Raises:
         TimeoutError: If no response is received within the timeout.
+        ConnectionError: If the session closed, e.g. because the server exited.
         Exception: If an unexpected error occurs.
     """
-    for attempt in range(1, retries + 1):
+    session = ClientSession.for_stream(write_stream)
+    policy = session.deadlines if session else DeadlinePolicy()
+    if idempotent is None:
+        idempotent = message.method in IDEMPOTENT_METHODS
+    attempts = (retries or policy.retries) if idempotent else 1
+
+    for attempt in range(1, attempts + 1):
+        request = retry_message(message, attempt)
+        attempt_timeout = policy.timeout_for(request) if timeout is None else timeout
+        remaining = remaining_time()
+        if remaining is not None:
+            attempt_timeout = min(attempt_timeout, remaining)
+        delay = policy.backoff(attempt)
         try:
-            logging.debug(f"Attempt {attempt}/{retries}: Sending message: {message}")
-            await write_stream.send(message)
-
-            with anyio.fail_after(timeout):
-                async for response in read_stream:
-                    if not isinstance(response, Exception):
-                        logging.debug(f"Received response: {response.model_dump()}")
-                        return response.model_dump()
-                    else:
-                        logging.error(f"Server error: {response}")
-                        raise response
+            logging.debug(f"Attempt {attempt}/{attempts}: Sending message: {request}")
+            if session:
+                response = await session.send_request(request, timeout=attempt_timeout)
+                logging.debug("Received response to '%s'", request.method)
+                return message_to_dict(response)
+
+            await write_stream.send(request)
+
+            try:
+                with anyio.fail_after(attempt_timeout):
+                    async for response in read_stream:
+                        # notifications, server requests and late replies are not the response
+                        if not isinstance(response, Exception) and (
+                            response.method or response.id != request.id
+                        ):
+                            logging.debug(
+                                f"Ignoring '{response.method or response.id}' while "
+                                f"waiting for '{request.method}' response"
+                            )
+                            continue
+                        if not isinstance(response, Exception):
+                            logging.debug("Received response to '%s'", request.method)
+                            return message_to_dict(response)
+                        else:
+                            logging.error(f"Server error: {response}")
+                            raise response
+            except TimeoutError:
+                await write_stream.send(
+                    CancelledNotificationMessage(
+                        request.id, f"No response within {attempt_timeout} seconds"
+                    )
+                )
+                raise
 
         except TimeoutError:
             logging.error(
-                f"Timeout waiting for response to message '{message.method}' (Attempt {attempt}/{retries})"
+                f"Timeout waiting for response to message '{message.method}' (Attempt {attempt}/{attempts})"
             )
-            if attempt == retries:
+            if not can_retry(attempt, attempts, delay):
                 raise
+        except ConnectionError as e:
+            # the session is gone; sending again can't succeed
+            logging.error(f"Connection lost during '{message.method}' request: {e}")
+            raise
         except Exception as e:
             logging.error(
-                f"Unexpected error during '{message.method}' request: {e} (Attempt {attempt}/{retries})"
+                f"Unexpected error during '{message.method}' request: {e} (Attempt {attempt}/{attempts})"
             )
-            if attempt == retries:
+            if not can_retry(attempt, attempts, delay):
                 raise
 
-        await anyio.sleep(2)
+        await anyio.sleep(delay)
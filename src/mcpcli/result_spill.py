@@ -0,0 +1,136 @@
+# result_spill.py
+import logging
+import os
+import shutil
+import tempfile
+from typing import Dict, NamedTuple, Optional
+
+# Tool results longer than this many characters are spilled to disk
+DEFAULT_SPILL_THRESHOLD = 32 * 1024
+
+# Characters of a spilled result kept in the conversation as its preview
+PREVIEW_CHARS = 2000
+
+# Characters returned by one call to the paging tool, by default and at most
+DEFAULT_PAGE_CHARS = 8000
+MAX_PAGE_CHARS = 32 * 1024
+
+# Name of the built-in tool that pages through spilled results
+READ_RESULT_TOOL = "read_tool_result"
+
+# Characters read at a time when skipping to a page
+_SKIP_CHUNK = 1024 * 1024
+
+
+class SpilledResult(NamedTuple):
+    path: str
+    tool_name: str
+    length: int
+
+
+class ResultSpill:
+    """
+    Spill directory for tool results too large to keep in the conversation.
+
+    A result over `threshold` characters is written to a file in a temporary
+    directory owned by the chat session, and replaced in the conversation by a
+    preview and a handle. The LLM pages through the full text with the
+    `read_tool_result` tool, which `tool` describes. The directory is removed
+    when the spill is closed.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_SPILL_THRESHOLD,
+        directory: Optional[str] = None,
+    ):
+        self.threshold = threshold
+        self.directory = directory or tempfile.mkdtemp(prefix="mcpcli-spill-")
+        self.results: Dict[str, SpilledResult] = {}
+        self.spilled_chars = 0
+
+    @property
+    def tool(self) -> dict:
+        """The MCP-style definition of the paging tool, advertised with the others."""
+        return {
+            "name": READ_RESULT_TOOL,
+            "description": (
+                "Read part of a large tool result that was shortened in the "
+                "conversation. Pass the handle shown with the preview, and an offset "
+                "in characters to continue from."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "handle": {"type": "string"},
+                    "offset": {"type": "integer", "minimum": 0},
+                    "length": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": MAX_PAGE_CHARS,
+                    },
+                },
+                "required": ["handle"],
+            },
+        }
+
+    def spill(self, tool_name: str, text: str) -> str:
+        """Return the text to keep in the conversation: the text, or a preview of it."""
+        if len(text) <= self.threshold:
+            return text
+
+        handle = f"result-{len(self.results) + 1}"
+        path = os.path.join(self.directory, f"{handle}.txt")
+        with open(path, "w", encoding="utf-8") as spill_file:
+            spill_file.write(text)
+        self.results[handle] = SpilledResult(path, tool_name, len(text))
+        self.spilled_chars += len(text)
+        logging.debug(f"Spilled {len(text)} characters from '{tool_name}' to {path}")
+
+        return (
+            f"{text[:PREVIEW_CHARS]}\n\n[Result of {tool_name} is {len(text)} "
+            f"characters; only the first {PREVIEW_CHARS} are shown. Call "
+            f'{READ_RESULT_TOOL} with handle "{handle}" and offset {PREVIEW_CHARS} '
+            "to read more.]"
+        )
+
+    def read(self, arguments: dict) -> str:
+        """Answer a call to the paging tool with one page of a spilled result."""
+        handle = arguments.get("handle")
+        result = self.results.get(handle)
+        if result is None:
+            return f"Unknown result handle '{handle}'"
+        offset = max(0, int(arguments.get("offset") or 0))
+        length = min(
+            MAX_PAGE_CHARS, max(1, int(arguments.get("length") or DEFAULT_PAGE_CHARS))
+        )
+
+        with open(result.path, "r", encoding="utf-8") as spill_file:
+            # skip by characters without holding everything before the page
+            remaining = offset
+            while remaining:
+                skipped = len(spill_file.read(min(remaining, _SKIP_CHUNK)))
+                if not skipped:
+                    break
+                remaining -= skipped
+            page = spill_file.read(length)
+
+        end = offset + len(page)
+        if end >= result.length:
+            footer = f"[Characters {offset}-{end} of {result.length}; end of result.]"
+        else:
+            footer = (
+                f"[Characters {offset}-{end} of {result.length}; call "
+                f'{READ_RESULT_TOOL} with handle "{handle}" and offset {end} for more.]'
+            )
+        return f"{page}\n\n{footer}"
+
+    def close(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.results.clear()
+
+    def __enter__(self) -> "ResultSpill":
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb) -> None:
+        self.close()
@@ -0,0 +1,60 @@
+import json
+import time
+
+from mcpcli.messages.json_codec import CODECS, decode_message, message_to_dict
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+
+# Size of the text returned by the simulated tools/call
+RESULT_BYTES = 8 * 1024 * 1024
+
+# Number of timed runs per path; the best run is reported
+ROUNDS = 5
+
+
+def make_line() -> bytes:
+    """Build one tools/call response with a multi-megabyte result, as read from stdout."""
+    rows = [
+        {"id": i, "name": f"row-{i}", "value": i * 0.5, "tags": ["a", "b", "c"]}
+        for i in range(RESULT_BYTES // 64)
+    ]
+    result = {
+        "content": [{"type": "text", "text": json.dumps(rows)}],
+        "structured": rows,
+        "isError": False,
+    }
+    return json.dumps({"jsonrpc": "2.0", "id": "1", "result": result}).encode()
+
+
+def best_of(func, line) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func(line)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def old_path(line: bytes) -> dict:
+    """What the client did before: parse, validate the whole payload, dump it again."""
+    return JSONRPCMessage.model_validate(json.loads(line)).model_dump()
+
+
+def main():
+    """Compare decoding a large tools/call response on the old and new paths."""
+    line = make_line()
+    print(f"Message size: {len(line) / 1024 / 1024:.1f} MB")
+    print(f"{'path':<28}{'best (ms)':>12}")
+    print(f"{'json + model_validate':<28}{best_of(old_path, line) * 1000:>12.1f}")
+
+    for name, codec_class in CODECS.items():
+        try:
+            codec = codec_class()
+        except ImportError:
+            print(f"{'decode_message/' + name:<28}{'not installed':>12}")
+            continue
+        elapsed = best_of(lambda data: message_to_dict(decode_message(data, codec)), line)
+        print(f"{'decode_message/' + name:<28}{elapsed * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from mcpcli.config import load_config
 from mcpcli.messages.send_initialize_message import send_initialize
 from mcpcli.messages.send_ping import send_ping
 from mcpcli.messages.send_tools_list import send_tools_list
+from mcpcli.transport.client_session import ClientSession
 from mcpcli.transport.stdio.stdio_client import stdio_client
 
 # Configure logging
@@ -24,7 +25,9 @@ async def main():
     server_params = await load_config(config_path, server_name)
 
     # Establish stdio communication
-    async with stdio_client(server_params) as (read_stream, write_stream):
+    async with stdio_client(server_params) as (read_stream, write_stream), ClientSession(
+        read_stream, write_stream
+    ):
         # Initialize the server
         init_result = await send_initialize(read_stream, write_stream)
 
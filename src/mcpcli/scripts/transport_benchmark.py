@@ -0,0 +1,112 @@
+import json
+import sys
+import time
+
+import anyio
+
+from mcpcli.messages.send_call_tool import send_call_tool
+from mcpcli.messages.send_initialize_message import send_initialize
+from mcpcli.transport.client_session import ClientSession
+from mcpcli.transport.inprocess.inprocess_client import inprocess_client
+from mcpcli.transport.inprocess.inprocess_server_parameters import (
+    InProcessServerParameters,
+)
+from mcpcli.transport.stdio.stdio_client import stdio_client
+from mcpcli.transport.stdio.stdio_server_parameters import StdioServerParameters
+
+# Sequential tool calls timed per transport, after one warm-up call
+CALLS = 2000
+
+# Number of timed startups per transport; the best run is reported
+ROUNDS = 5
+
+# Text echoed by each call, so the results have a realistic size
+PAYLOAD = "x" * 1024
+
+
+def answer(method: str, request_id, params: dict) -> dict:
+    """The echo server's reply to one request, shared by both transports."""
+    if method == "initialize":
+        result = {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "benchmark", "version": "1.0.0"},
+        }
+    elif method == "tools/call":
+        text = str(params.get("arguments", {}).get("text", ""))
+        result = {"content": [{"type": "text", "text": text}]}
+    else:
+        result = {}
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+async def inprocess_server(read_stream, write_stream):
+    """Entry point of the in-process echo server."""
+    async for request in read_stream:
+        if request.id is not None:
+            await write_stream.send(answer(request.method, request.id, request.params or {}))
+
+
+def serve_stdio():
+    """Run the echo server over stdin and stdout, as a spawned server would."""
+    for line in sys.stdin:
+        request = json.loads(line)
+        if "id" in request:
+            reply = answer(request["method"], request["id"], request.get("params") or {})
+            sys.stdout.write(json.dumps(reply) + "\n")
+            sys.stdout.flush()
+
+
+def transports():
+    return {
+        "stdio": lambda: stdio_client(
+            StdioServerParameters(
+                command=sys.executable,
+                args=["-m", "mcpcli.scripts.transport_benchmark", "--serve-stdio"],
+            )
+        ),
+        "inprocess": lambda: inprocess_client(
+            InProcessServerParameters(
+                entry_point="mcpcli.scripts.transport_benchmark:inprocess_server"
+            )
+        ),
+    }
+
+
+async def startup(connect) -> float:
+    """Seconds from connecting to a completed initialize."""
+    start = time.perf_counter()
+    async with connect() as (read_stream, write_stream):
+        # closing the write stream lets the server exit
+        async with write_stream, ClientSession(read_stream, write_stream):
+            await send_initialize(read_stream, write_stream)
+            return time.perf_counter() - start
+
+
+async def round_trips(connect) -> float:
+    """Mean seconds per sequential tools/call."""
+    async with connect() as (read_stream, write_stream):
+        # closing the write stream lets the server exit
+        async with write_stream, ClientSession(read_stream, write_stream):
+            await send_initialize(read_stream, write_stream)
+            await send_call_tool("echo", {"text": PAYLOAD}, read_stream, write_stream)
+            start = time.perf_counter()
+            for _ in range(CALLS):
+                await send_call_tool("echo", {"text": PAYLOAD}, read_stream, write_stream)
+            return (time.perf_counter() - start) / CALLS
+
+
+async def main():
+    """Compare startup and tool call latency of stdio and in-process servers."""
+    print(f"{'transport':<12}{'startup (ms)':>14}{'call (us)':>12}")
+    for name, connect in transports().items():
+        started = min([await startup(connect) for _ in range(ROUNDS)])
+        call = await round_trips(connect)
+        print(f"{name:<12}{started * 1000:>14.1f}{call * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    if "--serve-stdio" in sys.argv:
+        serve_stdio()
+    else:
+        anyio.run(main)
@@ -0,0 +1,582 @@
+# server_manager.py
+import logging
+import random
+import time
+from contextlib import AsyncExitStack
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import anyio
+
+from mcpcli.config import (
+    ServerParameters,
+    load_config,
+    load_deadline_policy,
+    load_result_cache,
+    load_server_settings,
+)
+from mcpcli.messages.message_types.initialize_message import InitializeResult
+from mcpcli.messages.message_types.ping_message import PingMessage
+from mcpcli.messages.send_initialize_message import send_initialize
+from mcpcli.tool_result_cache import ToolResultCache
+from mcpcli.transport.client_session import ClientSession
+from mcpcli.transport.daemon.daemon_client import DaemonUnavailableError, daemon_client
+from mcpcli.transport.http.http_client import TRANSPORT_ERROR, http_client
+from mcpcli.transport.http.http_server_parameters import HttpServerParameters
+from mcpcli.transport.inprocess.inprocess_client import inprocess_client
+from mcpcli.transport.inprocess.inprocess_server_parameters import (
+    InProcessServerParameters,
+)
+from mcpcli.transport.stdio.process_memory import process_tree_rss
+from mcpcli.transport.stdio.stdio_client import server_process, stdio_client
+from mcpcli.transport.stdio.stdio_server_shutdown import shutdown_stdio_server
+
+# Default number of servers spawned and initialized at the same time
+DEFAULT_STARTUP_CONCURRENCY = 8
+
+# Seconds to wait for a server to exit gracefully before it is cancelled
+DEFAULT_SHUTDOWN_TIMEOUT = 1.0
+
+# Seconds between heartbeat pings of each server; 0 disables them
+DEFAULT_HEARTBEAT_INTERVAL = 30.0
+
+# Consecutive unanswered heartbeats after which a server is restarted
+HEARTBEAT_MISSES = 2
+
+# Restarts allowed in a row before a server is given up on
+DEFAULT_MAX_RESTARTS = 5
+
+# Backoff between restarts: base * 2^(restart - 1) seconds, capped, with jitter
+RESTART_BACKOFF_BASE = 1.0
+RESTART_BACKOFF_CAP = 30.0
+
+# A server that stays up this many seconds has its restart count reset
+RESTART_RESET_AFTER = 60.0
+
+# Seconds without requests after which a spawned server is stopped; 0 never stops it
+DEFAULT_IDLE_TIMEOUT = 0.0
+
+# What _supervise returns when the server was stopped for being idle
+IDLE = "idle"
+
+
+class ServerConnection:
+    """
+    A running, initialized MCP server and the session used to talk to it.
+
+    A server deferred by a lazy ServerManager starts out "stopped", with no streams
+    and a session that is never opened; handlers registered on that session carry
+    over to the real one when `ensure_started` spawns the server. A server stopped
+    for being idle goes back to "stopped" and is respawned the same way.
+
+    A server configured with `replicas` runs as several identical processes; the
+    connection of the first one lists all of them in `replicas`, and `pick_replica`
+    spreads tool calls across them. Results of the tools allowlisted in
+    `cacheTools` are memoized in `result_cache`, shared by the replicas.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        params: ServerParameters,
+        read_stream,
+        write_stream,
+        session: ClientSession,
+        init_result: InitializeResult,
+        startup_time: float,
+        transport: str = "stdio",
+        starter: Optional[Callable[["ServerConnection"], Awaitable[None]]] = None,
+    ):
+        self.name = name
+        self.params = params
+        self.read_stream = read_stream
+        self.write_stream = write_stream
+        self.session = session
+        self.init_result = init_result
+        self.startup_time = startup_time
+        self.transport = transport
+        self.restarts = 0
+        self.idle_stops = 0
+        self.reclaimed_bytes = 0
+        self.replica = 0
+        self.replicas: List["ServerConnection"] = [self]
+        self._rotation = 0
+        self.state = "running"
+        self._close_requested = anyio.Event()
+        self._starter = starter
+        self._start_lock = anyio.Lock()
+        self.result_cache = ToolResultCache()
+
+    @classmethod
+    def deferred(
+        cls,
+        name: str,
+        params: ServerParameters,
+        starter: Callable[["ServerConnection"], Awaitable[None]],
+    ) -> "ServerConnection":
+        """A connection to a server that is spawned by `starter` on first use."""
+        conn = cls(
+            name, params, None, None, ClientSession(None, None), None, 0.0, None, starter
+        )
+        conn.state = "stopped"
+        return conn
+
+    @property
+    def streams(self) -> tuple:
+        """The (read_stream, write_stream) pair used by the send_* helpers."""
+        return (self.read_stream, self.write_stream)
+
+    def attach(
+        self,
+        read_stream,
+        write_stream,
+        session: ClientSession,
+        init_result: InitializeResult,
+        transport: str,
+    ) -> None:
+        """Switch to a restarted server, keeping the handlers registered so far."""
+        session.inherit_handlers(self.session)
+        self.read_stream = read_stream
+        self.write_stream = write_stream
+        self.session = session
+        self.init_result = init_result
+        self.transport = transport
+        self.state = "running"
+
+    def pick_replica(self) -> "ServerConnection":
+        """
+        Return the replica with the fewest requests in flight.
+
+        Replicas that are restarting or have failed their health checks are out of
+        rotation. Ties are broken round-robin. If no replica is running, a stopped
+        one is returned for the caller to start.
+        """
+        running = [r for r in self.replicas if r.state == "running"]
+        candidates = running or [r for r in self.replicas if r.state == "stopped"]
+        if not candidates:
+            return self
+        offset = self._rotation % len(candidates)
+        self._rotation += 1
+        rotated = candidates[offset:] + candidates[:offset]
+        return min(rotated, key=lambda replica: replica.session.pending_count)
+
+    async def ensure_started(self) -> None:
+        """Spawn and initialize a deferred server, once, if it is not running yet."""
+        if self.state != "stopped":
+            return
+        async with self._start_lock:
+            if self.state == "stopped":
+                await self._starter(self)
+
+    def close(self) -> None:
+        """Ask the server task to shut the server down."""
+        self._close_requested.set()
+
+
+class ServerManager:
+    """
+    Spawn and initialize MCP servers concurrently, and shut them down on exit.
+
+    Each server lives in its own task, which owns its transport and session for the
+    lifetime of the manager. Servers that fail to start are recorded in `failures`
+    instead of aborting the others. A server that exits or stops answering heartbeat
+    pings is restarted with backoff; requests in flight to it fail at once. When
+    `daemon_socket` is given, servers kept warm by `mcp-cli serve` are attached to
+    over that socket instead of being spawned.
+
+    With `lazy`, no server is started up front: each gets a deferred connection
+    that spawns it on `ensure_started`, or when `start` is called for it. With an
+    `idle_timeout`, a spawned server that gets no requests for that long is shut
+    down, and respawned by the next `ensure_started`.
+    """
+
+    def __init__(
+        self,
+        config_path: str,
+        server_names: List[str],
+        startup_concurrency: int = DEFAULT_STARTUP_CONCURRENCY,
+        shutdown_timeout: float = DEFAULT_SHUTDOWN_TIMEOUT,
+        daemon_socket: Optional[str] = None,
+        heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+        max_restarts: int = DEFAULT_MAX_RESTARTS,
+        lazy: bool = False,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self.config_path = config_path
+        self.server_names = list(server_names)
+        self.startup_concurrency = max(1, startup_concurrency)
+        self.shutdown_timeout = shutdown_timeout
+        self.daemon_socket = daemon_socket
+        self.heartbeat_interval = heartbeat_interval
+        self.max_restarts = max_restarts
+        self.lazy = lazy
+        self.idle_timeout = idle_timeout
+
+        self.connections: Dict[str, ServerConnection] = {}
+        self.failures: Dict[str, Exception] = {}
+        self._task_group = None
+
+    @property
+    def server_streams(self) -> List[tuple]:
+        """Stream pairs of the running servers, in the order they were requested."""
+        return [conn.streams for conn in self.ordered_connections()]
+
+    def ordered_connections(self) -> List[ServerConnection]:
+        """Running and deferred connections, in the order the servers were requested."""
+        return [
+            self.connections[name]
+            for name in self.server_names
+            if name in self.connections
+        ]
+
+    async def __aenter__(self) -> "ServerManager":
+        self._task_group = anyio.create_task_group()
+        await self._task_group.__aenter__()
+        try:
+            await self.start_all()
+        except BaseException as exc:
+            await self.__aexit__(type(exc), exc, exc.__traceback__)
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, tb):
+        for conn in self.connections.values():
+            for replica in conn.replicas:
+                replica.close()
+        return await self._task_group.__aexit__(exc_type, exc_value, tb)
+
+    async def start_all(self) -> None:
+        """Start every configured server, at most `startup_concurrency` at a time."""
+        if self.lazy:
+            for server_name in self.server_names:
+                await self._defer_server(server_name)
+            return
+
+        await self.start(self.server_names)
+
+    async def start(self, server_names: List[str]) -> None:
+        """Start the given servers unless already running, `startup_concurrency` at a time."""
+        limiter = anyio.CapacityLimiter(self.startup_concurrency)
+        async with anyio.create_task_group() as starters:
+            for server_name in server_names:
+                starters.start_soon(self._start_server, server_name, limiter)
+
+    async def _start_server(self, server_name: str, limiter: anyio.CapacityLimiter):
+        deferred = self.connections.get(server_name)
+        async with limiter:
+            try:
+                if deferred:
+                    await deferred.ensure_started()
+                    return
+                conn = await self._task_group.start(self._run_server, server_name)
+            except Exception as exc:
+                exc = _root_cause(exc)
+                logging.error(f"Failed to start server '{server_name}': {exc}")
+                self.failures[server_name] = exc
+                return
+
+        self.connections[server_name] = conn
+        await self._start_replicas(conn)
+
+    async def _defer_server(self, server_name: str) -> None:
+        try:
+            server_params = await load_config(self.config_path, server_name)
+        except Exception as exc:
+            logging.error(f"Failed to load config of server '{server_name}': {exc}")
+            self.failures[server_name] = exc
+            return
+
+        conn = ServerConnection.deferred(server_name, server_params, self._start_stopped)
+        conn.result_cache = await load_result_cache(self.config_path, server_name)
+        self.connections[server_name] = conn
+
+    async def _start_stopped(self, conn: ServerConnection) -> None:
+        """Spawn a deferred or idle-stopped server and attach its connection to it."""
+        try:
+            await self._task_group.start(
+                self._run_server, conn.name, conn, conn.replica
+            )
+        except Exception as exc:
+            raise RuntimeError(
+                f"Server '{conn.name}' failed to start: {_root_cause(exc)}"
+            ) from exc
+        self.failures.pop(conn.name, None)
+        if conn.replica == 0:
+            await self._start_replicas(conn)
+
+    async def _start_replicas(self, conn: ServerConnection) -> None:
+        """Start the extra replicas configured for a server, if not started yet."""
+        if conn.transport == "daemon":
+            # the daemon balances across its own replicas
+            return
+        settings = await load_server_settings(self.config_path, conn.name)
+        count = int(settings.get("replicas", 1))
+
+        async def start_replica(replica: int):
+            try:
+                replica_conn = await self._task_group.start(
+                    self._run_server, conn.name, None, replica
+                )
+            except Exception as exc:
+                logging.error(
+                    f"Failed to start replica {replica} of server '{conn.name}': "
+                    f"{_root_cause(exc)}"
+                )
+                return
+            conn.replicas.append(replica_conn)
+
+        async with anyio.create_task_group() as tg:
+            for replica in range(len(conn.replicas), count):
+                tg.start_soon(start_replica, replica)
+
+    async def _run_server(
+        self,
+        server_name: str,
+        conn: Optional[ServerConnection] = None,
+        replica: int = 0,
+        *,
+        task_status,
+    ):
+        """
+        Own one server's transport and session, restarting the server if it fails.
+
+        A deferred `conn` is attached to the server once it is initialized.
+        `replica` numbers the process among the server's replicas.
+        """
+        started = time.perf_counter()
+        server_params = await load_config(self.config_path, server_name)
+        deadlines = await load_deadline_policy(self.config_path, server_name)
+        result_cache = await load_result_cache(self.config_path, server_name)
+        settings = await load_server_settings(self.config_path, server_name)
+        heartbeat_interval = float(
+            settings.get("heartbeatInterval", self.heartbeat_interval)
+        )
+        max_restarts = int(settings.get("maxRestarts", self.max_restarts))
+        idle_timeout = float(settings.get("idleTimeout", self.idle_timeout))
+        label = f"{server_name}#{replica}" if replica else server_name
+
+        first_run = True
+        while True:
+            run_started = time.perf_counter()
+            failure = None
+            try:
+                with anyio.CancelScope() as scope:
+                    async with AsyncExitStack() as stack:
+                        transport, (read_stream, write_stream) = (
+                            await self._open_transport(stack, server_name, server_params)
+                        )
+                        session = await stack.enter_async_context(
+                            ClientSession(read_stream, write_stream, deadlines)
+                        )
+
+                        init_result = await send_initialize(read_stream, write_stream)
+                        if not init_result:
+                            raise RuntimeError("Server initialization failed")
+
+                        if conn is None:
+                            conn = ServerConnection(
+                                name=server_name,
+                                params=server_params,
+                                read_stream=read_stream,
+                                write_stream=write_stream,
+                                session=session,
+                                init_result=init_result,
+                                startup_time=time.perf_counter() - started,
+                                transport=transport,
+                                starter=self._start_stopped,
+                            )
+                            conn.replica = replica
+                            conn.result_cache = result_cache
+                        else:
+                            conn.attach(
+                                read_stream, write_stream, session, init_result, transport
+                            )
+                        if first_run:
+                            first_run = False
+                            conn.startup_time = time.perf_counter() - started
+                            logging.debug(
+                                f"Server '{label}' initialized in {conn.startup_time:.2f}s"
+                            )
+                            task_status.started(conn)
+                        else:
+                            logging.info(f"Server '{label}' restarted")
+
+                        # only spawned servers are reaped; the daemon keeps its own warm
+                        failure = await self._supervise(
+                            conn,
+                            heartbeat_interval,
+                            idle_timeout if server_process(write_stream) else 0,
+                        )
+                        if failure == IDLE:
+                            await self._stop_idle(conn, session, read_stream, write_stream)
+                        elif failure:
+                            # fail callers now rather than when their timeouts expire
+                            session.abort(f"Server '{label}' {failure}")
+
+                        # closing the write stream closes the server's stdin; give it a
+                        # moment to exit on its own before the transport is cancelled
+                        scope.deadline = anyio.current_time() + self.shutdown_timeout
+                        await write_stream.aclose()
+            except Exception as exc:
+                if first_run:
+                    raise
+                failure = failure or f"failed: {_root_cause(exc)}"
+
+            if failure in (None, IDLE) or conn._close_requested.is_set():
+                return
+
+            # restart, unless it keeps failing
+            if time.perf_counter() - run_started > RESTART_RESET_AFTER:
+                conn.restarts = 0
+            if conn.restarts >= max_restarts:
+                conn.state = "failed"
+                conn.session.abort(f"Server '{label}' {failure}; gave up restarting")
+                logging.error(
+                    f"Server '{label}' {failure}; giving up after {conn.restarts} restarts"
+                )
+                return
+
+            conn.restarts += 1
+            conn.state = "restarting"
+            conn.session.abort(f"Server '{label}' {failure}; restarting")
+            delay = random.uniform(
+                0.5, 1.0
+            ) * min(RESTART_BACKOFF_CAP, RESTART_BACKOFF_BASE * 2 ** (conn.restarts - 1))
+            logging.warning(
+                f"Server '{label}' {failure}; restarting in {delay:.1f}s "
+                f"(attempt {conn.restarts}/{max_restarts})"
+            )
+            with anyio.move_on_after(delay):
+                await conn._close_requested.wait()
+                return
+
+    async def _supervise(
+        self, conn: ServerConnection, heartbeat_interval: float, idle_timeout: float
+    ) -> Optional[str]:
+        """
+        Watch a running server until it is asked to close, fails or goes idle.
+
+        Returns None on a requested close, IDLE if no request was sent to the server
+        for `idle_timeout` seconds, otherwise why the server failed: its transport
+        closed (the process exited) or it missed HEARTBEAT_MISSES pings. Pings that
+        go unanswered while other requests are outstanding are not counted.
+        """
+        failure = None
+        session = conn.session
+
+        async with anyio.create_task_group() as tg:
+
+            async def wait_for_close():
+                await conn._close_requested.wait()
+                tg.cancel_scope.cancel()
+
+            async def wait_for_exit():
+                nonlocal failure
+                await session.wait_closed()
+                failure = failure or "exited"
+                tg.cancel_scope.cancel()
+
+            async def heartbeat():
+                nonlocal failure
+                misses = 0
+                while True:
+                    await anyio.sleep(heartbeat_interval)
+                    try:
+                        response = await session.send_request(PingMessage())
+                        if response.error and response.error.get("code") == TRANSPORT_ERROR:
+                            # the HTTP transport couldn't reach the server
+                            raise TimeoutError(response.error.get("message"))
+                        misses = 0
+                    except TimeoutError:
+                        if session.pending_count:
+                            # a single-threaded server may not answer pings during a
+                            # long call; the call's own timeout bounds the wait
+                            logging.debug(
+                                f"Server '{conn.name}' is busy; not counting its heartbeat"
+                            )
+                            continue
+                        misses += 1
+                        logging.debug(f"Server '{conn.name}' missed a heartbeat")
+                        if misses >= HEARTBEAT_MISSES:
+                            failure = "stopped responding"
+                            tg.cancel_scope.cancel()
+                            return
+                    except ConnectionError:
+                        # the exit watcher reports it
+                        return
+
+            async def reap_when_idle():
+                nonlocal failure
+                while True:
+                    idle_for = time.monotonic() - session.last_activity
+                    if session.pending_count == 0 and idle_for >= idle_timeout:
+                        # from here on, callers respawn the server
+                        conn.state = "stopped"
+                        failure = IDLE
+                        tg.cancel_scope.cancel()
+                        return
+                    await anyio.sleep(max(idle_timeout - idle_for, idle_timeout / 10))
+
+            tg.start_soon(wait_for_close)
+            tg.start_soon(wait_for_exit)
+            if heartbeat_interval > 0:
+                tg.start_soon(heartbeat)
+            if idle_timeout > 0:
+                tg.start_soon(reap_when_idle)
+
+        return None if conn._close_requested.is_set() else failure
+
+    async def _stop_idle(
+        self, conn: ServerConnection, session: ClientSession, read_stream, write_stream
+    ) -> None:
+        """Shut down an idle server process and report the memory it held."""
+        process = server_process(write_stream)
+        rss = process_tree_rss(process.pid) if process else None
+        session.abort(f"Server '{conn.name}' was stopped after being idle")
+        await shutdown_stdio_server(
+            read_stream, write_stream, process, self.shutdown_timeout
+        )
+
+        conn.idle_stops += 1
+        conn.reclaimed_bytes += rss or 0
+        reclaimed = f", reclaiming {rss / 2**20:.1f} MiB" if rss else ""
+        logging.info(f"Stopped idle server '{conn.name}'{reclaimed}")
+
+    async def _open_transport(
+        self,
+        stack: AsyncExitStack,
+        server_name: str,
+        server_params: ServerParameters,
+    ) -> tuple:
+        """
+        Connect over HTTP, run an in-process server, attach through the daemon if it
+        runs the server, or spawn it.
+        """
+        if isinstance(server_params, HttpServerParameters):
+            streams = await stack.enter_async_context(http_client(server_params))
+            return "http", streams
+        if isinstance(server_params, InProcessServerParameters):
+            streams = await stack.enter_async_context(inprocess_client(server_params))
+            return "inprocess", streams
+
+        if self.daemon_socket:
+            try:
+                streams = await stack.enter_async_context(
+                    daemon_client(self.daemon_socket, server_name, server_params)
+                )
+                return "daemon", streams
+            except DaemonUnavailableError as exc:
+                logging.debug(f"Spawning '{server_name}' directly: {exc}")
+
+        streams = await stack.enter_async_context(stdio_client(server_params))
+        return "stdio", streams
+
+    def get(self, server_name: str) -> Optional[ServerConnection]:
+        """Return the connection for a server, if it started or was deferred."""
+        return self.connections.get(server_name)
+
+
+def _root_cause(exc: Exception) -> Exception:
+    """Unwrap the task group exception groups raised by the transports."""
+    while isinstance(exc, ExceptionGroup) and len(exc.exceptions) == 1:
+        exc = exc.exceptions[0]
+    return exc
@@ -1,15 +1,96 @@
 import json
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Set, Tuple
+
+from mcpcli.context_budget import count_tokens
+
+# How tool definitions are written into the prompt: "full" as the servers sent them,
+# indented; "compact" minified in a canonical order, with $defs shared by several
+# tools written once; "names" only names and descriptions, for providers that get
+# the schemas in the request's tools parameter
+TOOL_RENDERINGS = ("full", "compact", "names")
+DEFAULT_TOOL_RENDERING = "full"
+
+# `$id` of the compact tools document; hoisted `$defs` are referenced through it
+SHARED_DEFS_ID = "urn:mcp-cli:tools"
+
+
+def rewrite_refs(schema: Any, names: Set[str], base: str) -> Any:
+    """Return the schema with `#/$defs/<name>` refs to the given names pointing into `base`."""
+    if isinstance(schema, list):
+        return [rewrite_refs(item, names, base) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    rewritten = {key: rewrite_refs(value, names, base) for key, value in schema.items()}
+    ref = schema.get("$ref")
+    if isinstance(ref, str) and ref.startswith("#/$defs/"):
+        if ref[len("#/$defs/"):].split("/")[0] in names:
+            rewritten["$ref"] = base + ref
+    return rewritten
+
+
+def hoist_shared_defs(tools: List[dict]) -> Tuple[Dict[str, dict], List[dict]]:
+    """
+    Move `$defs` that several tools define identically to one shared set.
+
+    Returns the shared definitions and the tools without them; the input is not
+    modified. A name defined differently by two tools stays with each tool. Refs
+    to a hoisted definition are rewritten to `urn:mcp-cli:tools#/$defs/<name>`,
+    which resolves to the shared set in the document that carries SHARED_DEFS_ID.
+    """
+    definitions: Dict[str, Counter] = {}
+    for tool in tools:
+        for name, definition in ((tool.get("inputSchema") or {}).get("$defs") or {}).items():
+            canonical = json.dumps(definition, sort_keys=True)
+            definitions.setdefault(name, Counter())[canonical] += 1
+
+    shared = {
+        name: json.loads(next(iter(variants)))
+        for name, variants in definitions.items()
+        if len(variants) == 1 and sum(variants.values()) > 1
+    }
+    if not shared:
+        return {}, tools
+
+    hoisted = []
+    for tool in tools:
+        schema = tool.get("inputSchema") or {}
+        if not any(name in shared for name in schema.get("$defs") or {}):
+            hoisted.append(tool)
+            continue
+        own = {k: v for k, v in schema["$defs"].items() if k not in shared}
+        hoisted_names = set(schema["$defs"]) - set(own)
+        schema = rewrite_refs(
+            {k: v for k, v in schema.items() if k != "$defs"},
+            hoisted_names,
+            SHARED_DEFS_ID,
+        )
+        if own:
+            schema["$defs"] = own
+        hoisted.append({**tool, "inputSchema": schema})
+    return shared, hoisted
 
 
 class SystemPromptGenerator:
     """
     A class for generating system prompts dynamically based on tools JSON and user inputs.
+
+    The `tool_rendering` (one of TOOL_RENDERINGS) sets how the tool definitions are
+    written. "compact" output depends only on the set of tools, not on the order
+    the servers listed them in, so the prompt stays byte-identical, and
+    cacheable by the provider, while the tools do not change.
     """
 
-    def __init__(self):
+    def __init__(self, tool_rendering: str = DEFAULT_TOOL_RENDERING):
         """
         Initialize the SystemPromptGenerator with a default system prompt template.
         """
+        if tool_rendering not in TOOL_RENDERINGS:
+            raise ValueError(f"Unknown tool rendering: {tool_rendering}")
+        self.tool_rendering = tool_rendering
+        self.prompt_chars = 0
+        self.prompt_tokens = 0
         self.template = """
         In this environment you have access to a set of tools you can use to answer the user's question.
         {{ FORMATTING INSTRUCTIONS }}
@@ -44,7 +125,7 @@ class SystemPromptGenerator:
         tool_config = tool_config or self.default_tool_config
 
         # get the tools schema
-        tools_json_schema = json.dumps(tools, indent=2)
+        tools_json_schema = self.render_tools(tools)
 
         # perform replacements
         prompt = self.template.replace(
@@ -54,5 +135,34 @@ class SystemPromptGenerator:
         prompt = prompt.replace("{{ USER SYSTEM PROMPT }}", user_system_prompt)
         prompt = prompt.replace("{{ TOOL CONFIGURATION }}", tool_config)
 
+        # record the prompt size
+        self.prompt_chars = len(prompt)
+        self.prompt_tokens = count_tokens(prompt)
+        logging.info(
+            f"System prompt is {self.prompt_chars} characters "
+            f"(about {self.prompt_tokens} tokens) with {self.tool_rendering} tools"
+        )
+
         # return the prompt
         return prompt
+
+    def render_tools(self, tools: dict) -> str:
+        """Write the tools JSON in the configured rendering."""
+        if self.tool_rendering == "full":
+            return json.dumps(tools, indent=2)
+
+        tool_list = sorted(tools.get("tools", []), key=lambda tool: tool["name"])
+        if self.tool_rendering == "names":
+            return "\n".join(
+                f"- {tool['name']}: {tool['description']}"
+                if tool.get("description")
+                else f"- {tool['name']}"
+                for tool in tool_list
+            )
+
+        shared, tool_list = hoist_shared_defs(tool_list)
+        document = {**tools, "tools": tool_list}
+        if shared:
+            document["$id"] = SHARED_DEFS_ID
+            document["$defs"] = shared
+        return json.dumps(document, sort_keys=True, separators=(",", ":"))
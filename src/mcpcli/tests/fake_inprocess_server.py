@@ -0,0 +1,63 @@
+# tests/fake_inprocess_server.py
+"""
+A minimal in-process MCP server used by the transport tests.
+
+Configured with `"entryPoint": "mcpcli.tests.fake_inprocess_server:server"`.
+"""
+import anyio
+
+TOOLS = [
+    {
+        "name": "echo",
+        "description": "Echo the given text back.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "text": {"type": "string"},
+                "progress": {"type": "integer"},
+            },
+        },
+    },
+    {
+        "name": "stop",
+        "description": "Return from the server, as if it exited.",
+        "inputSchema": {"type": "object", "properties": {}},
+    },
+]
+
+
+async def server(read_stream, write_stream):
+    async for request in read_stream:
+        if request.id is None:
+            continue
+
+        if request.method == "initialize":
+            result = {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {"tools": {"listChanged": True}},
+                "serverInfo": {"name": "inprocess", "version": "1.0.0"},
+            }
+        elif request.method == "tools/list":
+            result = {"tools": TOOLS}
+        elif request.method == "tools/call":
+            params = request.params or {}
+            if params.get("name") == "stop":
+                return
+            arguments = params.get("arguments", {})
+            for _ in range(arguments.get("progress", 0)):
+                await write_stream.send(
+                    {"jsonrpc": "2.0", "method": "notifications/progress", "params": {}}
+                )
+            text = str(arguments.get("text", ""))
+            result = {"content": [{"type": "text", "text": text}]}
+        else:
+            result = {}
+        await write_stream.send({"jsonrpc": "2.0", "id": request.id, "result": result})
+
+
+async def failing_server(read_stream, write_stream):
+    await anyio.sleep(0)
+    raise RuntimeError("broken server")
+
+
+not_a_server = 42
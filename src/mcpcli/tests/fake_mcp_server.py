@@ -0,0 +1,122 @@
+# tests/fake_mcp_server.py
+"""
+A minimal stdio MCP server used by the transport tests.
+
+Usage: python fake_mcp_server.py [--name NAME] [--init-delay SECONDS] [--fail-init]
+                                 [--single-threaded]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+TOOLS = [
+    {
+        "name": "echo",
+        "description": "Echo the given text back.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"text": {"type": "string"}},
+        },
+    },
+    {
+        "name": "sleep",
+        "description": "Sleep for the given number of seconds.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"seconds": {"type": "number"}},
+        },
+    },
+]
+
+write_lock = threading.Lock()
+
+# ids of requests the client cancelled, reported by the "cancelled" tool
+cancelled_ids = []
+
+# set by the "freeze" tool: the server stops answering anything
+frozen = threading.Event()
+
+
+def send(message: dict) -> None:
+    with write_lock:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+
+
+def call_tool(request: dict) -> None:
+    params = request.get("params", {})
+    arguments = params.get("arguments", {})
+    if params.get("name") == "sleep":
+        time.sleep(float(arguments.get("seconds", 0)))
+        text = "slept"
+    elif params.get("name") == "echo":
+        text = str(arguments.get("text", ""))
+    elif params.get("name") == "notify":
+        send({"jsonrpc": "2.0", "method": "notifications/tools/list_changed"})
+        text = "notified"
+    elif params.get("name") == "cancelled":
+        text = json.dumps(cancelled_ids)
+    elif params.get("name") == "crash":
+        os._exit(1)
+    elif params.get("name") == "freeze":
+        frozen.set()
+        return
+    else:
+        send({"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32602, "message": "Unknown tool"}})
+        return
+    send({"jsonrpc": "2.0", "id": request["id"], "result": {"content": [{"type": "text", "text": text}]}})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--name", default="fake")
+    parser.add_argument("--init-delay", type=float, default=0.0)
+    parser.add_argument("--fail-init", action="store_true")
+    parser.add_argument("--single-threaded", action="store_true")
+    args = parser.parse_args()
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        if frozen.is_set():
+            continue
+        request = json.loads(line)
+        method = request.get("method")
+        if "id" not in request:
+            if method == "notifications/cancelled":
+                cancelled_ids.append(request["params"]["requestId"])
+            continue
+
+        if method == "initialize":
+            time.sleep(args.init_delay)
+            if args.fail_init:
+                send({"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32603, "message": "init failed"}})
+                continue
+            send({
+                "jsonrpc": "2.0",
+                "id": request["id"],
+                "result": {
+                    "protocolVersion": "2024-11-05",
+                    "capabilities": {"tools": {"listChanged": True}},
+                    "serverInfo": {"name": args.name, "version": "1.0.0"},
+                },
+            })
+        elif method == "ping":
+            send({"jsonrpc": "2.0", "id": request["id"], "result": {}})
+        elif method == "tools/list":
+            send({"jsonrpc": "2.0", "id": request["id"], "result": {"tools": TOOLS}})
+        elif method == "tools/call" and args.single_threaded:
+            # nothing else is answered until the call is done
+            call_tool(request)
+        elif method == "tools/call":
+            # answer tool calls concurrently so responses can arrive out of order
+            threading.Thread(target=call_tool, args=(request,), daemon=True).start()
+        else:
+            send({"jsonrpc": "2.0", "id": request["id"], "result": {}})
+
+
+if __name__ == "__main__":
+    main()
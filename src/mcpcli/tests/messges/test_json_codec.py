@@ -0,0 +1,93 @@
+import pytest
+from mcpcli.messages.json_codec import (
+    CODECS,
+    JSONCodec,
+    decode_message,
+    get_codec,
+    message_to_dict,
+)
+
+
+def installed_codecs():
+    codecs = []
+    for name, codec_class in CODECS.items():
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            pass
+    return codecs
+
+
+def test_get_codec_falls_back_to_an_installed_codec():
+    """The default codec is always usable, even without the optional packages."""
+    codec = get_codec()
+    assert codec.name in CODECS
+    assert codec.loads(b'{"a": 1}') == {"a": 1}
+
+
+def test_get_codec_by_name_and_environment(monkeypatch):
+    """A codec can be forced by name or through the environment."""
+    assert isinstance(get_codec("json"), JSONCodec)
+    monkeypatch.setenv("MCP_CLI_JSON_CODEC", "json")
+    assert get_codec().name == "json"
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+@pytest.mark.parametrize("codec", installed_codecs(), ids=lambda codec: codec.name)
+def test_codec_round_trip(codec):
+    """Every installed codec reads what it writes, from bytes or str."""
+    payload = {"id": 1, "text": "héllo", "items": [1, 2.5, None, True]}
+    encoded = codec.dumps(payload)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == payload
+    assert codec.loads(encoded.decode()) == payload
+
+
+def test_decode_message_keeps_payload_and_extras():
+    """The envelope is decoded; payload and unknown keys are kept as they came."""
+    message = decode_message(
+        b'{"jsonrpc": "2.0", "id": "7", "result": {"content": [{"type": "text"}]}, "x": 1}'
+    )
+    assert message.id == "7"
+    assert message.method is None
+    assert message.result == {"content": [{"type": "text"}]}
+    assert message.model_extra == {"x": 1}
+
+
+def test_decode_message_fills_defaults():
+    message = decode_message('{"method": "notifications/initialized"}')
+    assert message.jsonrpc == "2.0"
+    assert message.id is None
+    assert message.params is None
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b"[1, 2]",
+        b'"text"',
+        b"not json",
+        b'{"jsonrpc": "2.0", "id": [1], "result": {}}',
+        b'{"jsonrpc": "2.0", "id": "1", "result": [1, 2]}',
+        b'{"jsonrpc": "2.0", "method": "ping", "params": "all"}',
+    ],
+)
+def test_decode_message_rejects_invalid_input(line):
+    with pytest.raises(ValueError):
+        decode_message(line)
+
+
+def test_message_to_dict_does_not_copy_payload():
+    """The response dict shares the decoded result rather than a copy of it."""
+    message = decode_message(b'{"jsonrpc": "2.0", "id": 1, "result": {"tools": []}}')
+    data = message_to_dict(message)
+    assert data["result"] is message.result
+    assert data == {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": None,
+        "params": None,
+        "result": {"tools": []},
+        "error": None,
+    }
@@ -0,0 +1,147 @@
+# tests/test_catalog_cache.py
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import anyio
+import pytest
+
+from mcpcli.__main__ import fetch_list, handle_command
+from mcpcli.catalog_cache import CatalogCache, server_identity
+from mcpcli.messages.message_types.initialize_message import ServerInfo
+from mcpcli.messages.message_types.tools_messages import ToolsListChangedMessage
+from mcpcli.tool_catalog import ToolCatalog
+from mcpcli.transport.client_session import ClientSession
+from mcpcli.transport.stdio.stdio_server_parameters import StdioServerParameters
+
+
+def make_server(version="1.0.0", args=("--db", "test.db"), state="running"):
+    return SimpleNamespace(
+        name="db",
+        params=StdioServerParameters(command="db-server", args=list(args)),
+        init_result=SimpleNamespace(serverInfo=ServerInfo(name="db", version=version)),
+        session=ClientSession(object(), object()),
+        state=state,
+    )
+
+
+@pytest.mark.asyncio
+async def test_miss_fetches_and_persists(tmp_path):
+    server = make_server()
+    fetch = AsyncMock(return_value=[{"name": "query"}])
+
+    async with anyio.create_task_group() as tg:
+        cache = CatalogCache(tg, cache_dir=str(tmp_path))
+        assert await cache.get_list(server, "tools", fetch) == [{"name": "query"}]
+
+    # a new session reads the list from disk without asking the server first
+    slow_fetch = AsyncMock(return_value=[{"name": "query"}])
+    async with anyio.create_task_group() as tg:
+        cache = CatalogCache(tg, cache_dir=str(tmp_path))
+        assert await cache.get_list(server, "tools", slow_fetch) == [{"name": "query"}]
+
+    fetch.assert_awaited_once()
+    # the hit was revalidated in the background
+    slow_fetch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stale_hit_is_revalidated_in_background(tmp_path):
+    server = make_server()
+    async with anyio.create_task_group() as tg:
+        cache = CatalogCache(tg, cache_dir=str(tmp_path))
+        cache.store(server_identity(server), "tools", [{"name": "old"}])
+
+        changed = []
+        fetch = AsyncMock(return_value=[{"name": "new"}])
+        result = await cache.get_list(
+            server, "tools", fetch, on_change=lambda: changed.append(True)
+        )
+        assert result == [{"name": "old"}]
+
+    assert changed == [True]
+    assert cache.load(server_identity(server), "tools") == [{"name": "new"}]
+
+
+@pytest.mark.asyncio
+async def test_list_changed_notification_invalidates(tmp_path):
+    server = make_server()
+    async with anyio.create_task_group() as tg:
+        cache = CatalogCache(tg, cache_dir=str(tmp_path))
+        cache.store(server_identity(server), "tools", [{"name": "old"}])
+        cache.store(server_identity(server), "prompts", {"prompts": []})
+        cache.watch(server)
+
+        await server.session._notify(ToolsListChangedMessage())
+
+        assert cache.load(server_identity(server), "tools") is None
+        assert cache.load(server_identity(server), "prompts") == {"prompts": []}
+
+
+def test_identity_changes_with_launch_parameters_and_version():
+    base = server_identity(make_server())
+    assert server_identity(make_server()) == base
+    assert server_identity(make_server(version="2.0.0")) != base
+    assert server_identity(make_server(args=("--db", "other.db"))) != base
+
+
+@pytest.mark.asyncio
+async def test_stopped_server_is_served_from_last_identity_without_revalidation(tmp_path):
+    async with anyio.create_task_group() as tg:
+        cache = CatalogCache(tg, cache_dir=str(tmp_path))
+        fetch = AsyncMock(return_value=[{"name": "query"}])
+        await cache.get_list(make_server(), "tools", fetch)
+
+    stopped = make_server(state="stopped")
+    stopped.init_result = None
+    async with anyio.create_task_group() as tg:
+        cache = CatalogCache(tg, cache_dir=str(tmp_path))
+        assert cache.has_list(stopped, "tools")
+        assert not cache.has_list(make_server(args=("--db", "other.db")), "tools")
+
+        fetch = AsyncMock(return_value=[{"name": "new"}])
+        assert await cache.get_list(stopped, "tools", fetch) == [{"name": "query"}]
+
+    fetch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_background_revalidation_asks_each_server_for_its_own_list(tmp_path):
+    servers = [make_server(args=("--db", name)) for name in ("a", "b")]
+    for server in servers:
+        server.streams = (server, None)
+        server.ensure_started = AsyncMock()
+
+    async def send_tools_list(read_stream, write_stream):
+        return {"tools": [{"name": f"query_{read_stream.params.args[1]}"}]}
+
+    async with anyio.create_task_group() as tg:
+        cache = CatalogCache(tg, cache_dir=str(tmp_path))
+        for server in servers:
+            cache.store(server_identity(server), "tools", [{"name": "old"}])
+        # revalidations run after the loop has moved on to the next server
+        for server in servers:
+            await fetch_list(server, "tools", send_tools_list, cache)
+
+    for server, name in zip(servers, ("a", "b")):
+        assert cache.load(server_identity(server), "tools") == [{"name": f"query_{name}"}]
+
+
+@pytest.mark.asyncio
+async def test_list_tools_and_tool_catalog_share_cached_tools(tmp_path):
+    server = make_server()
+    server.streams = (None, None)
+    server.ensure_started = AsyncMock()
+    tools = [{"name": "query", "description": "Run a query"}]
+    send_tools_list = AsyncMock(return_value={"tools": tools})
+
+    with patch("mcpcli.__main__.send_tools_list", new=send_tools_list):
+        async with anyio.create_task_group() as tg:
+            cache = CatalogCache(tg, cache_dir=str(tmp_path))
+            assert await handle_command("list-tools", [server], cache)
+
+    # a later chat session reads the tools list-tools cached
+    with patch("mcpcli.tool_catalog.fetch_tools", new=AsyncMock(return_value=tools)):
+        async with anyio.create_task_group() as tg:
+            catalog = ToolCatalog([server], cache=CatalogCache(tg, cache_dir=str(tmp_path)))
+            await catalog.refresh()
+    assert [tool["name"] for tool in catalog.tools] == ["query"]
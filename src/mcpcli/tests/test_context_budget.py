@@ -0,0 +1,113 @@
+# tests/test_context_budget.py
+import pytest
+
+from mcpcli.context_budget import SUMMARY_PREFIX, ContextBudget, count_tokens
+
+
+def turn(n, result_size=4000):
+    """One user turn: a question, a tool call, its result and the answer."""
+    return [
+        {"role": "user", "content": f"question {n}"},
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": f"call-{n}",
+                    "type": "function",
+                    "function": {"name": "read_query", "arguments": "{}"},
+                }
+            ],
+        },
+        {
+            "role": "tool",
+            "name": "read_query",
+            "content": "x" * result_size,
+            "tool_call_id": f"call-{n}",
+        },
+        {"role": "assistant", "content": f"answer {n}"},
+    ]
+
+
+def history_of(turns):
+    history = [{"role": "system", "content": "You are helpful."}]
+    for n in range(turns):
+        history += turn(n)
+    return history
+
+
+def budget_for(history):
+    return ContextBudget().total_tokens(history)
+
+
+def assert_tool_calls_answered(history):
+    call_ids = [
+        call["id"] for message in history for call in message.get("tool_calls") or []
+    ]
+    result_ids = [m["tool_call_id"] for m in history if m["role"] == "tool"]
+    assert call_ids == result_ids
+
+
+@pytest.mark.asyncio
+async def test_history_within_budget_is_untouched():
+    history = history_of(2)
+    original = list(history)
+    budget = ContextBudget(max_tokens=10_000)
+
+    assert await budget.enforce(history) == budget.total_tokens(original)
+    assert history == original
+
+
+@pytest.mark.asyncio
+async def test_old_tool_results_are_elided_first():
+    history = history_of(3)
+    budget = ContextBudget(max_tokens=budget_for(history) - 500)
+
+    total = await budget.enforce(history)
+
+    assert total <= budget.max_tokens
+    assert len(history) == 13
+    assert "elided" in history[3]["content"]
+    # the current turn is left alone
+    assert history[-2]["content"] == "x" * 4000
+    assert_tool_calls_answered(history)
+
+
+@pytest.mark.asyncio
+async def test_oldest_turns_are_dropped_whole():
+    history = history_of(4)
+    budget = ContextBudget(max_tokens=1100)
+
+    total = await budget.enforce(history)
+
+    assert total <= 1100
+    assert history[0]["role"] == "system"
+    assert history[1] == {"role": "user", "content": "question 3"}
+    assert budget.dropped_turns == 3
+    assert_tool_calls_answered(history)
+
+
+@pytest.mark.asyncio
+async def test_earlier_turns_are_summarized_when_enabled():
+    summarized = []
+
+    async def summarize(messages):
+        summarized.extend(messages)
+        return "the user asked three questions"
+
+    history = history_of(4)
+    budget = ContextBudget(max_tokens=1100, summarize=summarize)
+    await budget.enforce(history)
+
+    assert len(summarized) == 12
+    assert history[1] == {
+        "role": "system",
+        "content": SUMMARY_PREFIX + "the user asked three questions",
+    }
+    assert history[2] == {"role": "user", "content": "question 3"}
+    assert_tool_calls_answered(history)
+
+
+def test_token_counts_grow_with_text():
+    assert count_tokens("") == 0
+    assert count_tokens("word " * 100) > count_tokens("word " * 10) > 0
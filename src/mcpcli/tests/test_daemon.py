@@ -0,0 +1,184 @@
+# tests/test_daemon.py
+import json
+
+import anyio
+import pytest
+
+from mcpcli.daemon import MCPDaemon
+from mcpcli.messages.message_types.tools_messages import CallToolMessage
+from mcpcli.messages.send_call_tool import send_call_tool
+from mcpcli.messages.send_message import send_message
+from mcpcli.messages.send_ping import send_ping
+from mcpcli.server_manager import ServerManager
+from mcpcli.tests.test_server_manager import fake_server, write_config
+from mcpcli.transport.daemon.daemon_client import DaemonUnavailableError, daemon_client
+from mcpcli.transport.stdio.stdio_server_parameters import StdioServerParameters
+
+
+@pytest.mark.asyncio
+async def test_clients_attach_to_daemon_servers(tmp_path):
+    config_path = write_config(tmp_path, {"warm": fake_server("--name", "warm")})
+    socket_path = str(tmp_path / "d.sock")
+
+    async with ServerManager(config_path, ["warm"]) as daemon_manager:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(MCPDaemon(daemon_manager, socket_path).serve)
+            await anyio.sleep(0.1)
+
+            # two thin clients share the daemon's server
+            async with ServerManager(
+                config_path, ["warm"], daemon_socket=socket_path
+            ) as first, ServerManager(
+                config_path, ["warm"], daemon_socket=socket_path
+            ) as second:
+                for manager in (first, second):
+                    conn = manager.get("warm")
+                    assert conn.transport == "daemon"
+                    assert conn.init_result.serverInfo.name == "warm"
+                    assert await send_ping(*conn.streams)
+
+                result = await send_call_tool(
+                    "echo", {"text": "hi"}, *second.get("warm").streams
+                )
+                assert result["content"][0]["text"] == "hi"
+
+            tg.cancel_scope.cancel()
+
+
+@pytest.mark.asyncio
+async def test_server_notifications_reach_every_attached_client(tmp_path):
+    config_path = write_config(tmp_path, {"warm": fake_server("--name", "warm")})
+    socket_path = str(tmp_path / "d.sock")
+
+    async with ServerManager(config_path, ["warm"]) as daemon_manager:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(MCPDaemon(daemon_manager, socket_path).serve)
+            await anyio.sleep(0.1)
+
+            async with ServerManager(
+                config_path, ["warm"], daemon_socket=socket_path
+            ) as first, ServerManager(
+                config_path, ["warm"], daemon_socket=socket_path
+            ) as second:
+                changed = []
+                for manager in (first, second):
+                    manager.get("warm").session.on_notification(
+                        "notifications/tools/list_changed", changed.append
+                    )
+
+                result = await send_call_tool("notify", {}, *first.get("warm").streams)
+                assert result["content"][0]["text"] == "notified"
+                with anyio.fail_after(2):
+                    while len(changed) < 2:
+                        await anyio.sleep(0.01)
+
+            tg.cancel_scope.cancel()
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_spawning_when_daemon_cannot_serve(tmp_path):
+    config_path = write_config(tmp_path, {"warm": fake_server("--name", "warm")})
+    other_config = tmp_path / "other"
+    other_config.mkdir()
+    other_config_path = write_config(
+        other_config, {"warm": fake_server("--name", "different")}
+    )
+    socket_path = str(tmp_path / "d.sock")
+
+    # no daemon running at all
+    async with ServerManager(config_path, ["warm"], daemon_socket=socket_path) as manager:
+        assert manager.get("warm").transport == "stdio"
+
+    # daemon running the server with different parameters
+    async with ServerManager(config_path, ["warm"]) as daemon_manager:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(MCPDaemon(daemon_manager, socket_path).serve)
+            await anyio.sleep(0.1)
+
+            async with ServerManager(
+                other_config_path, ["warm"], daemon_socket=socket_path
+            ) as manager:
+                conn = manager.get("warm")
+                assert conn.transport == "stdio"
+                assert conn.init_result.serverInfo.name == "different"
+
+            tg.cancel_scope.cancel()
+
+
+@pytest.mark.asyncio
+async def test_client_timeout_cancels_relayed_request(tmp_path):
+    config_path = write_config(tmp_path, {"warm": fake_server("--name", "warm")})
+    socket_path = str(tmp_path / "d.sock")
+
+    async with ServerManager(config_path, ["warm"]) as daemon_manager:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(MCPDaemon(daemon_manager, socket_path).serve)
+            await anyio.sleep(0.1)
+
+            async with ServerManager(
+                config_path, ["warm"], daemon_socket=socket_path
+            ) as client:
+                streams = client.get("warm").streams
+                with pytest.raises(TimeoutError):
+                    await send_message(
+                        *streams,
+                        CallToolMessage("sleep", {"seconds": 1}),
+                        timeout=0.2,
+                    )
+                await anyio.sleep(0.1)
+
+                result = await send_call_tool("cancelled", {}, *streams)
+                cancelled = json.loads(result["content"][0]["text"])
+
+            tg.cancel_scope.cancel()
+
+    # the server was told to stop, under the id the daemon forwarded it with
+    assert len(cancelled) == 1
+    assert cancelled[0].startswith("daemon-")
+
+
+@pytest.mark.asyncio
+async def test_malformed_hello_is_refused_and_daemon_keeps_serving(tmp_path):
+    config_path = write_config(tmp_path, {"warm": fake_server("--name", "warm")})
+    socket_path = str(tmp_path / "d.sock")
+
+    async with ServerManager(config_path, ["warm"]) as daemon_manager:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(MCPDaemon(daemon_manager, socket_path).serve)
+            await anyio.sleep(0.1)
+
+            for hello in (b"[1]\n", b'{"server": 5}\n', b"null\n"):
+                async with await anyio.connect_unix(socket_path) as socket:
+                    await socket.send(hello)
+                    reply = json.loads(await socket.receive())
+                    assert not reply["ok"]
+
+            async with ServerManager(
+                config_path, ["warm"], daemon_socket=socket_path
+            ) as client:
+                conn = client.get("warm")
+                assert conn.transport == "daemon"
+                assert await send_ping(*conn.streams)
+
+            tg.cancel_scope.cancel()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("reply", [b"[1]\n", b'"ok"\n', b"7\n"])
+async def test_malformed_hello_reply_is_a_connection_error(tmp_path, reply):
+    socket_path = str(tmp_path / "d.sock")
+    listener = await anyio.create_unix_listener(socket_path)
+
+    async def answer(socket):
+        async with socket:
+            await socket.receive()
+            await socket.send(reply)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(listener.serve, answer)
+        with pytest.raises(DaemonUnavailableError):
+            async with daemon_client(
+                socket_path, "warm", StdioServerParameters(command="warm")
+            ):
+                pass
+        tg.cancel_scope.cancel()
@@ -0,0 +1,151 @@
+# tests/test_deadline_policy.py
+import json
+
+import anyio
+import pytest
+
+from mcpcli.config import load_deadline_policy
+from mcpcli.deadline_policy import (
+    BACKOFF_CAP,
+    DEFAULT_TIMEOUT,
+    MIN_LATENCY_SAMPLES,
+    DeadlinePolicy,
+    remaining_time,
+)
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+from mcpcli.messages.message_types.ping_message import PingMessage
+from mcpcli.messages.message_types.tools_messages import CallToolMessage
+from mcpcli.messages.send_message import send_message
+from mcpcli.transport.client_session import ClientSession
+
+
+def test_configured_timeouts_take_precedence():
+    policy = DeadlinePolicy(
+        {"default": 7, "tools/call": 30, "tools/call:report": 120, "ping": 1}
+    )
+    assert policy.timeout_for(CallToolMessage("report", {})) == 120
+    assert policy.timeout_for(CallToolMessage("echo", {})) == 30
+    assert policy.timeout_for(PingMessage()) == 1
+    assert policy.timeout_for(JSONRPCMessage(id="1", method="prompts/list")) == 7
+
+
+def test_builtin_defaults_without_configuration():
+    policy = DeadlinePolicy()
+    assert policy.timeout_for(CallToolMessage("report", {})) == 60
+    assert policy.timeout_for(PingMessage()) == 2
+    assert policy.timeout_for(JSONRPCMessage(id="1", method="x")) == DEFAULT_TIMEOUT
+
+
+def test_timeout_adapts_to_observed_latency():
+    policy = DeadlinePolicy()
+    message = CallToolMessage("report", {})
+    for _ in range(MIN_LATENCY_SAMPLES - 1):
+        policy.record(message, 20.0)
+    assert policy.timeout_for(message) == 60
+
+    policy.record(message, 20.0)
+    assert policy.timeout_for(message) == 60.0  # 3 x p99
+    for _ in range(MIN_LATENCY_SAMPLES):
+        policy.record(message, 40.0)
+    assert policy.timeout_for(message) == 120.0
+
+    # other tools are unaffected
+    assert policy.timeout_for(CallToolMessage("echo", {})) == 60
+
+
+def test_fast_tool_keeps_its_default_and_timeouts_grow_the_limit():
+    policy = DeadlinePolicy()
+    query = CallToolMessage("read_query", {})
+    for _ in range(MIN_LATENCY_SAMPLES):
+        policy.record(query, 0.05)
+    # a fast tool may still be given a heavy query
+    assert policy.timeout_for(query) == 60
+
+    # other methods tighten, and grow back once a request times out
+    listing = JSONRPCMessage(id="1", method="tools/list")
+    for _ in range(MIN_LATENCY_SAMPLES):
+        policy.record(listing, 0.05)
+    assert policy.timeout_for(listing) == 1.0
+    policy.record(listing, 1.0)
+    assert policy.timeout_for(listing) == 3.0
+
+
+def test_backoff_grows_with_jitter_and_is_capped():
+    delays = [DeadlinePolicy.backoff(attempt) for attempt in range(1, 20)]
+    assert all(0 <= delay <= BACKOFF_CAP for delay in delays)
+    assert len(set(delays)) > 1
+
+
+@pytest.mark.asyncio
+async def test_remaining_time_follows_enclosing_scope():
+    assert remaining_time() is None
+    with anyio.move_on_after(10):
+        assert 9 < remaining_time() <= 10
+
+
+@pytest.mark.asyncio
+async def test_overall_deadline_bounds_requests_and_retries():
+    client_write, server_read = anyio.create_memory_object_stream(10)
+    server_write, client_read = anyio.create_memory_object_stream(10)
+
+    async with ClientSession(client_read, client_write):
+        started = anyio.current_time()
+        with anyio.move_on_after(0.3):
+            # ping would wait 2 s a try, 3 times; the deadline cuts it short
+            with pytest.raises(TimeoutError):
+                await send_message(client_read, client_write, PingMessage())
+        assert anyio.current_time() - started < 1
+
+
+@pytest.mark.asyncio
+async def test_session_uses_policy_timeout_and_records_latency():
+    client_write, server_read = anyio.create_memory_object_stream(10)
+    server_write, client_read = anyio.create_memory_object_stream(10)
+    policy = DeadlinePolicy({"ping": 0.05})
+
+    async with ClientSession(client_read, client_write, policy) as session:
+        with pytest.raises(TimeoutError):
+            await session.send_request(PingMessage())
+        # the timed-out ping and its cancellation
+        await server_read.receive()
+        await server_read.receive()
+
+        async def reply():
+            while (request := await server_read.receive()).method != "ping":
+                pass
+            await server_write.send(JSONRPCMessage(id=request.id, result={}))
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(reply)
+            await session.send_request(PingMessage(), timeout=1)
+
+    # the timeout counts as a sample of at least its length
+    timed_out, answered = policy._latencies["ping"]
+    assert timed_out >= 0.05
+    assert answered < 1
+
+
+@pytest.mark.asyncio
+async def test_load_deadline_policy(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "mcpServers": {
+                    "slow": {
+                        "command": "x",
+                        "timeouts": {"tools/call": 30},
+                        "retries": 5,
+                    },
+                    "plain": {"command": "x"},
+                }
+            }
+        )
+    )
+    slow = await load_deadline_policy(str(config_path), "slow")
+    assert slow.timeout_for(CallToolMessage("report", {})) == 30
+    assert slow.retries == 5
+
+    plain = await load_deadline_policy(str(config_path), "plain")
+    assert plain.timeouts == {}
+    assert plain.retries == 3
@@ -0,0 +1,195 @@
+# tests/test_llm_client.py
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from mcpcli.llm_client import LLMClient
+
+
+def openai_response(content):
+    message = SimpleNamespace(content=content, tool_calls=None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.mark.asyncio
+async def test_async_client_is_created_once_and_reused():
+    async_openai = MagicMock()
+    async_openai.return_value.chat.completions.create = AsyncMock(
+        return_value=openai_response("hello")
+    )
+    async_openai.return_value.close = AsyncMock()
+
+    with patch("mcpcli.llm_client.AsyncOpenAI", new=async_openai):
+        client = LLMClient(provider="openai", model="gpt-4o-mini", api_key="key")
+        for _ in range(3):
+            completion = await client.acreate_completion(
+                messages=[{"role": "user", "content": "hi"}], tools=[]
+            )
+            assert completion["response"] == "hello"
+
+        await client.aclose()
+
+    async_openai.assert_called_once_with(api_key="key")
+    assert async_openai.return_value.chat.completions.create.await_count == 3
+    async_openai.return_value.close.assert_awaited_once()
+
+
+def test_sync_entry_point_reuses_its_client():
+    sync_openai = MagicMock()
+    sync_openai.return_value.chat.completions.create.return_value = openai_response(
+        "hello"
+    )
+
+    with patch("mcpcli.llm_client.OpenAI", new=sync_openai):
+        client = LLMClient(provider="openai", model="gpt-4o-mini", api_key="key")
+        client.create_completion(messages=[{"role": "user", "content": "hi"}])
+        client.create_completion(messages=[{"role": "user", "content": "hi"}])
+
+    sync_openai.assert_called_once_with(api_key="key")
+
+
+def test_anthropic_request_groups_parallel_tool_results():
+    client = LLMClient(provider="anthropic", model="claude", api_key="key")
+    messages = [
+        {"role": "system", "content": "system"},
+        {"role": "user", "content": "go"},
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {"id": "a", "function": {"name": "query", "arguments": "{}"}},
+                {"id": "b", "function": {"name": "query", "arguments": "{}"}},
+            ],
+        },
+        {"role": "tool", "tool_call_id": "a", "content": "1"},
+        {"role": "tool", "tool_call_id": "b", "content": "2"},
+    ]
+
+    request = client._anthropic_request(messages, tools=None)
+
+    assert [m["role"] for m in request["messages"]] == ["user", "assistant", "user"]
+    assert [block["tool_use_id"] for block in request["messages"][-1]["content"]] == [
+        "a",
+        "b",
+    ]
+
+
+class FakeStream:
+    """An async iterator standing in for a provider SDK stream."""
+
+    def __init__(self, items):
+        self.items = list(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.items:
+            raise StopAsyncIteration
+        return self.items.pop(0)
+
+
+def openai_chunk(content=None, tool_calls=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def openai_tool_delta(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(
+        index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments)
+    )
+
+
+async def collect(stream):
+    return [event async for event in stream]
+
+
+@pytest.mark.asyncio
+async def test_openai_stream_yields_text_and_assembles_tool_calls():
+    chunks = [
+        openai_chunk(content="Let me "),
+        openai_chunk(content="check."),
+        openai_chunk(tool_calls=[openai_tool_delta(0, id="call-1", name="query")]),
+        openai_chunk(tool_calls=[openai_tool_delta(0, arguments='{"sql": ')]),
+        openai_chunk(tool_calls=[openai_tool_delta(1, id="call-2", name="list_tables")]),
+        openai_chunk(tool_calls=[openai_tool_delta(0, arguments='"select 1"}')]),
+        openai_chunk(tool_calls=[openai_tool_delta(1, arguments="{}")]),
+    ]
+    async_openai = MagicMock()
+    async_openai.return_value.chat.completions.create = AsyncMock(
+        return_value=FakeStream(chunks)
+    )
+
+    with patch("mcpcli.llm_client.AsyncOpenAI", new=async_openai):
+        client = LLMClient(provider="openai", model="gpt-4o-mini", api_key="key")
+        events = await collect(client.astream_completion(messages=[], tools=[]))
+
+    assert [e["text"] for e in events if e["type"] == "delta"] == ["Let me ", "check."]
+    completion = events[-1]
+    assert completion["type"] == "completion"
+    assert completion["response"] == "Let me check."
+    assert completion["tool_calls"] == [
+        {
+            "id": "call-1",
+            "type": "function",
+            "function": {"name": "query", "arguments": '{"sql": "select 1"}'},
+        },
+        {
+            "id": "call-2",
+            "type": "function",
+            "function": {"name": "list_tables", "arguments": "{}"},
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_anthropic_stream_assembles_tool_use_input():
+    events = [
+        SimpleNamespace(type="message_start"),
+        SimpleNamespace(
+            type="content_block_start",
+            index=0,
+            content_block=SimpleNamespace(type="text"),
+        ),
+        SimpleNamespace(
+            type="content_block_delta",
+            index=0,
+            delta=SimpleNamespace(type="text_delta", text="Checking"),
+        ),
+        SimpleNamespace(
+            type="content_block_start",
+            index=1,
+            content_block=SimpleNamespace(type="tool_use", id="tu-1", name="query"),
+        ),
+        SimpleNamespace(
+            type="content_block_delta",
+            index=1,
+            delta=SimpleNamespace(type="input_json_delta", partial_json='{"sql": "sel'),
+        ),
+        SimpleNamespace(
+            type="content_block_delta",
+            index=1,
+            delta=SimpleNamespace(type="input_json_delta", partial_json='ect 1"}'),
+        ),
+        SimpleNamespace(type="message_stop"),
+    ]
+    async_anthropic = MagicMock()
+    async_anthropic.return_value.messages.create = AsyncMock(
+        return_value=FakeStream(events)
+    )
+
+    with patch("mcpcli.llm_client.AsyncAnthropic", new=async_anthropic):
+        client = LLMClient(provider="anthropic", model="claude", api_key="key")
+        streamed = await collect(
+            client.astream_completion(messages=[{"role": "user", "content": "hi"}])
+        )
+
+    assert streamed[0] == {"type": "delta", "text": "Checking"}
+    assert streamed[-1]["tool_calls"] == [
+        {
+            "id": "tu-1",
+            "type": "function",
+            "function": {"name": "query", "arguments": {"sql": "select 1"}},
+        }
+    ]
@@ -0,0 +1,66 @@
+# tests/test_result_spill.py
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from mcpcli.result_spill import PREVIEW_CHARS, READ_RESULT_TOOL, ResultSpill
+from mcpcli.tests.test_tools_handler import build_catalog, tool_call
+from mcpcli.tests.test_tool_catalog import make_server
+from mcpcli.tools_handler import handle_tool_calls
+
+
+def test_small_results_are_kept_as_is(tmp_path):
+    spill = ResultSpill(threshold=100, directory=str(tmp_path))
+    assert spill.spill("query", "short") == "short"
+    assert not os.listdir(tmp_path)
+
+
+def test_large_result_is_previewed_and_paged(tmp_path):
+    text = "".join(f"{n:05d}é" for n in range(2000))
+    spill = ResultSpill(threshold=1000, directory=str(tmp_path))
+
+    preview = spill.spill("query", text)
+    assert preview.startswith(text[:PREVIEW_CHARS])
+    assert '"result-1"' in preview
+    assert len(preview) < PREVIEW_CHARS + 300
+
+    page = spill.read({"handle": "result-1", "offset": PREVIEW_CHARS, "length": 600})
+    assert page.startswith(text[PREVIEW_CHARS : PREVIEW_CHARS + 600])
+    assert f"offset {PREVIEW_CHARS + 600}" in page
+
+    last = spill.read({"handle": "result-1", "offset": len(text) - 10})
+    assert last.startswith(text[-10:])
+    assert "end of result" in last
+    assert "Unknown result handle" in spill.read({"handle": "result-9"})
+
+    spill.close()
+    assert not os.path.exists(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_spill_large_results_and_page_them(tmp_path):
+    db = make_server("db")
+    catalog = await build_catalog([db], {db.streams: [{"name": "query"}]})
+    text = "row\n" * 5000
+
+    async def fake_call_tool(tool_name, arguments, read_stream, write_stream, **kwargs):
+        return {"content": [{"type": "text", "text": text}]}
+
+    conversation_history = []
+    with ResultSpill(threshold=1000, directory=str(tmp_path)) as spill:
+        with patch("mcpcli.tools_handler.send_call_tool", new=fake_call_tool):
+            await handle_tool_calls(
+                [tool_call("call-1", "query", "{}")], conversation_history, catalog, spill
+            )
+            assert len(conversation_history[-1]["content"]) < 3000
+
+            arguments = json.dumps({"handle": "result-1", "offset": 4, "length": 8})
+            await handle_tool_calls(
+                [tool_call("call-2", READ_RESULT_TOOL, arguments)],
+                conversation_history,
+                catalog,
+                spill,
+            )
+    assert conversation_history[-1]["content"].startswith("row\nrow\n\n")
@@ -0,0 +1,232 @@
+# tests/test_server_manager.py
+import json
+import sys
+import time
+from pathlib import Path
+
+import anyio
+import pytest
+
+from mcpcli.messages.send_call_tool import send_call_tool
+from mcpcli.messages.send_ping import send_ping
+from mcpcli.server_manager import ServerManager
+from mcpcli.transport.stdio.stdio_client import server_process
+
+FAKE_SERVER = str(Path(__file__).parent / "fake_mcp_server.py")
+
+
+def write_config(tmp_path, servers: dict) -> str:
+    config_path = tmp_path / "server_config.json"
+    config_path.write_text(json.dumps({"mcpServers": servers}))
+    return str(config_path)
+
+
+def fake_server(*args) -> dict:
+    return {"command": sys.executable, "args": [FAKE_SERVER, *args]}
+
+
+@pytest.mark.asyncio
+async def test_servers_start_concurrently(tmp_path):
+    config_path = write_config(
+        tmp_path,
+        {f"slow{i}": fake_server("--init-delay", "0.5") for i in range(4)},
+    )
+
+    started = time.perf_counter()
+    async with ServerManager(config_path, [f"slow{i}" for i in range(4)]) as manager:
+        elapsed = time.perf_counter() - started
+        assert len(manager.connections) == 4
+        assert not manager.failures
+        for read_stream, write_stream in manager.server_streams:
+            assert await send_ping(read_stream, write_stream)
+
+    # four sequential starts would take at least 2 seconds
+    assert elapsed < 1.8
+
+
+@pytest.mark.asyncio
+async def test_failed_servers_are_reported_individually(tmp_path):
+    config_path = write_config(
+        tmp_path,
+        {
+            "good": fake_server("--name", "good"),
+            "bad": fake_server("--fail-init"),
+            "missing": {"command": str(tmp_path / "does-not-exist")},
+        },
+    )
+
+    async with ServerManager(
+        config_path, ["good", "bad", "missing", "unknown"], startup_concurrency=2
+    ) as manager:
+        assert list(manager.connections) == ["good"]
+        assert manager.get("good").init_result.serverInfo.name == "good"
+        assert manager.get("good").startup_time > 0
+        assert set(manager.failures) == {"bad", "missing", "unknown"}
+
+
+async def wait_for(condition, timeout=10):
+    with anyio.fail_after(timeout):
+        while not condition():
+            await anyio.sleep(0.05)
+
+
+@pytest.mark.asyncio
+async def test_exited_server_is_restarted_and_callers_fail_fast(tmp_path):
+    config_path = write_config(tmp_path, {"fake": fake_server()})
+
+    async with ServerManager(config_path, ["fake"], heartbeat_interval=0) as manager:
+        conn = manager.get("fake")
+        failed_after = None
+
+        async def slow_call():
+            nonlocal failed_after
+            started = time.perf_counter()
+            result = await send_call_tool("sleep", {"seconds": 30}, *conn.streams)
+            assert result["isError"]
+            failed_after = time.perf_counter() - started
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(slow_call)
+            await anyio.sleep(0.2)
+            tg.start_soon(send_call_tool, "crash", {}, *conn.streams)
+
+        assert failed_after < 5
+        await wait_for(lambda: conn.state == "running" and conn.restarts == 1)
+        result = await send_call_tool("echo", {"text": "back"}, *conn.streams)
+        assert result["content"][0]["text"] == "back"
+
+
+@pytest.mark.asyncio
+async def test_unresponsive_server_is_restarted(tmp_path):
+    server = fake_server()
+    server["heartbeatInterval"] = 0.2
+    server["timeouts"] = {"ping": 0.2, "tools/call:freeze": 0.3}
+    config_path = write_config(tmp_path, {"fake": server})
+
+    async with ServerManager(config_path, ["fake"]) as manager:
+        conn = manager.get("fake")
+        # heartbeats only count once the call that froze it has timed out
+        result = await send_call_tool("freeze", {}, *conn.streams)
+        assert result["isError"]
+
+        await wait_for(lambda: conn.state == "running" and conn.restarts == 1)
+        assert await send_ping(*conn.streams)
+
+
+@pytest.mark.asyncio
+async def test_busy_server_is_not_restarted_mid_call(tmp_path):
+    server = fake_server("--single-threaded")
+    server["heartbeatInterval"] = 0.2
+    server["timeouts"] = {"ping": 0.2}
+    config_path = write_config(tmp_path, {"fake": server})
+
+    async with ServerManager(config_path, ["fake"]) as manager:
+        conn = manager.get("fake")
+        # the call outlasts several heartbeats the server cannot answer
+        result = await send_call_tool("sleep", {"seconds": 1}, *conn.streams)
+        assert result["content"][0]["text"] == "slept"
+        assert conn.restarts == 0
+        assert await send_ping(*conn.streams)
+
+
+@pytest.mark.asyncio
+async def test_server_is_given_up_after_max_restarts(tmp_path):
+    server = fake_server()
+    server["maxRestarts"] = 0
+    config_path = write_config(tmp_path, {"fake": server})
+
+    async with ServerManager(config_path, ["fake"], heartbeat_interval=0) as manager:
+        conn = manager.get("fake")
+        assert (await send_call_tool("crash", {}, *conn.streams))["isError"]
+
+        await wait_for(lambda: conn.state == "failed")
+        with pytest.raises(ConnectionError, match="gave up"):
+            await send_ping(*conn.streams)
+
+
+@pytest.mark.asyncio
+async def test_lazy_servers_start_once_on_first_use(tmp_path):
+    config_path = write_config(
+        tmp_path,
+        {"fake": fake_server("--name", "lazy"), "broken": {"command": "x", "args": 1}},
+    )
+
+    async with ServerManager(config_path, ["fake", "broken"], lazy=True) as manager:
+        assert set(manager.failures) == {"broken"}
+        conn = manager.get("fake")
+        assert conn.state == "stopped"
+        assert conn.init_result is None
+
+        # handlers registered before the server starts carry over to its session
+        notified = []
+        conn.session.on_notification("notifications/test", notified.append)
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(conn.ensure_started)
+
+        assert conn.state == "running"
+        assert conn.init_result.serverInfo.name == "lazy"
+        assert conn.session._notification_callbacks["notifications/test"]
+        assert await send_ping(*conn.streams)
+
+        # starting it again through the manager is a no-op
+        session = conn.session
+        await manager.start(["fake"])
+        assert conn.session is session
+
+
+@pytest.mark.asyncio
+async def test_idle_server_is_stopped_and_respawned_on_demand(tmp_path):
+    server = fake_server()
+    server["idleTimeout"] = 0.3
+    config_path = write_config(tmp_path, {"fake": server})
+
+    async with ServerManager(config_path, ["fake"], heartbeat_interval=0) as manager:
+        conn = manager.get("fake")
+        process = server_process(conn.write_stream)
+        result = await send_call_tool("echo", {"text": "hi"}, *conn.streams)
+        assert result["content"][0]["text"] == "hi"
+
+        await wait_for(lambda: conn.state == "stopped" and process.returncode is not None)
+        assert conn.idle_stops == 1
+        if sys.platform == "linux":
+            assert conn.reclaimed_bytes > 0
+
+        await conn.ensure_started()
+        assert conn.state == "running"
+        assert server_process(conn.write_stream) is not process
+        assert await send_ping(*conn.streams)
+
+
+@pytest.mark.asyncio
+async def test_replicas_share_calls_and_unhealthy_ones_leave_rotation(tmp_path):
+    server = fake_server()
+    server["replicas"] = 3
+    config_path = write_config(tmp_path, {"fake": server})
+
+    async with ServerManager(config_path, ["fake"], heartbeat_interval=0) as manager:
+        conn = manager.get("fake")
+        assert sorted(r.replica for r in conn.replicas) == [0, 1, 2]
+        assert len({server_process(r.write_stream).pid for r in conn.replicas}) == 3
+
+        # concurrent calls go to the least loaded replica
+        used = []
+
+        async def call():
+            replica = conn.pick_replica()
+            used.append(replica)
+            await send_call_tool("sleep", {"seconds": 0.2}, *replica.streams)
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(call)
+                await anyio.sleep(0.05)
+        assert len(set(used)) == 3
+
+        # a replica that is restarting is out of rotation
+        crashed = conn.replicas[1]
+        await send_call_tool("crash", {}, *crashed.streams)
+        await wait_for(lambda: crashed.state != "running")
+        assert all(conn.pick_replica() is not crashed for _ in range(6))
+        await wait_for(lambda: crashed.state == "running")
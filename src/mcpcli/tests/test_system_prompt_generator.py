@@ -0,0 +1,112 @@
+# tests/test_system_prompt_generator.py
+import json
+
+import pytest
+
+from mcpcli.system_prompt_generator import (
+    SHARED_DEFS_ID,
+    SystemPromptGenerator,
+    hoist_shared_defs,
+)
+
+ADDRESS = {"type": "object", "properties": {"street": {"type": "string"}}}
+
+
+def tool(name, **defs):
+    schema = {"type": "object", "properties": {"to": {"$ref": "#/$defs/Address"}}}
+    if defs:
+        schema["$defs"] = defs
+    return {"name": name, "description": f"The {name} tool", "inputSchema": schema}
+
+
+def test_compact_rendering_is_minified_and_independent_of_order():
+    tools = [tool("ship", Address=ADDRESS), tool("bill", Address=ADDRESS)]
+    generator = SystemPromptGenerator("compact")
+
+    prompt = generator.generate_prompt({"tools": tools})
+    reordered = generator.generate_prompt({"tools": list(reversed(tools))})
+
+    assert prompt == reordered
+    rendered = generator.render_tools({"tools": tools})
+    assert "\n" not in rendered
+    document = json.loads(rendered)
+    assert [t["name"] for t in document["tools"]] == ["bill", "ship"]
+    assert document["$defs"] == {"Address": ADDRESS}
+    assert generator.prompt_chars == len(prompt)
+    assert 0 < generator.prompt_tokens < len(prompt)
+
+
+def refs(schema):
+    if isinstance(schema, dict):
+        if "$ref" in schema:
+            yield schema["$ref"]
+        for value in schema.values():
+            yield from refs(value)
+    elif isinstance(schema, list):
+        for item in schema:
+            yield from refs(item)
+
+
+def resolve(root, pointer):
+    node = root
+    for part in pointer.lstrip("/").split("/"):
+        node = node[part]
+    return node
+
+
+def test_every_ref_in_compact_rendering_resolves():
+    own = {"Note": {"type": "string"}}
+    tools = [tool("ship", Address=ADDRESS, **own), tool("bill", Address=ADDRESS)]
+    tools[0]["inputSchema"]["properties"]["note"] = {"$ref": "#/$defs/Note"}
+    document = json.loads(SystemPromptGenerator("compact").render_tools({"tools": tools}))
+
+    assert document["$id"] == SHARED_DEFS_ID
+    for compact_tool in document["tools"]:
+        schema = compact_tool["inputSchema"]
+        for ref in refs(schema):
+            # local refs resolve in the tool's own schema, others in the document
+            base, _, pointer = ref.partition("#")
+            root = schema if not base else {SHARED_DEFS_ID: document}[base]
+            assert resolve(root, pointer)
+    assert document["tools"][1]["inputSchema"]["properties"]["note"] == {
+        "$ref": "#/$defs/Note"
+    }
+
+
+def test_full_rendering_is_unchanged():
+    tools = {"tools": [tool("ship")]}
+    prompt = SystemPromptGenerator().generate_prompt(tools)
+    assert json.dumps(tools, indent=2) in prompt
+
+
+def test_names_rendering_leaves_out_schemas():
+    rendered = SystemPromptGenerator("names").render_tools(
+        {"tools": [tool("ship"), {"name": "ping"}]}
+    )
+    assert rendered == "- ping\n- ship: The ship tool"
+
+
+def test_only_identical_defs_are_hoisted():
+    other_address = {"type": "string"}
+    tools = [
+        tool("a", Address=ADDRESS, Money={"type": "number"}),
+        tool("b", Address=ADDRESS, Money={"type": "integer"}),
+        tool("c", Address=other_address),
+        tool("d", Money={"type": "integer"}),
+    ]
+    shared, hoisted = hoist_shared_defs(tools)
+
+    # Address differs between tools, Money is the same for b and d only
+    assert shared == {}
+    tools = tools[:2] + [tool("d", Address=ADDRESS)]
+    shared, hoisted = hoist_shared_defs(tools)
+    assert shared == {"Address": ADDRESS}
+    assert hoisted[0]["inputSchema"]["$defs"] == {"Money": {"type": "number"}}
+    assert "$defs" not in hoisted[2]["inputSchema"]
+    # the input tools are left as they were
+    assert "Address" in tools[0]["inputSchema"]["$defs"]
+
+
+def test_unknown_rendering_is_rejected():
+    with pytest.raises(ValueError):
+        SystemPromptGenerator("pretty")
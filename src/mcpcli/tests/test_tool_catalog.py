@@ -0,0 +1,165 @@
+# tests/test_tool_catalog.py
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mcpcli.messages.message_types.tools_messages import ToolsListChangedMessage
+from mcpcli.tool_catalog import ToolCatalog
+from mcpcli.tool_result_cache import ToolResultCache
+from mcpcli.tools_handler import handle_tool_call
+from mcpcli.transport.client_session import ClientSession
+
+
+def make_server(name):
+    read_stream, write_stream = object(), object()
+    server = SimpleNamespace(
+        name=name,
+        streams=(read_stream, write_stream),
+        session=ClientSession(read_stream, write_stream),
+        state="running",
+        ensure_started=AsyncMock(),
+        result_cache=ToolResultCache(),
+    )
+    server.replicas = [server]
+    server.pick_replica = lambda: server
+    return server
+
+
+def tools_for(tools_by_server):
+    async def fetch_tools(read_stream, write_stream):
+        return tools_by_server[(read_stream, write_stream)]
+
+    return fetch_tools
+
+
+@pytest.mark.asyncio
+async def test_routes_unique_and_colliding_names():
+    db, files = make_server("db"), make_server("files")
+    tools_by_server = {
+        db.streams: [{"name": "query"}, {"name": "search"}],
+        files.streams: [{"name": "read_file"}, {"name": "search"}],
+    }
+
+    with patch("mcpcli.tool_catalog.fetch_tools", new=tools_for(tools_by_server)):
+        catalog = ToolCatalog([db, files])
+        await catalog.refresh()
+
+    assert [tool["name"] for tool in catalog.tools] == [
+        "query",
+        "db__search",
+        "read_file",
+        "files__search",
+    ]
+    assert catalog.resolve("query") == (db, "query")
+    assert catalog.resolve("files__search") == (files, "search")
+    assert catalog.resolve("db__query") == (db, "query")
+    assert catalog.resolve("search") is None
+    assert catalog.resolve("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_list_changed_notification_marks_server_stale():
+    db = make_server("db")
+    tools_by_server = {db.streams: [{"name": "query"}]}
+
+    with patch("mcpcli.tool_catalog.fetch_tools", new=tools_for(tools_by_server)):
+        catalog = ToolCatalog([db])
+        await catalog.refresh()
+        catalog.watch()
+        assert not await catalog.refresh_if_stale()
+
+        tools_by_server[db.streams] = [{"name": "query"}, {"name": "insert"}]
+        await db.session._notify(ToolsListChangedMessage())
+        assert await catalog.refresh_if_stale()
+
+    assert catalog.resolve("insert") == (db, "insert")
+
+
+@pytest.mark.asyncio
+async def test_tool_call_is_sent_only_to_owning_server():
+    db, files = make_server("db"), make_server("files")
+    tools_by_server = {
+        db.streams: [{"name": "query"}],
+        files.streams: [{"name": "read_file"}],
+    }
+    with patch("mcpcli.tool_catalog.fetch_tools", new=tools_for(tools_by_server)):
+        catalog = ToolCatalog([db, files])
+        await catalog.refresh()
+
+    mock_call_tool = AsyncMock(
+        return_value={"content": [{"type": "text", "text": "contents"}]}
+    )
+    tool_call = {
+        "id": "call-1",
+        "function": {"name": "read_file", "arguments": '{"path": "a.txt"}'},
+    }
+    conversation_history = []
+
+    with patch("mcpcli.tools_handler.send_call_tool", new=mock_call_tool):
+        await handle_tool_call(tool_call, conversation_history, catalog)
+
+    mock_call_tool.assert_awaited_once_with(
+        "read_file", {"path": "a.txt"}, *files.streams, idempotent=False
+    )
+    assert conversation_history[-1]["content"] == "contents"
+
+
+@pytest.mark.asyncio
+async def test_tool_call_starts_deferred_server_and_refetches_its_tools():
+    db = make_server("db")
+    tools_by_server = {db.streams: [{"name": "query"}]}
+    with patch("mcpcli.tool_catalog.fetch_tools", new=tools_for(tools_by_server)):
+        catalog = ToolCatalog([db])
+        await catalog.refresh()
+
+    db.state = "stopped"
+
+    async def start():
+        db.state = "running"
+
+    db.ensure_started = AsyncMock(side_effect=start)
+    tool_call = {"id": "call-1", "function": {"name": "query", "arguments": "{}"}}
+    mock_call_tool = AsyncMock(return_value={"content": []})
+    with patch("mcpcli.tools_handler.send_call_tool", new=mock_call_tool):
+        await handle_tool_call(tool_call, [], catalog)
+
+    db.ensure_started.assert_awaited_once()
+    mock_call_tool.assert_awaited_once()
+    # the cached tool list is checked against the running server
+    with patch("mcpcli.tool_catalog.fetch_tools", new=tools_for(tools_by_server)):
+        assert await catalog.refresh_if_stale()
+
+
+@pytest.mark.asyncio
+async def test_allowlisted_results_are_cached_until_the_tool_list_changes():
+    db = make_server("db")
+    db.result_cache = ToolResultCache({"describe_table": 60})
+    tools_by_server = {db.streams: [{"name": "describe_table"}, {"name": "insert"}]}
+    with patch("mcpcli.tool_catalog.fetch_tools", new=tools_for(tools_by_server)):
+        catalog = ToolCatalog([db])
+        await catalog.refresh()
+    catalog.watch()
+
+    def call(name, arguments):
+        return {"id": "call-1", "function": {"name": name, "arguments": arguments}}
+
+    mock_call_tool = AsyncMock(
+        return_value={"content": [{"type": "text", "text": "id INTEGER"}]}
+    )
+    with patch("mcpcli.tools_handler.send_call_tool", new=mock_call_tool):
+        await handle_tool_call(call("describe_table", '{"table": "t", "x": 1}'), [], catalog)
+        await handle_tool_call(call("describe_table", '{"x": 1, "table": "t"}'), [], catalog)
+        assert mock_call_tool.await_count == 1
+
+        # tools that are not allowlisted always reach the server
+        await handle_tool_call(call("insert", "{}"), [], catalog)
+        await handle_tool_call(call("insert", "{}"), [], catalog)
+        assert mock_call_tool.await_count == 3
+
+        await db.session._notify(ToolsListChangedMessage())
+        await handle_tool_call(call("describe_table", '{"table": "t", "x": 1}'), [], catalog)
+        assert mock_call_tool.await_count == 4
+
+    assert db.result_cache.stats()["hits"] == 1
+    assert db.result_cache.stats()["misses"] == 2
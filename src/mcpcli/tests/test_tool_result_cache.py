@@ -0,0 +1,40 @@
+# tests/test_tool_result_cache.py
+from unittest.mock import patch
+
+from mcpcli.tool_result_cache import ToolResultCache
+
+RESULT = {"content": [{"type": "text", "text": "ok"}]}
+
+
+def test_results_expire_after_their_tools_ttl():
+    cache = ToolResultCache({"list_tables": 10})
+    with patch("mcpcli.tool_result_cache.time.monotonic", return_value=100.0):
+        cache.put("list_tables", {}, RESULT)
+        assert cache.get("list_tables", {}) is RESULT
+    with patch("mcpcli.tool_result_cache.time.monotonic", return_value=111.0):
+        assert cache.get("list_tables", {}) is None
+
+    assert cache.stats() == {"entries": 0, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_least_recently_used_result_is_evicted():
+    cache = ToolResultCache({"describe_table": 60}, max_entries=2)
+    for table in ("a", "b"):
+        cache.put("describe_table", {"table": table}, RESULT)
+    assert cache.get("describe_table", {"table": "a"}) is RESULT
+    cache.put("describe_table", {"table": "c"}, RESULT)
+
+    assert cache.get("describe_table", {"table": "b"}) is None
+    assert cache.get("describe_table", {"table": "a"}) is RESULT
+    assert cache.stats()["evictions"] == 1
+
+
+def test_errors_and_unlisted_tools_are_not_cached():
+    cache = ToolResultCache({"list_tables": 60})
+    cache.put("list_tables", {}, {"isError": True, "error": "busy"})
+    cache.put("write_query", {}, RESULT)
+
+    assert cache.get("list_tables", {}) is None
+    assert cache.get("write_query", {}) is None
+    # only allowlisted tools count as misses
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,64 @@
+# tests/test_tool_selector.py
+from mcpcli.tool_selector import ToolSelector, terms
+
+
+def tool(name, description, *parameters):
+    return {
+        "name": name,
+        "description": description,
+        "inputSchema": {
+            "type": "object",
+            "properties": {parameter: {"type": "string"} for parameter in parameters},
+        },
+    }
+
+
+TOOLS = [
+    tool("read_query", "Run a SELECT query on the SQLite database", "query"),
+    tool("list_tables", "List the tables in the SQLite database"),
+    tool("describe_table", "Show the columns of a table", "table_name"),
+    tool("read_file", "Read a file from disk", "path"),
+    tool("write_file", "Write text to a file on disk", "path", "content"),
+    tool("fetchUrl", "Fetch a web page and return it as markdown", "url"),
+    tool("send_email", "Send an email message", "to", "subject", "body"),
+]
+
+
+def names(tools):
+    return [tool["name"] for tool in tools]
+
+
+def test_terms_split_snake_and_camel_case():
+    assert terms("fetchUrl read_file HTTPServer") == [
+        "fetch", "url", "read", "file", "httpserver"
+    ]
+
+
+def test_selects_the_most_relevant_tools_in_catalog_order():
+    selector = ToolSelector(TOOLS, max_tools=2)
+    assert names(selector.select("which tables are in the database?")) == [
+        "read_query",
+        "list_tables",
+    ]
+    # a spare slot is filled in catalog order
+    assert names(selector.select("fetch this url")) == ["read_query", "fetchUrl"]
+
+
+def test_query_matching_nothing_still_gets_tools():
+    selector = ToolSelector(TOOLS, max_tools=3)
+    assert names(selector.select("yes, go ahead")) == [
+        "read_query",
+        "list_tables",
+        "describe_table",
+    ]
+
+
+def test_recently_used_tools_are_always_included():
+    selector = ToolSelector(TOOLS, max_tools=2)
+    selector.record_use("send_email")
+    assert "send_email" in names(selector.select("describe the table columns"))
+
+
+def test_small_catalogs_and_zero_limit_send_every_tool():
+    assert ToolSelector(TOOLS, max_tools=0).select("file") == TOOLS
+    assert ToolSelector(TOOLS, max_tools=10).select("file") == TOOLS
@@ -0,0 +1,95 @@
+# tests/test_tools_handler.py
+import time
+from unittest.mock import patch
+
+import anyio
+import pytest
+
+from mcpcli.tool_catalog import ToolCatalog
+from mcpcli.tools_handler import handle_tool_calls
+from mcpcli.tests.test_tool_catalog import make_server, tools_for
+
+
+async def build_catalog(servers, tools_by_server, **kwargs):
+    with patch("mcpcli.tool_catalog.fetch_tools", new=tools_for(tools_by_server)):
+        catalog = ToolCatalog(servers, **kwargs)
+        await catalog.refresh()
+    return catalog
+
+
+def tool_call(call_id, name, arguments):
+    return {"id": call_id, "function": {"name": name, "arguments": arguments}}
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_run_concurrently_and_keep_order():
+    db, files = make_server("db"), make_server("files")
+    catalog = await build_catalog(
+        [db, files],
+        {db.streams: [{"name": "query"}], files.streams: [{"name": "read_file"}]},
+    )
+
+    async def fake_call_tool(tool_name, arguments, read_stream, write_stream, **kwargs):
+        await anyio.sleep(arguments["delay"])
+        return {"content": [{"type": "text", "text": f"{tool_name}:{arguments['delay']}"}]}
+
+    tool_calls = [
+        tool_call("call-1", "query", '{"delay": 0.3}'),
+        tool_call("call-2", "read_file", {"delay": 0.1}),
+        tool_call("call-3", "query", '{"delay": 0.2}'),
+    ]
+    conversation_history = [{"role": "user", "content": "go"}]
+
+    started = time.perf_counter()
+    with patch("mcpcli.tools_handler.send_call_tool", new=fake_call_tool):
+        await handle_tool_calls(tool_calls, conversation_history, catalog)
+    assert time.perf_counter() - started < 0.5
+
+    # one assistant message carrying every call, then the results in call order
+    assistant, *results = conversation_history[1:]
+    assert [call["id"] for call in assistant["tool_calls"]] == ["call-1", "call-2", "call-3"]
+    assert [result["tool_call_id"] for result in results] == ["call-1", "call-2", "call-3"]
+    assert [result["content"] for result in results] == [
+        "query:0.3",
+        "read_file:0.1",
+        "query:0.2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_capped_per_server():
+    db = make_server("db")
+    catalog = await build_catalog(
+        [db], {db.streams: [{"name": "query"}]}, max_concurrent_calls=2
+    )
+    in_flight = peak = 0
+
+    async def fake_call_tool(tool_name, arguments, read_stream, write_stream, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await anyio.sleep(0.05)
+        in_flight -= 1
+        return {"content": []}
+
+    tool_calls = [tool_call(f"call-{i}", "query", {}) for i in range(6)]
+    conversation_history = []
+    with patch("mcpcli.tools_handler.send_call_tool", new=fake_call_tool):
+        await handle_tool_calls(tool_calls, conversation_history, catalog)
+
+    assert peak == 2
+    assert len(conversation_history) == 7
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool_still_gets_a_result():
+    db = make_server("db")
+    catalog = await build_catalog([db], {db.streams: [{"name": "query"}]})
+    conversation_history = []
+
+    await handle_tool_calls(
+        [tool_call("call-1", "missing", {})], conversation_history, catalog
+    )
+
+    assert conversation_history[-1]["tool_call_id"] == "call-1"
+    assert conversation_history[-1]["content"] == "Unknown tool 'missing'"
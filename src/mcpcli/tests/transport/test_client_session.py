@@ -0,0 +1,300 @@
+# tests/transport/test_client_session.py
+import anyio
+import pytest
+
+from mcpcli.messages.json_codec import decode_message
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+from mcpcli.messages.message_types.ping_message import PingMessage
+from mcpcli.messages.send_message import send_message
+from mcpcli.messages.send_ping import send_ping
+from mcpcli.transport.client_session import ClientSession
+
+
+def create_transport():
+    """Create the client and server ends of an in-memory transport."""
+    client_write, server_read = anyio.create_memory_object_stream(10)
+    server_write, client_read = anyio.create_memory_object_stream(10)
+    return (client_read, client_write), (server_read, server_write)
+
+
+async def reversing_server(read_stream, write_stream, batch_size):
+    """Collect a batch of requests, then answer them in reverse order."""
+    batch = []
+    async for request in read_stream:
+        batch.append(request)
+        if len(batch) == batch_size:
+            for pending in reversed(batch):
+                await write_stream.send(
+                    JSONRPCMessage(id=pending.id, result={"echo": pending.id})
+                )
+            batch.clear()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_routed_by_id():
+    (client_read, client_write), (server_read, server_write) = create_transport()
+    results = {}
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(reversing_server, server_read, server_write, 5)
+
+        async with ClientSession(client_read, client_write) as session:
+
+            async def call():
+                message = PingMessage()
+                response = await session.send_request(message, timeout=2)
+                results[message.id] = response.result["echo"]
+
+            async with anyio.create_task_group() as callers:
+                for _ in range(5):
+                    callers.start_soon(call)
+
+            assert session.pending_count == 0
+
+        tg.cancel_scope.cancel()
+
+    assert len(results) == 5
+    assert all(request_id == echo for request_id, echo in results.items())
+
+
+@pytest.mark.asyncio
+async def test_late_response_is_not_given_to_next_caller():
+    (client_read, client_write), (server_read, server_write) = create_transport()
+
+    async with ClientSession(client_read, client_write) as session:
+        first = PingMessage()
+        with pytest.raises(TimeoutError):
+            await session.send_request(first, timeout=0.05)
+
+        # the first request's reply arrives late, followed by the second's
+        second = PingMessage()
+        await server_write.send(JSONRPCMessage(id=first.id, result={"n": 1}))
+        await server_write.send(JSONRPCMessage(id=second.id, result={"n": 2}))
+
+        response = await session.send_request(second, timeout=1)
+        assert response.id == second.id
+        assert response.result == {"n": 2}
+
+
+@pytest.mark.asyncio
+async def test_pending_request_fails_when_transport_closes():
+    (client_read, client_write), (server_read, server_write) = create_transport()
+
+    async with ClientSession(client_read, client_write) as session:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(server_write.aclose)
+            with pytest.raises(ConnectionError):
+                await session.send_request(PingMessage(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_send_helpers_use_attached_session():
+    (client_read, client_write), (server_read, server_write) = create_transport()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(reversing_server, server_read, server_write, 1)
+        async with ClientSession(client_read, client_write):
+            assert ClientSession.for_stream(client_write) is not None
+            assert await send_ping(client_read, client_write) is True
+        tg.cancel_scope.cancel()
+
+    assert ClientSession.for_stream(client_write) is None
+
+
+@pytest.mark.asyncio
+async def test_notifications_go_to_handlers_not_callers():
+    (client_read, client_write), (server_read, server_write) = create_transport()
+    received = anyio.Event()
+    progress = []
+
+    async def on_progress(message):
+        progress.append(message.params["progress"])
+        received.set()
+
+    async with ClientSession(client_read, client_write) as session:
+        session.on_notification("notifications/progress", on_progress)
+        request = PingMessage()
+
+        async def reply():
+            await server_read.receive()
+            await server_write.send(
+                JSONRPCMessage(
+                    method="notifications/progress",
+                    params={"progressToken": "t", "progress": 1},
+                )
+            )
+            await server_write.send(JSONRPCMessage(id=request.id, result={"n": 1}))
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(reply)
+            response = await session.send_request(request, timeout=1)
+
+        with anyio.fail_after(1):
+            await received.wait()
+
+    assert response.result == {"n": 1}
+    assert progress == [1]
+
+
+@pytest.mark.asyncio
+async def test_slow_notification_handler_does_not_delay_responses():
+    (client_read, client_write), (server_read, server_write) = create_transport()
+    release = anyio.Event()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(reversing_server, server_read, server_write, 1)
+        async with ClientSession(client_read, client_write) as session:
+            session.on_notification("notifications/message", lambda m: release.wait())
+            await server_write.send(JSONRPCMessage(method="notifications/message"))
+
+            with anyio.fail_after(1):
+                response = await session.send_request(PingMessage(), timeout=1)
+            assert response.result is not None
+            release.set()
+        tg.cancel_scope.cancel()
+
+
+@pytest.mark.asyncio
+async def test_server_requests_are_answered():
+    (client_read, client_write), (server_read, server_write) = create_transport()
+
+    async with ClientSession(client_read, client_write) as session:
+        session.on_request("roots/list", lambda message: {"roots": []})
+
+        await server_write.send(JSONRPCMessage(id="s-1", method="ping"))
+        await server_write.send(JSONRPCMessage(id="s-2", method="roots/list"))
+        await server_write.send(JSONRPCMessage(id="s-3", method="sampling/create"))
+
+        with anyio.fail_after(1):
+            replies = {}
+            for _ in range(3):
+                reply = await server_read.receive()
+                replies[reply.id] = reply
+
+    assert replies["s-1"].result == {}
+    assert replies["s-2"].result == {"roots": []}
+    assert replies["s-3"].error["code"] == -32601
+
+
+@pytest.mark.asyncio
+async def test_server_requests_with_integer_ids_keep_the_session_alive():
+    (client_read, client_write), (server_read, server_write) = create_transport()
+
+    async with ClientSession(client_read, client_write) as session:
+        session.on_request("roots/list", lambda message: {"roots": []})
+
+        # decoded without validation, as the transports do
+        for line in (
+            '{"jsonrpc":"2.0","id":7,"method":"roots/list"}',
+            '{"jsonrpc":"2.0","id":8,"method":"sampling/create"}',
+        ):
+            await server_write.send(decode_message(line))
+
+        with anyio.fail_after(1):
+            replies = {}
+            for _ in range(2):
+                reply = await server_read.receive()
+                replies[reply.id] = reply
+
+        assert replies[7].result == {"roots": []}
+        assert replies[8].error["code"] == -32601
+        assert not session.closed
+
+
+@pytest.mark.asyncio
+async def test_server_log_messages_are_logged(caplog):
+    (client_read, client_write), (server_read, server_write) = create_transport()
+
+    async with ClientSession(client_read, client_write):
+        await server_write.send(
+            JSONRPCMessage(
+                method="notifications/message",
+                params={"level": "warning", "logger": "db", "data": "disk full"},
+            )
+        )
+        with anyio.fail_after(1):
+            while "disk full" not in caplog.text:
+                await anyio.sleep(0.01)
+
+    [record] = [r for r in caplog.records if "disk full" in r.getMessage()]
+    assert record.getMessage() == "[db] disk full"
+    assert record.levelname == "WARNING"
+
+
+@pytest.mark.asyncio
+async def test_send_message_without_session_skips_notifications():
+    (client_read, client_write), (server_read, server_write) = create_transport()
+    request = PingMessage()
+
+    await server_write.send(JSONRPCMessage(method="notifications/message"))
+    await server_write.send(JSONRPCMessage(id=request.id, result={"ok": True}))
+
+    response = await send_message(client_read, client_write, request, timeout=1)
+    assert response["result"] == {"ok": True}
+
+
+@pytest.mark.asyncio
+async def test_timeout_cancels_request_on_server():
+    (client_read, client_write), (server_read, server_write) = create_transport()
+
+    async with ClientSession(client_read, client_write) as session:
+        request = PingMessage()
+        with pytest.raises(TimeoutError):
+            await session.send_request(request, timeout=0.05)
+
+        sent = await server_read.receive()
+        cancelled = await server_read.receive()
+
+    assert sent.id == request.id
+    assert cancelled.method == "notifications/cancelled"
+    assert cancelled.id is None
+    assert cancelled.params["requestId"] == request.id
+
+
+@pytest.mark.asyncio
+async def test_outer_cancellation_still_notifies_server():
+    (client_read, client_write), (server_read, server_write) = create_transport()
+
+    async with ClientSession(client_read, client_write) as session:
+        request = PingMessage()
+        with anyio.move_on_after(0.05):
+            await session.send_request(request, timeout=5)
+
+        await server_read.receive()
+        cancelled = await server_read.receive()
+        assert cancelled.params["requestId"] == request.id
+
+
+@pytest.mark.asyncio
+async def test_only_idempotent_requests_are_retried_with_fresh_ids(monkeypatch):
+    (client_read, client_write), (server_read, server_write) = create_transport()
+    monkeypatch.setattr(anyio, "sleep", lambda seconds: anyio.lowlevel.checkpoint())
+
+    async with ClientSession(client_read, client_write):
+        # a tool call is sent once, then cancelled
+        with pytest.raises(TimeoutError):
+            await send_message(
+                client_read,
+                client_write,
+                JSONRPCMessage(id="call-1", method="tools/call"),
+                timeout=0.05,
+            )
+        sent = [server_read.receive_nowait() for _ in range(2)]
+        assert [m.method for m in sent] == ["tools/call", "notifications/cancelled"]
+
+        # a ping is retried, each attempt under a new id
+        with pytest.raises(TimeoutError):
+            await send_message(
+                client_read, client_write, PingMessage(), timeout=0.05, retries=3
+            )
+        pings = []
+        while True:
+            try:
+                message = server_read.receive_nowait()
+            except anyio.WouldBlock:
+                break
+            if message.method == "ping":
+                pings.append(message.id)
+
+    assert len(pings) == 3
+    assert len(set(pings)) == 3
@@ -0,0 +1,220 @@
+# tests/transport/test_http_client.py
+import json
+
+import anyio
+import pytest
+from anyio.streams.buffered import BufferedByteReceiveStream
+
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+from mcpcli.messages.message_types.ping_message import PingMessage
+from mcpcli.messages.send_call_tool import send_call_tool
+from mcpcli.messages.send_initialize_message import send_initialize
+from mcpcli.messages.send_tools_list import send_tools_list
+from mcpcli.transport.client_session import ClientSession
+from mcpcli.transport.http.http_client import SESSION_HEADER, TRANSPORT_ERROR, http_client
+from mcpcli.transport.http.http_server_parameters import HttpServerParameters
+from mcpcli.transport.http.sse import iter_sse_data
+
+
+class StandInServer:
+    """
+    A minimal in-process Streamable HTTP MCP server, speaking HTTP/1.1 with keep-alive.
+
+    Answers initialize with a session id, tools/list as an SSE stream preceded by a
+    progress notification, tool calls as JSON after an optional sleep, and offers a
+    GET stream carrying one list_changed notification.
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = []
+        self.deleted = False
+        self.port = None
+
+    async def serve(self, *, task_status):
+        listener = await anyio.create_tcp_listener(local_host="127.0.0.1")
+        self.port = listener.extra(anyio.abc.SocketAttribute.local_port)
+        task_status.started()
+        await listener.serve(self.handle)
+
+    async def handle(self, stream):
+        self.connections += 1
+        receiver = BufferedByteReceiveStream(stream)
+        async with stream:
+            while True:
+                try:
+                    head = await receiver.receive_until(b"\r\n\r\n", 65536)
+                except (anyio.EndOfStream, anyio.IncompleteRead):
+                    return
+                request_line, *header_lines = head.decode().split("\r\n")
+                method = request_line.split()[0]
+                headers = {
+                    name.lower(): value.strip()
+                    for name, _, value in (h.partition(":") for h in header_lines)
+                }
+                length = int(headers.get("content-length", 0))
+                body = await receiver.receive_exactly(length) if length else b""
+                await self.respond(stream, method, headers, body)
+
+    async def respond(self, stream, method, headers, body):
+        if method == "DELETE":
+            self.deleted = headers.get(SESSION_HEADER.lower()) == "session-1"
+            return await send(stream, 200)
+        if method == "GET":
+            event = {"jsonrpc": "2.0", "method": "notifications/tools/list_changed"}
+            return await send(stream, 200, sse(event), "text/event-stream")
+
+        message = json.loads(body)
+        self.requests.append((message, headers.get(SESSION_HEADER.lower())))
+        if "id" not in message:
+            return await send(stream, 202)
+
+        result = {}
+        if message["method"] == "initialize":
+            result = {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "serverInfo": {"name": "http", "version": "1.0.0"},
+            }
+            reply = {"jsonrpc": "2.0", "id": message["id"], "result": result}
+            return await send(stream, 200, json.dumps(reply), extra={SESSION_HEADER: "session-1"})
+        if message["method"] == "tools/list":
+            progress = {"jsonrpc": "2.0", "method": "notifications/progress", "params": {}}
+            reply = {"jsonrpc": "2.0", "id": message["id"], "result": {"tools": [{"name": "echo"}]}}
+            return await send(stream, 200, sse(progress) + sse(reply), "text/event-stream")
+        if message["method"] == "tools/call":
+            await anyio.sleep(message["params"]["arguments"].get("seconds", 0))
+            result = {"content": [{"type": "text", "text": "done"}]}
+
+        reply = {"jsonrpc": "2.0", "id": message["id"], "result": result}
+        await send(stream, 200, json.dumps(reply))
+
+
+def sse(message) -> str:
+    return f"event: message\ndata: {json.dumps(message)}\n\n"
+
+
+async def send(stream, status, body="", content_type="application/json", extra=None):
+    payload = body.encode()
+    head = f"HTTP/1.1 {status} OK\r\nContent-Length: {len(payload)}\r\n"
+    if payload:
+        head += f"Content-Type: {content_type}\r\n"
+    for name, value in (extra or {}).items():
+        head += f"{name}: {value}\r\n"
+    await stream.send(head.encode() + b"\r\n" + payload)
+
+
+@pytest.mark.asyncio
+async def test_requests_share_pooled_connections_and_session():
+    server = StandInServer()
+    async with anyio.create_task_group() as tg:
+        await tg.start(server.serve)
+        params = HttpServerParameters(url=f"http://127.0.0.1:{server.port}/mcp")
+
+        notifications = []
+        async with http_client(params) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                session.on_notification("notifications/progress", notifications.append)
+                session.on_notification(
+                    "notifications/tools/list_changed", notifications.append
+                )
+
+                init_result = await send_initialize(read_stream, write_stream)
+                assert init_result.serverInfo.name == "http"
+
+                # a response streamed as SSE, after a notification
+                for _ in range(3):
+                    tools = await send_tools_list(read_stream, write_stream)
+                    assert tools["tools"] == [{"name": "echo"}]
+
+                # concurrent calls are not serialized behind one another
+                started = anyio.current_time()
+                async with anyio.create_task_group() as calls:
+                    for _ in range(4):
+                        calls.start_soon(
+                            send_call_tool, "sleep", {"seconds": 0.3}, read_stream, write_stream
+                        )
+                assert anyio.current_time() - started < 1.0
+
+                with anyio.fail_after(2):
+                    while len(notifications) < 4:
+                        await anyio.sleep(0.01)
+
+        tg.cancel_scope.cancel()
+
+    methods = [n.method for n in notifications]
+    assert methods.count("notifications/progress") == 3
+    assert "notifications/tools/list_changed" in methods
+
+    # every message after initialize carries the session id, which is ended on exit
+    assert all(session_id == "session-1" for _, session_id in server.requests[1:])
+    assert server.deleted
+    # sequential requests reused a kept-alive connection; concurrent ones added a few
+    assert server.connections <= 6
+
+
+@pytest.mark.asyncio
+async def test_unreachable_server_fails_requests_at_once():
+    listener = await anyio.create_tcp_listener(local_host="127.0.0.1")
+    port = listener.extra(anyio.abc.SocketAttribute.local_port)
+    await listener.aclose()
+
+    params = HttpServerParameters(url=f"http://127.0.0.1:{port}/mcp")
+    async with http_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            with anyio.fail_after(5):
+                response = await session.send_request(PingMessage(), timeout=30)
+
+    assert response.error["code"] == TRANSPORT_ERROR
+
+
+@pytest.mark.asyncio
+async def test_spilled_notifications_are_delivered():
+    server = StandInServer()
+    async with anyio.create_task_group() as tg:
+        await tg.start(server.serve)
+        params = HttpServerParameters(
+            url=f"http://127.0.0.1:{server.port}/mcp",
+            read_buffer_size=1,
+            notification_policy="spill",
+        )
+
+        async with http_client(params) as (read_stream, write_stream):
+            # nothing reads until every response has arrived, so progress
+            # notifications overflow the one-message buffer
+            for request_id in range(3):
+                await write_stream.send(
+                    JSONRPCMessage(id=str(request_id), method="tools/list")
+                )
+            await anyio.sleep(0.3)
+
+            received = []
+            with anyio.fail_after(2):
+                while len(received) < 6:
+                    received.append(await read_stream.receive())
+
+        tg.cancel_scope.cancel()
+
+    methods = [message.method for message in received]
+    assert methods.count("notifications/progress") == 3
+    assert sorted(message.id for message in received if message.id) == ["0", "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_sse_parser_joins_data_lines_and_skips_other_events():
+    async def lines():
+        for line in [
+            ": keep-alive",
+            "event: message",
+            'data: {"a":',
+            "data: 1}",
+            "",
+            "event: ping",
+            "data: ignored",
+            "",
+            "id: 7",
+            "data: last",
+        ]:
+            yield line
+
+    assert [data async for data in iter_sse_data(lines())] == ['{"a":\n1}', "last"]
@@ -0,0 +1,109 @@
+# tests/transport/test_inprocess_client.py
+import json
+
+import anyio
+import pytest
+
+from mcpcli.messages.message_types.tools_messages import CallToolMessage
+from mcpcli.messages.send_call_tool import send_call_tool
+from mcpcli.messages.send_initialize_message import send_initialize
+from mcpcli.messages.send_ping import send_ping
+from mcpcli.messages.send_tools_list import send_tools_list
+from mcpcli.server_manager import ServerManager
+from mcpcli.transport.client_session import ClientSession
+from mcpcli.transport.inprocess.inprocess_client import inprocess_client, load_entry_point
+from mcpcli.transport.inprocess.inprocess_server_parameters import (
+    InProcessServerParameters,
+)
+
+ENTRY_POINT = "mcpcli.tests.fake_inprocess_server:server"
+
+
+def write_config(tmp_path, servers: dict) -> str:
+    config_path = tmp_path / "server_config.json"
+    config_path.write_text(json.dumps({"mcpServers": servers}))
+    return str(config_path)
+
+
+@pytest.mark.asyncio
+async def test_session_round_trip_without_a_subprocess():
+    params = InProcessServerParameters(entry_point=ENTRY_POINT)
+    async with inprocess_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream):
+            init_result = await send_initialize(read_stream, write_stream)
+            assert init_result.serverInfo.name == "inprocess"
+
+            tools = await send_tools_list(read_stream, write_stream)
+            assert [tool["name"] for tool in tools["tools"]] == ["echo", "stop"]
+
+            async with anyio.create_task_group() as tg:
+                for n in range(5):
+                    tg.start_soon(send_call_tool, "echo", {"text": str(n)}, read_stream, write_stream)
+            result = await send_call_tool("echo", {"text": "hi"}, read_stream, write_stream)
+            assert result["content"][0]["text"] == "hi"
+
+
+@pytest.mark.asyncio
+async def test_server_that_returns_is_reported_as_exited():
+    params = InProcessServerParameters(entry_point=ENTRY_POINT)
+    async with inprocess_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await send_initialize(read_stream, write_stream)
+            result = await send_call_tool("stop", {}, read_stream, write_stream)
+            assert result["isError"]
+            with anyio.fail_after(5):
+                await session.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_failing_server_ends_the_session():
+    params = InProcessServerParameters(
+        entry_point="mcpcli.tests.fake_inprocess_server:failing_server"
+    )
+    async with inprocess_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            with anyio.fail_after(5):
+                await session.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_spilled_notifications_are_delivered():
+    params = InProcessServerParameters(
+        entry_point=ENTRY_POINT, read_buffer_size=1, notification_policy="spill"
+    )
+    async with inprocess_client(params) as (read_stream, write_stream):
+        # nothing reads until the response has arrived, so the progress
+        # notifications overflow the one-message buffer
+        await write_stream.send(CallToolMessage("echo", {"text": "hi", "progress": 3}))
+        await anyio.sleep(0.1)
+
+        received = []
+        with anyio.fail_after(2):
+            while len(received) < 4:
+                received.append(await read_stream.receive())
+
+    methods = [message.method for message in received]
+    assert methods.count("notifications/progress") == 3
+    # spilled notifications may come after the response
+    (response,) = [message for message in received if message.id]
+    assert response.result["content"][0]["text"] == "hi"
+
+
+def test_entry_point_must_name_a_callable():
+    with pytest.raises(ValueError):
+        load_entry_point("mcpcli.tests.fake_inprocess_server")
+    with pytest.raises(ValueError):
+        load_entry_point("mcpcli.tests.fake_inprocess_server:not_a_server")
+
+
+@pytest.mark.asyncio
+async def test_server_manager_runs_entry_point_servers(tmp_path):
+    config_path = write_config(tmp_path, {"local": {"entryPoint": ENTRY_POINT}})
+
+    async with ServerManager(config_path, ["local"], heartbeat_interval=0) as manager:
+        conn = manager.get("local")
+        assert conn.transport == "inprocess"
+        assert conn.init_result.serverInfo.name == "inprocess"
+        assert await send_ping(*conn.streams)
+        result = await send_call_tool("echo", {"text": "local"}, *conn.streams)
+        assert result["content"][0]["text"] == "local"
@@ -0,0 +1,103 @@
+# tests/transport/test_line_framer.py
+import json
+import sys
+
+import anyio
+import pytest
+
+from mcpcli.transport.stdio.line_framer import LineFramer
+from mcpcli.transport.stdio.stdio_client import stdio_client
+from mcpcli.transport.stdio.stdio_server_parameters import StdioServerParameters
+
+
+def test_frames_split_across_chunks():
+    framer = LineFramer()
+    assert framer.feed(b'{"id": 1}\n{"id"') == [b'{"id": 1}']
+    assert framer.feed(b": 2") == []
+    assert framer.buffered == len(b'{"id": 2')
+    assert framer.feed(b'}\n{"id": 3}\n') == [b'{"id": 2}', b'{"id": 3}']
+    assert framer.buffered == 0
+
+
+def test_blank_lines_are_skipped():
+    framer = LineFramer()
+    assert framer.feed(b"\n  \r\n{}\n\n") == [b"{}"]
+
+
+def test_multibyte_characters_split_across_chunks():
+    """Bytes are only decoded once a frame is complete."""
+    encoded = '{"text": "héllo ✓"}\n'.encode()
+    framer = LineFramer()
+    frames = []
+    for i in range(len(encoded)):
+        frames += framer.feed(encoded[i : i + 1])
+    assert [json.loads(frame) for frame in frames] == [{"text": "héllo ✓"}]
+
+
+def test_finish_returns_unterminated_frame():
+    framer = LineFramer()
+    framer.feed(b'{"id": 1}')
+    assert framer.finish() == b'{"id": 1}'
+    assert framer.finish() is None
+
+
+def test_oversized_frame_is_dropped():
+    framer = LineFramer(max_frame_bytes=16)
+    assert framer.feed(b'{"big": "' + b"x" * 10) == []
+    # past the limit: the partial frame is discarded, not kept
+    assert framer.feed(b"x" * 20) == []
+    assert framer.buffered == 0
+    assert framer.feed(b'xx"}\n{"id": 1}\n') == [b'{"id": 1}']
+    assert framer.dropped_frames == 1
+
+
+def test_oversized_complete_frame_is_dropped():
+    framer = LineFramer(max_frame_bytes=16)
+    assert framer.feed(b'{"big": "' + b"x" * 20 + b'"}\n{"id": 1}\n') == [
+        b'{"id": 1}'
+    ]
+    assert framer.dropped_frames == 1
+
+
+def test_oversized_frame_at_end_of_stream_is_dropped():
+    framer = LineFramer(max_frame_bytes=4)
+    framer.feed(b"x" * 10)
+    assert framer.finish() is None
+
+
+# writes one large response in small pieces, then a small one
+CHUNKED_SERVER = """
+import json, sys, time
+line = json.dumps({"jsonrpc": "2.0", "id": "1", "result": {"text": "x" * 200000}})
+for i in range(0, len(line), 4096):
+    sys.stdout.write(line[i : i + 4096])
+    sys.stdout.flush()
+sys.stdout.write("\\n" + json.dumps({"jsonrpc": "2.0", "id": "2", "result": {}}) + "\\n")
+sys.stdout.flush()
+sys.stdin.read()
+"""
+
+
+@pytest.mark.asyncio
+async def test_stdio_client_reassembles_chunked_messages():
+    server = StdioServerParameters(command=sys.executable, args=["-c", CHUNKED_SERVER])
+    async with stdio_client(server) as (read_stream, write_stream):
+        with anyio.fail_after(10):
+            first = await read_stream.receive()
+            second = await read_stream.receive()
+        await write_stream.aclose()
+    assert first.id == "1"
+    assert len(first.result["text"]) == 200000
+    assert second.id == "2"
+
+
+@pytest.mark.asyncio
+async def test_stdio_client_drops_messages_over_the_limit():
+    server = StdioServerParameters(
+        command=sys.executable, args=["-c", CHUNKED_SERVER], max_frame_bytes=1024
+    )
+    async with stdio_client(server) as (read_stream, write_stream):
+        with anyio.fail_after(10):
+            message = await read_stream.receive()
+        await write_stream.aclose()
+    assert message.id == "2"
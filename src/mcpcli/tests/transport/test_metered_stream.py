@@ -0,0 +1,112 @@
+# tests/transport/test_metered_stream.py
+import anyio
+import pytest
+
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+from mcpcli.transport.client_session import ClientSession
+from mcpcli.transport.metered_stream import StreamMetrics, create_metered_stream
+
+
+def notification(n):
+    return JSONRPCMessage(method="notifications/progress", params={"n": n})
+
+
+def response(n):
+    return JSONRPCMessage(id=str(n), result={})
+
+
+@pytest.mark.asyncio
+async def test_depth_and_high_water_mark():
+    send_stream, receive_stream = create_metered_stream("test", 4)
+    metrics = StreamMetrics.for_stream(receive_stream)
+    assert StreamMetrics.for_stream(send_stream) is metrics
+
+    for n in range(3):
+        await send_stream.send(response(n))
+    await receive_stream.receive()
+
+    assert metrics.depth == 2
+    assert metrics.high_water == 3
+    assert metrics.sent == 3
+    assert metrics.blocked_sends == 0
+
+
+@pytest.mark.asyncio
+async def test_time_blocked_in_send_is_recorded():
+    send_stream, receive_stream = create_metered_stream("test", 1)
+    metrics = StreamMetrics.for_stream(send_stream)
+
+    async def slow_reader():
+        await anyio.sleep(0.1)
+        await receive_stream.receive()
+
+    async with anyio.create_task_group() as tg:
+        await send_stream.send(response(1))
+        tg.start_soon(slow_reader)
+        await send_stream.send(response(2))
+
+    assert metrics.blocked_sends == 1
+    assert metrics.blocked_seconds >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_discards_notifications_but_not_responses():
+    send_stream, receive_stream = create_metered_stream("test", 1, "drop")
+    metrics = StreamMetrics.for_stream(send_stream)
+
+    await send_stream.send(notification(1))
+    with anyio.fail_after(1):
+        await send_stream.send(notification(2))
+    assert metrics.dropped == 1
+
+    # responses still wait for room
+    with pytest.raises(TimeoutError):
+        with anyio.fail_after(0.1):
+            await send_stream.send(response(1))
+
+
+@pytest.mark.asyncio
+async def test_spill_policy_delivers_notifications_in_order():
+    send_stream, receive_stream = create_metered_stream("test", 1, "spill", 2)
+    metrics = StreamMetrics.for_stream(send_stream)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(send_stream.drain_spill)
+        for n in range(4):
+            await send_stream.send(notification(n))
+
+        # one buffered, two spilled, one over the spill limit
+        assert metrics.spilled == 2
+        assert metrics.dropped == 1
+        assert metrics.depth == 3
+
+        received = []
+        with anyio.fail_after(1):
+            for _ in range(3):
+                received.append((await receive_stream.receive()).params["n"])
+        send_stream.close()
+
+    assert received == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_session_exposes_stream_stats():
+    read_writer, read_stream = create_metered_stream("read", 8)
+    write_stream, write_reader = create_metered_stream("write", 8)
+
+    async with ClientSession(read_stream, write_stream) as session:
+        await session.send_notification(notification(1))
+        stats = session.stream_stats()
+
+    assert set(stats) == {"read", "write"}
+    assert stats["write"]["sent"] == 1
+    assert stats["write"]["depth"] == 1
+    assert stats["read"]["capacity"] == 8
+
+
+@pytest.mark.asyncio
+async def test_plain_streams_have_no_stats():
+    client_write, _ = anyio.create_memory_object_stream(1)
+    _, client_read = anyio.create_memory_object_stream(1)
+    async with ClientSession(client_read, client_write) as session:
+        assert session.stream_stats() == {}
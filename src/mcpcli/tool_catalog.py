@@ -0,0 +1,190 @@
+# tool_catalog.py
+import logging
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional
+
+import anyio
+
+from mcpcli.catalog_cache import CatalogCache
+from mcpcli.server_manager import ServerConnection
+from mcpcli.tools_handler import fetch_tools
+
+# Separator between server and tool name in server-qualified tool names
+QUALIFIED_NAME_SEPARATOR = "__"
+
+TOOLS_LIST_CHANGED = "notifications/tools/list_changed"
+
+# Default number of tool calls in flight at once on a single server
+DEFAULT_MAX_CONCURRENT_CALLS = 4
+
+
+class ToolRoute(NamedTuple):
+    """Where a tool call goes: the owning server and the tool's name on that server."""
+
+    server: ServerConnection
+    tool_name: str
+
+
+def qualified_tool_name(server_name: str, tool_name: str) -> str:
+    """Build a server-qualified tool name that is valid as an LLM function name."""
+    server_part = re.sub(r"[^a-zA-Z0-9_-]", "_", server_name)
+    return f"{server_part}{QUALIFIED_NAME_SEPARATOR}{tool_name}"
+
+
+class ToolCatalog:
+    """
+    Index of every tool on every server, mapping tool names to their owning server.
+
+    Tool names unique across servers are advertised as is. Names offered by more than
+    one server are advertised only in server-qualified form (`server__tool`), and every
+    tool can also be reached by its qualified name. The catalog marks itself stale when
+    a server sends `notifications/tools/list_changed`; `refresh_if_stale` rebuilds it.
+    With a `cache`, tool lists are served from disk and revalidated in the background,
+    so the tools of a deferred server are advertised without spawning it; the server
+    is started by the first call routed to it. Calls to a server with replicas go to
+    the replica with the fewest calls in flight.
+    """
+
+    def __init__(
+        self,
+        servers: List[ServerConnection],
+        max_concurrent_calls: int = DEFAULT_MAX_CONCURRENT_CALLS,
+        cache: Optional[CatalogCache] = None,
+    ):
+        self.servers = list(servers)
+        self.cache = cache
+        self.max_concurrent_calls = max(1, max_concurrent_calls)
+        self._limiters: Dict[str, anyio.CapacityLimiter] = {}
+        self.tools: List[dict] = []
+        self._tools_by_server: Dict[str, List[dict]] = {}
+        self._routes: Dict[str, ToolRoute] = {}
+        self._stale = set()
+
+    async def refresh(self) -> None:
+        """Fetch the tool lists of all servers concurrently and rebuild the index."""
+        await self._fetch(self.servers)
+
+    async def refresh_if_stale(self) -> bool:
+        """Refetch the servers whose tool list changed. Returns True if any did."""
+        stale = [server for server in self.servers if server.name in self._stale]
+        if not stale:
+            return False
+        await self._fetch(stale)
+        return True
+
+    def watch(self) -> None:
+        """Mark a server stale whenever it reports that its tool list changed."""
+        for server in self.servers:
+            server.session.on_notification(
+                TOOLS_LIST_CHANGED,
+                lambda message, name=server.name: self.mark_stale(name),
+            )
+
+    def mark_stale(self, server_name: str) -> None:
+        """Refetch a server's tools on the next refresh, forgetting its cached results."""
+        logging.debug(f"Tool list of '{server_name}' changed")
+        self._stale.add(server_name)
+        for server in self.servers:
+            if server.name == server_name:
+                server.result_cache.invalidate()
+
+    async def connection_for(self, route: ToolRoute) -> ServerConnection:
+        """
+        Pick the replica of the owning server to send a call to.
+
+        A stopped (deferred or idle) replica is started first, and the server's
+        tools are then revalidated.
+        """
+        server = route.server.pick_replica()
+        if server.state == "stopped":
+            await server.ensure_started()
+            self.mark_stale(route.server.name)
+        return server
+
+    async def _fetch(self, servers: List[ServerConnection]) -> None:
+        async def fetch(server):
+            async def fetch_started():
+                await server.ensure_started()
+                return await fetch_tools(*server.streams)
+
+            try:
+                if self.cache:
+                    tools = await self.cache.get_list(
+                        server,
+                        "tools",
+                        fetch_started,
+                        on_change=lambda: self.mark_stale(server.name),
+                    )
+                else:
+                    tools = await fetch_started()
+            except Exception as exc:
+                logging.error(f"Error fetching tools from '{server.name}': {exc}")
+                tools = None
+            self._tools_by_server[server.name] = tools or []
+            self._stale.discard(server.name)
+
+        async with anyio.create_task_group() as tg:
+            for server in servers:
+                tg.start_soon(fetch, server)
+
+        self._index()
+
+    def _index(self) -> None:
+        """Rebuild the advertised tools and the name -> server routes."""
+        name_counts = Counter(
+            tool["name"]
+            for server in self.servers
+            for tool in self._tools_by_server.get(server.name, [])
+        )
+
+        tools = []
+        routes = {}
+        for server in self.servers:
+            for tool in self._tools_by_server.get(server.name, []):
+                route = ToolRoute(server, tool["name"])
+                qualified_name = qualified_tool_name(server.name, tool["name"])
+                routes[qualified_name] = route
+
+                if name_counts[tool["name"]] == 1:
+                    routes[tool["name"]] = route
+                    tools.append(tool)
+                else:
+                    logging.debug(
+                        f"Tool '{tool['name']}' is offered by several servers; "
+                        f"advertising it as '{qualified_name}'"
+                    )
+                    tools.append({**tool, "name": qualified_name})
+
+        self.tools = tools
+        self._routes = routes
+
+    def limiter(self, server: ServerConnection) -> anyio.CapacityLimiter:
+        """Return the limiter capping concurrent tool calls on a server's replicas."""
+        if server.name not in self._limiters:
+            self._limiters[server.name] = anyio.CapacityLimiter(
+                self.max_concurrent_calls
+            )
+        limiter = self._limiters[server.name]
+        # replicas may be started after the limiter is created
+        limiter.total_tokens = self.max_concurrent_calls * len(server.replicas)
+        return limiter
+
+    def is_idempotent(self, route: ToolRoute) -> bool:
+        """
+        Whether calling a tool twice is harmless, going by its annotations.
+
+        Only calls to read-only or idempotent tools are retried after a timeout.
+        """
+        for tool in self._tools_by_server.get(route.server.name, []):
+            if tool["name"] == route.tool_name:
+                annotations = tool.get("annotations") or {}
+                return bool(
+                    annotations.get("readOnlyHint")
+                    or annotations.get("idempotentHint")
+                )
+        return False
+
+    def resolve(self, tool_name: str) -> Optional[ToolRoute]:
+        """Return the route for an advertised or server-qualified tool name."""
+        return self._routes.get(tool_name)
@@ -0,0 +1,87 @@
+# tool_result_cache.py
+import collections
+import json
+import logging
+import time
+from typing import Any, Dict, Optional, OrderedDict, Tuple
+
+# Results kept per server before the least recently used one is evicted
+DEFAULT_MAX_ENTRIES = 256
+
+
+def arguments_key(arguments: Any) -> str:
+    """Canonical form of tool arguments, so equal arguments in any key order match."""
+    return json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ToolResultCache:
+    """
+    Memoized results of one server's read-only tool calls.
+
+    Only the tools listed in `ttls` are cached, each result for that tool's number
+    of seconds; every other tool is always called. Results are keyed by tool name
+    and canonicalized arguments, at most `max_entries` are kept, and the least
+    recently used one is evicted first. Errors are never cached.
+
+    Configured per server in server_config.json:
+
+        "cacheTools": {"list_tables": 300, "describe_table": 60},
+        "cacheSize": 256
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.ttls = {name: float(ttl) for name, ttl in (ttls or {}).items()}
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # (tool name, arguments key) -> (expiry time, result)
+        self._entries: OrderedDict[Tuple[str, str], Tuple[float, dict]] = (
+            collections.OrderedDict()
+        )
+
+    def cacheable(self, tool_name: str) -> bool:
+        return self.ttls.get(tool_name, 0) > 0
+
+    def get(self, tool_name: str, arguments: Any) -> Optional[dict]:
+        """Return a fresh cached result, or None (counting a miss for cached tools)."""
+        if not self.cacheable(tool_name):
+            return None
+        key = (tool_name, arguments_key(arguments))
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, tool_name: str, arguments: Any, result: dict) -> None:
+        if not self.cacheable(tool_name) or result.get("isError"):
+            return
+        key = (tool_name, arguments_key(arguments))
+        self._entries[key] = (time.monotonic() + self.ttls[tool_name], result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Drop every cached result, e.g. because the server's tools changed."""
+        if self._entries:
+            logging.debug(f"Dropping {len(self._entries)} cached tool results")
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,138 @@
+# tool_selector.py
+import collections
+import json
+import logging
+import math
+import re
+from typing import Deque, Dict, Iterable, List
+
+from mcpcli.context_budget import count_tokens
+
+# Tools sent with each request when selecting; 0 sends every tool
+DEFAULT_MAX_TOOLS = 0
+
+# Most recently called tools that are always sent, whatever the query
+DEFAULT_RECENT_TOOLS = 5
+
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Times a tool's name terms are counted, so a match on the name outranks the description
+NAME_BOOST = 3
+
+
+def terms(text: str) -> List[str]:
+    """Split text into lowercase terms, breaking up snake_case and camelCase names."""
+    text = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", text)
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def tool_terms(tool: dict) -> List[str]:
+    """The terms a tool is found by: its name, description and parameter names."""
+    found = terms(tool["name"]) * NAME_BOOST + terms(tool.get("description") or "")
+    properties = (tool.get("inputSchema") or {}).get("properties") or {}
+    for name, schema in properties.items():
+        found += terms(name)
+        if isinstance(schema, dict):
+            found += terms(schema.get("description") or "")
+    return found
+
+
+def tools_tokens(tools: Iterable[dict]) -> int:
+    return sum(count_tokens(json.dumps(tool)) for tool in tools)
+
+
+class ToolSelector:
+    """
+    Pick the tools relevant to a turn from a large catalog.
+
+    An Okapi BM25 index over each tool's name, description and parameter names is
+    built once per tool list. `select` ranks the tools against the user's message
+    and returns the best `max_tools`, plus the `recent_tools` most recently called
+    ones so a multi-turn task keeps the tools it is using. When fewer than
+    `max_tools` tools match, the rest are filled in catalog order. Tools keep their
+    catalog order. With `max_tools` at 0, or a catalog no larger than it, every tool is
+    returned.
+    """
+
+    def __init__(
+        self,
+        tools: List[dict],
+        max_tools: int = DEFAULT_MAX_TOOLS,
+        recent_tools: int = DEFAULT_RECENT_TOOLS,
+    ):
+        self.max_tools = max_tools
+        self._recent: Deque[str] = collections.deque(maxlen=recent_tools)
+        self.index(tools)
+
+    def index(self, tools: List[dict]) -> None:
+        """(Re)build the index, e.g. after the catalog's tool lists changed."""
+        self.tools = list(tools)
+        self._all_tokens = None
+        self._postings: Dict[str, List[tuple]] = collections.defaultdict(list)
+        self._lengths: List[int] = []
+        for position, tool in enumerate(self.tools):
+            found = tool_terms(tool)
+            self._lengths.append(len(found))
+            for term, count in collections.Counter(found).items():
+                self._postings[term].append((position, count))
+        self._average_length = (
+            sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        )
+
+    def scores(self, query: str) -> List[float]:
+        """BM25 score of every tool for the query."""
+        scores = [0.0] * len(self.tools)
+        total = len(self.tools)
+        for term in set(terms(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, count in postings:
+                norm = 1 - BM25_B + BM25_B * self._lengths[position] / self._average_length
+                scores[position] += (
+                    idf * count * (BM25_K1 + 1) / (count + BM25_K1 * norm)
+                )
+        return scores
+
+    def record_use(self, tool_name: str) -> None:
+        """Remember that a tool was called, keeping it in the next selections."""
+        if tool_name in self._recent:
+            self._recent.remove(tool_name)
+        self._recent.append(tool_name)
+
+    def select(self, query: str) -> List[dict]:
+        """Return the tools to send for a turn starting with `query`."""
+        if not self.max_tools or len(self.tools) <= self.max_tools:
+            return self.tools
+
+        scores = self.scores(query)
+        ranked = sorted(
+            (position for position, score in enumerate(scores) if score > 0),
+            key=lambda position: -scores[position],
+        )
+        chosen = set(ranked[: self.max_tools])
+        # fill the remaining slots in catalog order, so a query that matches
+        # nothing (a follow-up like "do it again") still gets tools
+        for position in range(len(self.tools)):
+            if len(chosen) >= self.max_tools:
+                break
+            chosen.add(position)
+        chosen.update(
+            position
+            for position, tool in enumerate(self.tools)
+            if tool["name"] in self._recent
+        )
+        selected = [tool for position, tool in enumerate(self.tools) if position in chosen]
+
+        if self._all_tokens is None:
+            self._all_tokens = tools_tokens(self.tools)
+        selected_tokens = tools_tokens(selected)
+        logging.info(
+            f"Sending {len(selected)} of {len(self.tools)} tools "
+            f"({selected_tokens} instead of {self._all_tokens} tokens, saving "
+            f"{self._all_tokens - selected_tokens})"
+        )
+        return selected
@@ -1,9 +1,13 @@
 import json
 import logging
 import re
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+import anyio
+
 from mcpcli.messages.send_call_tool import send_call_tool
 from mcpcli.messages.send_tools_list import send_tools_list
+from mcpcli.result_spill import READ_RESULT_TOOL
 
 
 def parse_tool_response(response: str) -> Optional[Dict[str, Any]]:
@@ -25,13 +29,12 @@ def parse_tool_response(response: str) -> Optional[Dict[str, Any]]:
     return None
 
 
-async def handle_tool_call(tool_call, conversation_history, server_streams):
+def parse_tool_call(tool_call, conversation_history) -> Optional[Tuple[str, str, Any]]:
     """
-    Handle a single tool call for both OpenAI and Llama formats.
-    This function no longer prints directly to stdout. It updates the conversation_history
-    with the tool call and its response. The calling function can then display the results.
+    Extract (tool_call_id, tool_name, tool_args) from an OpenAI, Ollama or Llama tool call.
+
+    Returns None if the call cannot be parsed.
     """
-    tool_call_id = None
     tool_name = "unknown_tool"
     raw_arguments = {}
 
@@ -55,7 +58,7 @@ async def handle_tool_call(tool_call, conversation_history, server_streams):
             parsed_tool = parse_tool_response(last_message)
             if not parsed_tool:
                 logging.debug("Unable to parse tool call from message")
-                return
+                return None
 
             tool_call_id = parsed_tool["id"]
             tool_name = parsed_tool["function"]
@@ -67,14 +70,64 @@ async def handle_tool_call(tool_call, conversation_history, server_streams):
             if isinstance(raw_arguments, str)
             else raw_arguments
         )
+        return tool_call_id, tool_name, tool_args
 
-        # Call the tool (no direct print here)
-        for read_stream, write_stream in server_streams:
-            tool_response = await send_call_tool(
-                tool_name, tool_args, read_stream, write_stream
-            )
-            if not tool_response.get("isError"):
-                break
+    except json.JSONDecodeError:
+        logging.debug(
+            f"Error decoding arguments for tool '{tool_name}': {raw_arguments}"
+        )
+    except Exception as e:
+        logging.debug(f"Error parsing tool call '{tool_name}': {str(e)}")
+    return None
+
+
+async def call_route(route, tool_args, catalog) -> dict:
+    """
+    Send a tool call to its owning server and return the result.
+
+    A result of an allowlisted tool is served from the server's result cache
+    while it is fresh, without contacting the server.
+    """
+    cache = route.server.result_cache
+    cached = cache.get(route.tool_name, tool_args)
+    if cached is not None:
+        logging.debug(f"Serving '{route.tool_name}' from the result cache")
+        return cached
+
+    # at most a few calls at a time per server
+    async with catalog.limiter(route.server):
+        server = await catalog.connection_for(route)
+        tool_response = await send_call_tool(
+            route.tool_name,
+            tool_args,
+            *server.streams,
+            idempotent=catalog.is_idempotent(route),
+        )
+    cache.put(route.tool_name, tool_args, tool_response)
+    return tool_response
+
+
+async def call_tool(tool_name: str, tool_args, catalog, spill=None) -> str:
+    """
+    Call a tool on its owning server and return the formatted response.
+
+    With a ResultSpill, a response over its threshold is written to disk and only
+    a preview is returned, and calls to the paging tool are answered from disk.
+    """
+    try:
+        if spill and tool_name == READ_RESULT_TOOL:
+            return await anyio.to_thread.run_sync(spill.read, tool_args or {})
+
+        route = catalog.resolve(tool_name)
+        if route:
+            tool_response = await call_route(route, tool_args, catalog)
+        else:
+            error = f"Unknown tool '{tool_name}'"
+            tool_response = {
+                "isError": True,
+                "error": error,
+                "content": [{"type": "text", "text": error}],
+            }
         if tool_response.get("isError"):
             logging.debug(
                 f"Error calling tool '{tool_name}': {tool_response.get('content')}"
@@ -82,30 +135,69 @@ async def handle_tool_call(tool_call, conversation_history, server_streams):
 
         # Format the tool response
         formatted_response = format_tool_response(tool_response.get("content", []))
+        if spill and len(formatted_response) > spill.threshold:
+            formatted_response = await anyio.to_thread.run_sync(
+                spill.spill, tool_name, formatted_response
+            )
         logging.debug(f"Tool '{tool_name}' Response: {formatted_response}")
+        return formatted_response
+    except Exception as e:
+        logging.debug(f"Error handling tool call '{tool_name}': {str(e)}")
+        return f"Error calling tool '{tool_name}': {e}"
 
-        # Update the conversation history with the tool call
-        # Add the tool call itself (for OpenAI tracking)
-        conversation_history.append(
-            {
-                "role": "assistant",
-                "content": None,
-                "tool_calls": [
-                    {
-                        "id": tool_call_id,
-                        "type": "function",
-                        "function": {
-                            "name": tool_name,
-                            "arguments": json.dumps(tool_args)
-                            if isinstance(tool_args, dict)
-                            else tool_args,
-                        },
-                    }
-                ],
-            }
-        )
 
-        # Add the tool response to conversation history
+async def handle_tool_calls(tool_calls, conversation_history, catalog, spill=None):
+    """
+    Handle all tool calls from one completion, running them concurrently.
+
+    Each call is sent only to the server that owns the tool, as resolved by the
+    catalog, with at most `catalog.max_concurrent_calls` calls in flight per server.
+    Large responses are spilled to disk when a `spill` is given.
+    This function does not print to stdout. It appends one assistant message carrying
+    every tool call, followed by the tool responses in the original call order.
+    """
+    parsed_calls = [
+        parsed
+        for tool_call in tool_calls
+        if (parsed := parse_tool_call(tool_call, conversation_history))
+    ]
+    if not parsed_calls:
+        return
+
+    responses = [None] * len(parsed_calls)
+
+    async def run(index, tool_name, tool_args):
+        responses[index] = await call_tool(tool_name, tool_args, catalog, spill)
+
+    async with anyio.create_task_group() as tg:
+        for index, (_, tool_name, tool_args) in enumerate(parsed_calls):
+            tg.start_soon(run, index, tool_name, tool_args)
+
+    # Add the tool calls themselves (for OpenAI tracking)
+    conversation_history.append(
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": tool_call_id,
+                    "type": "function",
+                    "function": {
+                        "name": tool_name,
+                        "arguments": json.dumps(tool_args)
+                        if isinstance(tool_args, dict)
+                        else tool_args,
+                    },
+                }
+                for tool_call_id, tool_name, tool_args in parsed_calls
+            ],
+        }
+    )
+
+    # Add the tool responses to conversation history, in call order
+    for (tool_call_id, tool_name, _), formatted_response in zip(
+        parsed_calls, responses
+    ):
         conversation_history.append(
             {
                 "role": "tool",
@@ -115,12 +207,14 @@ async def handle_tool_call(tool_call, conversation_history, server_streams):
             }
         )
 
-    except json.JSONDecodeError:
-        logging.debug(
-            f"Error decoding arguments for tool '{tool_name}': {raw_arguments}"
-        )
-    except Exception as e:
-        logging.debug(f"Error handling tool call '{tool_name}': {str(e)}")
+
+async def handle_tool_call(tool_call, conversation_history, catalog, spill=None):
+    """
+    Handle a single tool call for both OpenAI and Llama formats.
+    This function no longer prints directly to stdout. It updates the conversation_history
+    with the tool call and its response. The calling function can then display the results.
+    """
+    await handle_tool_calls([tool_call], conversation_history, catalog, spill)
 
 
 def format_tool_response(response_content):
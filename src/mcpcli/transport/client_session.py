@@ -0,0 +1,439 @@
+# transport/client_session.py
+import inspect
+import logging
+import time
+import traceback
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+import anyio
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+
+from mcpcli.deadline_policy import DeadlinePolicy
+from mcpcli.messages.message_types.cancelled_message import (
+    CancelledNotificationMessage,
+)
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+from mcpcli.transport.metered_stream import StreamMetrics
+
+# Notifications waiting for their handlers before further ones are dropped
+NOTIFICATION_QUEUE_SIZE = 256
+
+# Ids of cancelled requests remembered so their late responses can be recognized
+CANCELLED_ID_LIMIT = 1024
+
+# Seconds spent trying to tell the server a request was cancelled
+CANCEL_SEND_TIMEOUT = 1
+
+# JSON-RPC error codes used when answering server-initiated requests
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+# MCP log levels (notifications/message) mapped onto Python logging levels
+LOG_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "notice": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+    "alert": logging.CRITICAL,
+    "emergency": logging.CRITICAL,
+}
+
+
+class ClientSession:
+    """
+    A per-server JSON-RPC session on top of a transport's (read_stream, write_stream) pair.
+
+    A single background reader task owns the read stream and routes every response to
+    the caller awaiting its id, so any number of requests can be in flight at once over
+    one pipe. Server notifications are handed to their handlers on a separate task and
+    server-initiated requests are answered by theirs, so neither is ever mistaken for
+    a response. Use it as an async context manager around the transport streams:
+
+        async with stdio_client(params) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                response = await session.send_request(PingMessage())
+    """
+
+    # sessions currently attached to a write stream, so the send_* helpers can find them
+    _sessions: "weakref.WeakKeyDictionary[MemoryObjectSendStream, ClientSession]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(
+        self,
+        read_stream: MemoryObjectReceiveStream,
+        write_stream: MemoryObjectSendStream,
+        deadlines: Optional[DeadlinePolicy] = None,
+    ):
+        self.read_stream = read_stream
+        self.write_stream = write_stream
+
+        # request timeouts and retry backoff, adapted to observed latencies
+        self.deadlines = deadlines or DeadlinePolicy()
+
+        # pending requests keyed by JSON-RPC id, each with a one-shot response stream
+        self._pending: Dict[str, MemoryObjectSendStream] = {}
+
+        # ids of requests given up on, oldest first; their responses are discarded
+        self._cancelled: Dict[str, None] = {}
+
+        # handlers for server notifications, keyed by method; the defaults are only
+        # used for methods nobody subscribed to
+        self._notification_callbacks: Dict[str, List[Callable]] = {}
+        self._default_notification_callbacks: Dict[str, Callable] = {
+            "notifications/message": self._log_server_message,
+            "notifications/progress": self._log_progress,
+        }
+
+        # handlers for requests sent by the server, keyed by method
+        self._request_handlers: Dict[str, Callable] = {"ping": lambda message: {}}
+
+        self._notification_writer, self._notification_reader = (
+            anyio.create_memory_object_stream(NOTIFICATION_QUEUE_SIZE)
+        )
+        self._task_group = None
+        self._closed = False
+        self._close_reason: Optional[str] = None
+        self._closed_event: Optional[anyio.Event] = None
+
+        # when a request other than a ping was last sent or answered, for idle reaping
+        self.last_activity = time.monotonic()
+
+    @classmethod
+    def for_stream(cls, write_stream) -> Optional["ClientSession"]:
+        """Return the session attached to the given write stream, if any."""
+        try:
+            return cls._sessions.get(write_stream)
+        except TypeError:
+            # not weak-referenceable (e.g. None or a mock), so it can't have a session
+            return None
+
+    def on_notification(
+        self, method: str, callback: Callable[[JSONRPCMessage], Any]
+    ) -> None:
+        """
+        Call `callback` with every notification the server sends for `method`.
+
+        Callbacks may be plain functions or coroutine functions. They run one at a time,
+        in arrival order, on a task of their own, so a slow callback delays later
+        notifications but never a response.
+        """
+        self._notification_callbacks.setdefault(method, []).append(callback)
+
+    def on_request(self, method: str, handler: Callable[[JSONRPCMessage], Any]) -> None:
+        """
+        Answer server-initiated requests for `method` with the result of `handler`.
+
+        The handler may be a plain function or a coroutine function and returns the
+        result dict; an exception is sent back as a JSON-RPC error. Requests for
+        methods without a handler are answered with "method not found".
+        """
+        self._request_handlers[method] = handler
+
+    @property
+    def pending_count(self) -> int:
+        """Number of requests currently awaiting a response."""
+        return len(self._pending)
+
+    def stream_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the backpressure counters of the transport streams.
+
+        Streams from stdio_client are metered; for other transports the result is
+        empty. A read depth that stays near capacity, or time blocked in write sends,
+        means the session or the server is falling behind.
+        """
+        stats = {}
+        for direction, stream in (
+            ("read", self.read_stream),
+            ("write", self.write_stream),
+        ):
+            metrics = StreamMetrics.for_stream(stream)
+            if metrics:
+                stats[direction] = metrics.as_dict()
+        return stats
+
+    @property
+    def closed(self) -> bool:
+        """Whether the transport has closed or the session was aborted."""
+        return self._closed
+
+    async def wait_closed(self) -> None:
+        """Wait until the transport closes, e.g. because the server exited."""
+        await self._closed_event.wait()
+
+    def abort(self, reason: str) -> None:
+        """
+        Fail every pending and future request with ConnectionError(`reason`).
+
+        Used when the server is known to be gone, so callers fail at once instead
+        of waiting out their timeouts.
+        """
+        self._closed = True
+        self._close_reason = reason
+        self._fail_pending()
+        if self._closed_event:
+            self._closed_event.set()
+
+    def inherit_handlers(self, other: "ClientSession") -> None:
+        """Take over the notification and request handlers registered on `other`."""
+        for method, callbacks in other._notification_callbacks.items():
+            self._notification_callbacks.setdefault(method, []).extend(callbacks)
+        self._request_handlers.update(other._request_handlers)
+
+    async def __aenter__(self) -> "ClientSession":
+        self._closed_event = anyio.Event()
+        self._task_group = anyio.create_task_group()
+        await self._task_group.__aenter__()
+        self._task_group.start_soon(self._receive_loop)
+        self._task_group.start_soon(self._dispatch_notifications)
+        type(self)._sessions[self.write_stream] = self
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, tb):
+        # an aborted session stays registered, so late callers still get its reason
+        if self._close_reason is None:
+            type(self)._sessions.pop(self.write_stream, None)
+        self._task_group.cancel_scope.cancel()
+        try:
+            return await self._task_group.__aexit__(exc_type, exc_value, tb)
+        finally:
+            self._fail_pending()
+
+    async def _receive_loop(self):
+        """Route each incoming message to the request awaiting its id."""
+        logging.debug("Starting session receive loop")
+        try:
+            async for message in self.read_stream:
+                if isinstance(message, Exception):
+                    logging.error(f"Error from server: {message}")
+                    continue
+
+                # notifications and server-initiated requests carry a method
+                if message.method:
+                    if message.id is None:
+                        self._queue_notification(message)
+                    else:
+                        self._task_group.start_soon(self._handle_request, message)
+                    continue
+
+                # responses carry an id and either a result or an error
+                is_response = message.result is not None or message.error is not None
+                responder = self._pending.pop(message.id, None) if is_response else None
+                if responder is None:
+                    if message.id in self._cancelled:
+                        del self._cancelled[message.id]
+                        logging.debug(f"Discarding late response for id {message.id}")
+                    else:
+                        logging.debug(f"Unmatched message from server: {message.id}")
+                    continue
+
+                with responder:
+                    try:
+                        responder.send_nowait(message)
+                    except (anyio.WouldBlock, anyio.BrokenResourceError):
+                        # the caller has already given up on this request
+                        logging.debug(f"Dropping late response for id {message.id}")
+        except anyio.ClosedResourceError:
+            logging.debug("Session read stream closed.")
+        except Exception as exc:
+            logging.error(f"Unexpected error in session receive loop: {exc}")
+            logging.debug(f"Traceback:\n{traceback.format_exc()}")
+        finally:
+            self._closed = True
+            self._fail_pending()
+            self._closed_event.set()
+            self._notification_writer.close()
+            logging.debug("Exiting session receive loop")
+
+    def _queue_notification(self, message: JSONRPCMessage):
+        try:
+            self._notification_writer.send_nowait(message)
+        except anyio.WouldBlock:
+            logging.warning(
+                f"Notification handlers are falling behind; dropping {message.method}"
+            )
+
+    async def _dispatch_notifications(self):
+        """Run the handlers of each queued notification, in arrival order."""
+        async with self._notification_reader:
+            async for message in self._notification_reader:
+                await self._notify(message)
+
+    async def _notify(self, message: JSONRPCMessage):
+        """Pass a server notification to the callbacks registered for it."""
+        callbacks = self._notification_callbacks.get(message.method)
+        if not callbacks:
+            default = self._default_notification_callbacks.get(message.method)
+            if not default:
+                logging.debug(f"Unhandled notification from server: {message.method}")
+                return
+            callbacks = [default]
+        for callback in callbacks:
+            try:
+                result = callback(message)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as exc:
+                logging.error(f"Error in '{message.method}' callback: {exc}")
+
+    async def _handle_request(self, message: JSONRPCMessage):
+        """
+        Answer a request sent by the server.
+
+        Failures are answered with an error response, or logged if even that can't
+        be built, so a bad server request never takes the session down.
+        """
+        try:
+            handler = self._request_handlers.get(message.method)
+            if handler is None:
+                logging.debug(f"Unsupported request from server: {message.method}")
+                response = JSONRPCMessage(
+                    id=message.id,
+                    error={
+                        "code": METHOD_NOT_FOUND,
+                        "message": f"Method not found: {message.method}",
+                    },
+                )
+            else:
+                try:
+                    result = handler(message)
+                    if inspect.isawaitable(result):
+                        result = await result
+                    response = JSONRPCMessage(id=message.id, result=result or {})
+                except Exception as exc:
+                    logging.error(f"Error handling '{message.method}' request: {exc}")
+                    response = JSONRPCMessage(
+                        id=message.id,
+                        error={"code": INTERNAL_ERROR, "message": str(exc)},
+                    )
+        except Exception as exc:
+            logging.error(f"Cannot answer '{message.method}' request: {exc}")
+            return
+
+        try:
+            await self.write_stream.send(response)
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            logging.debug(f"Session closed before answering '{message.method}'")
+
+    @staticmethod
+    def _log_server_message(message: JSONRPCMessage):
+        """Write a server's notifications/message log entry to the client log."""
+        params = message.params or {}
+        level = LOG_LEVELS.get(params.get("level"), logging.INFO)
+        logger = params.get("logger") or "server"
+        logging.log(level, f"[{logger}] {params.get('data')}")
+
+    @staticmethod
+    def _log_progress(message: JSONRPCMessage):
+        params = message.params or {}
+        total = params.get("total")
+        logging.debug(
+            f"Progress {params.get('progressToken')}: {params.get('progress')}"
+            + (f"/{total}" if total is not None else "")
+        )
+
+    def _fail_pending(self):
+        """Wake every pending caller by closing its response stream."""
+        for responder in self._pending.values():
+            responder.close()
+        self._pending.clear()
+
+    async def send_request(
+        self, message: JSONRPCMessage, timeout: Optional[float] = None
+    ) -> JSONRPCMessage:
+        """
+        Send a JSON-RPC request and wait for the response carrying the same id.
+
+        If the caller stops waiting, on timeout or cancellation, the server is sent
+        `notifications/cancelled` for the id and a late response is discarded.
+
+        Args:
+            message (JSONRPCMessage): The request to send. Must have an id.
+            timeout (Optional[float]): Timeout in seconds to wait for the response.
+                Defaults to the session's deadline policy for the method.
+
+        Returns:
+            JSONRPCMessage: The matching response.
+
+        Raises:
+            TimeoutError: If no response is received within the timeout.
+            ConnectionError: If the session closes before the response arrives.
+        """
+        if message.id is None:
+            raise ValueError("Requests must have an id; use send_notification instead.")
+        if self._closed:
+            raise ConnectionError(self._close_reason or "Session is closed.")
+        if message.id in self._pending:
+            raise ValueError(f"A request with id '{message.id}' is already in flight.")
+
+        if timeout is None:
+            timeout = self.deadlines.timeout_for(message)
+
+        active = message.method != "ping"
+        if active:
+            self.last_activity = time.monotonic()
+        send_stream, receive_stream = anyio.create_memory_object_stream(1)
+        self._pending[message.id] = send_stream
+        sent = False
+        reason = "Request cancelled by the client"
+        try:
+            with receive_stream:
+                await self.write_stream.send(message)
+                sent = True
+                started = time.perf_counter()
+                try:
+                    with anyio.fail_after(timeout):
+                        response = await receive_stream.receive()
+                    self.deadlines.record(message, time.perf_counter() - started)
+                    return response
+                except TimeoutError:
+                    reason = f"No response within {timeout} seconds"
+                    # a timeout is a sample of at least that long, so a timeout that
+                    # adapted too tight can grow back
+                    self.deadlines.record(
+                        message, max(timeout, time.perf_counter() - started)
+                    )
+                    raise
+                except anyio.EndOfStream:
+                    raise ConnectionError(
+                        self._close_reason
+                        or f"Session closed while waiting for '{message.method}' response."
+                    )
+        finally:
+            if active:
+                self.last_activity = time.monotonic()
+            # the entry is normally popped by the reader; still there means we gave up
+            if self._pending.get(message.id) is send_stream:
+                del self._pending[message.id]
+                send_stream.close()
+                if sent:
+                    await self.cancel_request(message.id, reason)
+
+    async def cancel_request(self, request_id, reason: Optional[str] = None) -> None:
+        """
+        Tell the server to stop working on a request and discard its late response.
+
+        Safe to call from a cancelled scope; the notification is still sent.
+        """
+        self._cancelled[request_id] = None
+        if len(self._cancelled) > CANCELLED_ID_LIMIT:
+            del self._cancelled[next(iter(self._cancelled))]
+        if self._closed:
+            return
+
+        logging.debug(f"Cancelling request {request_id}: {reason}")
+        with anyio.move_on_after(CANCEL_SEND_TIMEOUT, shield=True):
+            try:
+                await self.write_stream.send(
+                    CancelledNotificationMessage(request_id, reason)
+                )
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                pass
+
+    async def send_notification(self, message: JSONRPCMessage) -> None:
+        """Send a JSON-RPC notification, which expects no response."""
+        await self.write_stream.send(message)
@@ -0,0 +1,124 @@
+# transport/daemon/daemon_client.py
+import json
+import logging
+import os
+import sys
+import tempfile
+import traceback
+from contextlib import asynccontextmanager
+
+import anyio
+from anyio.streams.buffered import BufferedByteReceiveStream
+
+from mcpcli.messages.json_codec import decode_message, get_codec
+from mcpcli.transport.stdio.stdio_server_parameters import StdioServerParameters
+
+# Largest single line accepted on the daemon socket
+MAX_LINE_BYTES = 64 * 1024 * 1024
+
+
+class DaemonUnavailableError(Exception):
+    """Raised when the daemon is not running or cannot serve the requested server."""
+
+
+def default_socket_path() -> str:
+    """Return the per-user socket path the daemon listens on."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"mcp-cli-{os.getuid()}.sock")
+
+
+def daemon_supported() -> bool:
+    """Unix sockets are required to talk to the daemon."""
+    return sys.platform != "win32"
+
+
+async def read_line(stream: BufferedByteReceiveStream) -> dict:
+    """Read one newline-delimited JSON object from the socket."""
+    return json.loads(await stream.receive_until(b"\n", MAX_LINE_BYTES))
+
+
+@asynccontextmanager
+async def daemon_client(
+    socket_path: str, server_name: str, server: StdioServerParameters
+):
+    """
+    Attach to a server kept warm by `mcp-cli serve`.
+
+    Yields the same (read_stream, write_stream) contract as stdio_client. The daemon
+    only accepts the attach if it runs the server with identical parameters, so a
+    different configuration never gets served by the wrong process.
+
+    Raises:
+        DaemonUnavailableError: If the daemon is not running or does not run the server.
+    """
+    try:
+        socket = await anyio.connect_unix(socket_path)
+    except OSError as exc:
+        raise DaemonUnavailableError(f"Daemon not reachable at {socket_path}: {exc}")
+
+    receiver = BufferedByteReceiveStream(socket)
+    try:
+        # attach to the named server
+        hello = {"server": server_name, "params": server.model_dump()}
+        await socket.send((json.dumps(hello) + "\n").encode())
+        reply = await read_line(receiver)
+    except (OSError, anyio.EndOfStream, anyio.IncompleteRead, ValueError) as exc:
+        await socket.aclose()
+        raise DaemonUnavailableError(f"Daemon handshake failed: {exc}")
+
+    if not isinstance(reply, dict) or not reply.get("ok"):
+        await socket.aclose()
+        error = reply.get("error") if isinstance(reply, dict) else None
+        raise DaemonUnavailableError(error or "Daemon refused the attach")
+
+    logging.debug(f"Attached to daemon for server '{server_name}'")
+
+    # create the the read and write streams
+    codec = get_codec()
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+
+    async def socket_reader():
+        """Read JSON-RPC messages relayed by the daemon."""
+        try:
+            async with read_stream_writer:
+                while True:
+                    try:
+                        line = await receiver.receive_until(b"\n", MAX_LINE_BYTES)
+                    except (anyio.EndOfStream, anyio.IncompleteRead):
+                        break
+                    try:
+                        message = decode_message(line, codec)
+                    except Exception as exc:
+                        logging.error(f"Error processing daemon message: {exc}")
+                        continue
+                    await read_stream_writer.send(message)
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            logging.debug("Daemon read stream closed.")
+        except Exception as exc:
+            logging.error(f"Unexpected error in daemon socket_reader: {exc}")
+            logging.debug(f"Traceback:\n{traceback.format_exc()}")
+            raise
+
+    async def socket_writer():
+        """Relay JSON-RPC messages from the write stream to the daemon."""
+        try:
+            async with write_stream_reader:
+                async for message in write_stream_reader:
+                    json_str = message.model_dump_json(exclude_none=True)
+                    await socket.send((json_str + "\n").encode())
+            await socket.send_eof()
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            logging.debug("Daemon write stream closed.")
+        except Exception as exc:
+            logging.error(f"Unexpected error in daemon socket_writer: {exc}")
+            logging.debug(f"Traceback:\n{traceback.format_exc()}")
+            raise
+
+    async with socket, anyio.create_task_group() as tg:
+        tg.start_soon(socket_reader)
+        tg.start_soon(socket_writer)
+        try:
+            yield read_stream, write_stream
+        finally:
+            tg.cancel_scope.cancel()
@@ -0,0 +1,155 @@
+# transport/http/http_client.py
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import anyio
+import httpx
+
+from mcpcli.messages.json_codec import decode_message, get_codec
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+from mcpcli.transport.http.http_server_parameters import HttpServerParameters
+from mcpcli.transport.http.sse import iter_sse_data
+from mcpcli.transport.metered_stream import create_metered_stream
+
+# Header carrying the session id a server may assign in its initialize response
+SESSION_HEADER = "Mcp-Session-Id"
+
+# Seconds to wait for a connection, for a request body to be sent, and for the
+# session to be ended on exit; responses may stream for as long as they need
+CONNECT_TIMEOUT = 10.0
+WRITE_TIMEOUT = 30.0
+CLOSE_TIMEOUT = 2.0
+
+# JSON-RPC error code of the response made up for a request that couldn't be delivered
+TRANSPORT_ERROR = -32000
+
+
+@asynccontextmanager
+async def http_client(server: HttpServerParameters):
+    """
+    Talk to an MCP server over Streamable HTTP.
+
+    Yields the same (read_stream, write_stream) contract as stdio_client. Each
+    message written is POSTed to the server's URL, concurrently, over a pool of
+    keep-alive connections. The server answers with a JSON body, or with an SSE
+    stream that may carry notifications and server requests before the response.
+    Once initialized, a GET stream delivers the messages the server sends outside
+    of any request, if it offers one.
+
+    A request that can't be delivered is answered with a TRANSPORT_ERROR response,
+    so the caller fails at once instead of waiting out its timeout.
+    """
+    # create the read and write streams, metered like stdio_client's
+    read_stream_writer, read_stream = create_metered_stream(
+        f"{server.url} read",
+        server.read_buffer_size,
+        server.notification_policy,
+    )
+    write_stream, write_stream_reader = create_metered_stream(
+        f"{server.url} write", server.write_buffer_size
+    )
+
+    codec = get_codec()
+    session_id: Optional[str] = None
+
+    def request_headers(accept: str) -> dict:
+        headers = {"Accept": accept}
+        if session_id:
+            headers[SESSION_HEADER] = session_id
+        return headers
+
+    async def deliver(data) -> None:
+        try:
+            await read_stream_writer.send(decode_message(data, codec))
+        except ValueError as exc:
+            logging.error(f"JSON decode error from {server.url}: {exc}")
+
+    async def receive_body(response: httpx.Response) -> None:
+        """Pass on the message in a JSON body, or every message in an SSE stream."""
+        content_type = response.headers.get("content-type", "")
+        if content_type.startswith("text/event-stream"):
+            async for data in iter_sse_data(response.aiter_lines()):
+                await deliver(data)
+        else:
+            body = await response.aread()
+            if body.strip():
+                await deliver(body)
+
+    async def post(client: httpx.AsyncClient, message: JSONRPCMessage, tg) -> None:
+        nonlocal session_id
+        headers = request_headers("application/json, text/event-stream")
+        headers["Content-Type"] = "application/json"
+        try:
+            async with client.stream(
+                "POST",
+                server.url,
+                content=message.model_dump_json(exclude_none=True),
+                headers=headers,
+            ) as response:
+                response.raise_for_status()
+                session_id = response.headers.get(SESSION_HEADER, session_id)
+                await receive_body(response)
+            if message.method == "initialize":
+                tg.start_soon(listen, client)
+        except httpx.HTTPError as exc:
+            logging.error(
+                f"Error sending '{message.method or message.id}' to {server.url}: {exc}"
+            )
+            if message.method and message.id is not None:
+                error = {"code": TRANSPORT_ERROR, "message": f"HTTP transport error: {exc}"}
+                await read_stream_writer.send(JSONRPCMessage(id=message.id, error=error))
+
+    async def listen(client: httpx.AsyncClient) -> None:
+        """Receive the messages the server sends outside of any request."""
+        try:
+            async with client.stream(
+                "GET", server.url, headers=request_headers("text/event-stream")
+            ) as response:
+                if response.status_code == 405:
+                    logging.debug(f"{server.url} offers no server message stream")
+                    return
+                response.raise_for_status()
+                await receive_body(response)
+        except httpx.HTTPError as exc:
+            logging.debug(f"Server message stream of {server.url} closed: {exc}")
+
+    async def post_messages(client: httpx.AsyncClient, tg) -> None:
+        """POST every message written to the write stream."""
+        async with write_stream_reader:
+            async for message in write_stream_reader:
+                if message.method == "initialize":
+                    # later messages need the session id its response assigns
+                    await post(client, message, tg)
+                else:
+                    tg.start_soon(post, client, message, tg)
+
+    async def end_session(client: httpx.AsyncClient) -> None:
+        with anyio.move_on_after(CLOSE_TIMEOUT, shield=True):
+            try:
+                await client.delete(server.url, headers=request_headers("*/*"))
+            except httpx.HTTPError as exc:
+                logging.debug(f"Unable to end session with {server.url}: {exc}")
+
+    limits = httpx.Limits(
+        max_connections=server.max_connections,
+        max_keepalive_connections=server.max_connections,
+        keepalive_expiry=server.keepalive_expiry,
+    )
+    timeout = httpx.Timeout(None, connect=CONNECT_TIMEOUT, write=WRITE_TIMEOUT)
+    async with httpx.AsyncClient(
+        headers=server.headers, limits=limits, timeout=timeout
+    ) as client:
+        try:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(post_messages, client, tg)
+                if server.notification_policy == "spill":
+                    tg.start_soon(read_stream_writer.drain_spill)
+                try:
+                    yield read_stream, write_stream
+                finally:
+                    tg.cancel_scope.cancel()
+        finally:
+            read_stream_writer.close()
+            if session_id:
+                await end_session(client)
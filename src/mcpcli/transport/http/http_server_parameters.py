@@ -0,0 +1,24 @@
+# transport/http/http_server_parameters.py
+from pydantic import BaseModel
+from typing import Dict, Literal, Optional
+
+from mcpcli.transport.metered_stream import (
+    DEFAULT_NOTIFICATION_POLICY,
+    DEFAULT_READ_BUFFER_SIZE,
+    DEFAULT_WRITE_BUFFER_SIZE,
+)
+
+# Connections kept open to one server, which is also the number of concurrent POSTs
+DEFAULT_MAX_CONNECTIONS = 10
+
+# Seconds an idle pooled connection is kept alive
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+class HttpServerParameters(BaseModel):
+    url: str
+    headers: Optional[Dict[str, str]] = None
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY
+    read_buffer_size: int = DEFAULT_READ_BUFFER_SIZE
+    write_buffer_size: int = DEFAULT_WRITE_BUFFER_SIZE
+    notification_policy: Literal["block", "drop", "spill"] = DEFAULT_NOTIFICATION_POLICY
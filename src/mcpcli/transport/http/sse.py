@@ -0,0 +1,36 @@
+# transport/http/sse.py
+from typing import AsyncIterator, List
+
+
+async def iter_sse_data(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Yield the data of each `message` event in a text/event-stream.
+
+    Multi-line data is joined with newlines, comments and `id`/`retry` fields are
+    ignored, and events of other types are skipped.
+    """
+    data: List[str] = []
+    event = "message"
+    async for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            # a blank line dispatches the event
+            if data and event == "message":
+                yield "\n".join(data)
+            data = []
+            event = "message"
+            continue
+        if line.startswith(":"):
+            continue
+
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            data.append(value)
+        elif field == "event":
+            event = value or "message"
+
+    # a stream may end without the final blank line
+    if data and event == "message":
+        yield "\n".join(data)
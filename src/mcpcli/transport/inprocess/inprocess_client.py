@@ -0,0 +1,120 @@
+# transport/inprocess/inprocess_client.py
+import importlib
+import logging
+import traceback
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable
+
+import anyio
+
+from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+from mcpcli.transport.inprocess.inprocess_server_parameters import (
+    InProcessServerParameters,
+)
+from mcpcli.transport.metered_stream import MeteredSendStream, create_metered_stream
+
+# Seconds a server gets to return after its read stream ends, before it is cancelled
+SHUTDOWN_TIMEOUT = 1.0
+
+
+def load_entry_point(entry_point: str) -> Callable[..., Awaitable[Any]]:
+    """
+    Import a server from a `module:object` reference.
+
+    The object may be a dotted attribute path (`package.module:app.serve`).
+    """
+    module_name, _, object_path = entry_point.partition(":")
+    if not module_name or not object_path:
+        raise ValueError(f"Entry point must look like 'module:object': {entry_point}")
+
+    obj = importlib.import_module(module_name)
+    for attribute in object_path.split("."):
+        obj = getattr(obj, attribute)
+    if not callable(obj):
+        raise ValueError(f"Entry point {entry_point} is not callable")
+    return obj
+
+
+class ServerWriteStream:
+    """
+    The stream a server sends its messages on.
+
+    Accepts JSONRPCMessage objects as they are, and plain dicts, which are wrapped
+    without validation like decoded stdout lines are.
+    """
+
+    def __init__(self, stream: MeteredSendStream):
+        self._stream = stream
+
+    async def send(self, message) -> None:
+        if isinstance(message, dict):
+            message = JSONRPCMessage.model_construct(**message)
+        await self._stream.send(message)
+
+    def close(self) -> None:
+        self._stream.close()
+
+    async def aclose(self) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "ServerWriteStream":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, tb) -> None:
+        self.close()
+
+
+@asynccontextmanager
+async def inprocess_client(server: InProcessServerParameters):
+    """
+    Run a Python MCP server in this process and talk to it over memory streams.
+
+    Yields the same (read_stream, write_stream) contract as stdio_client. The entry
+    point is called as `await entry(read_stream, write_stream)`: it receives the
+    client's JSONRPCMessage objects until its read stream ends, and sends
+    JSONRPCMessage objects or dicts back. Messages are handed over by reference,
+    with no encoding, so neither side may modify a message after sending it.
+
+    The server shares the event loop: blocking or CPU-heavy work must go to a
+    worker thread, or it stalls the client. When the server returns or raises, the
+    read stream ends, which the session reports as the server having exited.
+    """
+    entry = load_entry_point(server.entry_point)
+
+    # create the read and write streams, metered like stdio_client's
+    read_stream_writer, read_stream = create_metered_stream(
+        f"{server.entry_point} read",
+        server.read_buffer_size,
+        server.notification_policy,
+    )
+    write_stream, write_stream_reader = create_metered_stream(
+        f"{server.entry_point} write", server.write_buffer_size
+    )
+
+    done = anyio.Event()
+
+    async def run_server():
+        try:
+            async with write_stream_reader, ServerWriteStream(
+                read_stream_writer
+            ) as server_writer:
+                await entry(write_stream_reader, server_writer)
+            logging.debug(f"In-process server {server.entry_point} returned")
+        except Exception as exc:
+            logging.error(f"In-process server {server.entry_point} failed: {exc}")
+            logging.debug(f"Traceback:\n{traceback.format_exc()}")
+        finally:
+            done.set()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(run_server)
+        if server.notification_policy == "spill":
+            tg.start_soon(read_stream_writer.drain_spill)
+        try:
+            yield read_stream, write_stream
+        finally:
+            # no more messages; the server should return on its own
+            write_stream.close()
+            with anyio.move_on_after(SHUTDOWN_TIMEOUT):
+                await done.wait()
+            tg.cancel_scope.cancel()
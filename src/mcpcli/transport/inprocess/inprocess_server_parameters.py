@@ -0,0 +1,15 @@
+# transport/inprocess/inprocess_server_parameters.py
+from pydantic import BaseModel
+from typing import Literal
+
+from mcpcli.transport.metered_stream import (
+    DEFAULT_NOTIFICATION_POLICY,
+    DEFAULT_READ_BUFFER_SIZE,
+    DEFAULT_WRITE_BUFFER_SIZE,
+)
+
+class InProcessServerParameters(BaseModel):
+    entry_point: str
+    read_buffer_size: int = DEFAULT_READ_BUFFER_SIZE
+    write_buffer_size: int = DEFAULT_WRITE_BUFFER_SIZE
+    notification_policy: Literal["block", "drop", "spill"] = DEFAULT_NOTIFICATION_POLICY
@@ -0,0 +1,203 @@
+# transport/metered_stream.py
+import collections
+import logging
+import time
+import weakref
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import anyio
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+
+# Messages buffered between the transport and the session, in each direction
+DEFAULT_READ_BUFFER_SIZE = 64
+DEFAULT_WRITE_BUFFER_SIZE = 16
+
+# What to do with a server notification when the read buffer is full:
+# "block" waits for room, "drop" discards it, "spill" queues it in an overflow buffer
+NOTIFICATION_POLICIES = ("block", "drop", "spill")
+DEFAULT_NOTIFICATION_POLICY = "block"
+
+# Notifications held in the overflow buffer before further ones are dropped
+DEFAULT_SPILL_LIMIT = 1024
+
+
+class StreamMetrics:
+    """
+    Backpressure counters for one buffered memory object stream.
+
+    Queue depth is read from the stream itself; the rest is recorded by the
+    MeteredSendStream writing to it.
+    """
+
+    # metrics of the streams created by create_metered_stream, keyed by either end
+    _metrics: "weakref.WeakKeyDictionary[Any, StreamMetrics]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(self, name: str, capacity: int):
+        self.name = name
+        self.capacity = capacity
+        self.sent = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.blocked_sends = 0
+        self.blocked_seconds = 0.0
+        self.high_water = 0
+        self._receive_stream: Optional[MemoryObjectReceiveStream] = None
+        self._spill: Deque = collections.deque()
+
+    @classmethod
+    def for_stream(cls, stream) -> Optional["StreamMetrics"]:
+        """Return the metrics of a metered stream, or None for any other stream."""
+        try:
+            return cls._metrics.get(stream)
+        except TypeError:
+            return None
+
+    @property
+    def depth(self) -> int:
+        """Messages waiting to be received, including spilled notifications."""
+        stats = self._receive_stream.statistics() if self._receive_stream else None
+        return (stats.current_buffer_used if stats else 0) + len(self._spill)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "depth": self.depth,
+            "high_water": self.high_water,
+            "sent": self.sent,
+            "blocked_sends": self.blocked_sends,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "spilled": self.spilled,
+            "dropped": self.dropped,
+        }
+
+
+class MeteredSendStream:
+    """
+    The sending end of a memory object stream that records backpressure.
+
+    Sends that find the buffer full are timed. With a "drop" or "spill" policy,
+    server notifications never wait for room: they are discarded, or queued in an
+    overflow buffer that a background task feeds into the stream as it drains.
+    Spilled notifications keep their order among themselves but may be received
+    after responses that arrived later.
+    """
+
+    def __init__(
+        self,
+        stream: MemoryObjectSendStream,
+        metrics: StreamMetrics,
+        notification_policy: str = DEFAULT_NOTIFICATION_POLICY,
+        spill_limit: int = DEFAULT_SPILL_LIMIT,
+    ):
+        if notification_policy not in NOTIFICATION_POLICIES:
+            raise ValueError(f"Unknown notification policy: {notification_policy}")
+        self._stream = stream
+        self.metrics = metrics
+        self.notification_policy = notification_policy
+        self.spill_limit = spill_limit
+        self._spill_ready = anyio.Event()
+        self._closed = False
+
+    def _record_sent(self) -> None:
+        self.metrics.sent += 1
+        used = self._stream.statistics().current_buffer_used
+        if used > self.metrics.high_water:
+            self.metrics.high_water = used
+
+    async def send(self, item) -> None:
+        if self.notification_policy != "block" and _is_notification(item):
+            self._send_notification(item)
+            return
+
+        try:
+            self._stream.send_nowait(item)
+        except anyio.WouldBlock:
+            self.metrics.blocked_sends += 1
+            start = time.monotonic()
+            try:
+                await self._stream.send(item)
+            finally:
+                self.metrics.blocked_seconds += time.monotonic() - start
+        self._record_sent()
+
+    def _send_notification(self, item) -> None:
+        spill = self.metrics._spill
+        if not spill:
+            try:
+                self._stream.send_nowait(item)
+                self._record_sent()
+                return
+            except anyio.WouldBlock:
+                pass
+
+        if self.notification_policy == "drop" or len(spill) >= self.spill_limit:
+            self.metrics.dropped += 1
+            logging.debug(f"{self.metrics.name} buffer full; dropping {item.method}")
+            return
+
+        spill.append(item)
+        self.metrics.spilled += 1
+        self._spill_ready.set()
+
+    async def drain_spill(self) -> None:
+        """Feed spilled notifications into the stream until it is closed."""
+        spill = self.metrics._spill
+        try:
+            while not self._closed:
+                await self._spill_ready.wait()
+                self._spill_ready = anyio.Event()
+                while spill:
+                    await self._stream.send(spill[0])
+                    spill.popleft()
+                    self._record_sent()
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            spill.clear()
+
+    def send_nowait(self, item) -> None:
+        self._stream.send_nowait(item)
+        self._record_sent()
+
+    def statistics(self):
+        return self._stream.statistics()
+
+    def close(self) -> None:
+        self._closed = True
+        self._spill_ready.set()
+        self._stream.close()
+
+    async def aclose(self) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "MeteredSendStream":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, tb) -> None:
+        self.close()
+
+
+def create_metered_stream(
+    name: str,
+    capacity: int,
+    notification_policy: str = DEFAULT_NOTIFICATION_POLICY,
+    spill_limit: int = DEFAULT_SPILL_LIMIT,
+) -> Tuple[MeteredSendStream, MemoryObjectReceiveStream]:
+    """
+    Create a buffered memory object stream whose sending end records backpressure.
+
+    The metrics can be looked up from either end with StreamMetrics.for_stream.
+    """
+    send_stream, receive_stream = anyio.create_memory_object_stream(capacity)
+    metrics = StreamMetrics(name, capacity)
+    metrics._receive_stream = receive_stream
+    metered = MeteredSendStream(send_stream, metrics, notification_policy, spill_limit)
+    StreamMetrics._metrics[metered] = metrics
+    StreamMetrics._metrics[receive_stream] = metrics
+    return metered, receive_stream
+
+
+def _is_notification(message) -> bool:
+    return getattr(message, "id", None) is None and bool(
+        getattr(message, "method", None)
+    )
@@ -0,0 +1,77 @@
+# transport/stdio/line_framer.py
+import logging
+from typing import List, Optional
+
+# Largest single message accepted from a server, in bytes
+DEFAULT_MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+class LineFramer:
+    """
+    Split a byte stream into newline-delimited frames.
+
+    Incoming chunks are appended to one bytearray and only the new bytes are scanned
+    for a newline, so a message spread over many chunks costs linear time. Frames are
+    returned as raw bytes and decoded once, by the JSON codec.
+
+    A frame longer than `max_frame_bytes` is dropped, together with everything up to
+    its terminating newline, instead of being buffered without limit.
+    """
+
+    def __init__(self, max_frame_bytes: int = DEFAULT_MAX_FRAME_BYTES):
+        self.max_frame_bytes = max_frame_bytes
+        self.dropped_frames = 0
+        self._buffer = bytearray()
+        self._discarding = False
+
+    @property
+    def buffered(self) -> int:
+        """Number of bytes of an incomplete frame held in the buffer."""
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> List[bytearray]:
+        """Add a chunk and return the frames it completes."""
+        buffer = self._buffer
+        scan_from = len(buffer)
+        buffer += data
+
+        frames = []
+        start = 0
+        end = buffer.find(b"\n", scan_from)
+        while end != -1:
+            if self._discarding:
+                # the rest of an oversized frame
+                self._discarding = False
+            elif end - start > self.max_frame_bytes:
+                self._drop(end - start)
+            else:
+                frame = buffer[start:end]
+                if frame and not frame.isspace():
+                    frames.append(frame)
+            start = end + 1
+            end = buffer.find(b"\n", start)
+        del buffer[:start]
+
+        # an incomplete frame that is already too large is not kept
+        if len(buffer) > self.max_frame_bytes:
+            if not self._discarding:
+                self._drop(len(buffer))
+                self._discarding = True
+            buffer.clear()
+
+        return frames
+
+    def finish(self) -> Optional[bytearray]:
+        """Return the unterminated frame left at the end of the stream, if any."""
+        frame = self._buffer
+        self._buffer = bytearray()
+        if self._discarding or not frame or frame.isspace():
+            return None
+        return frame
+
+    def _drop(self, size: int) -> None:
+        self.dropped_frames += 1
+        logging.error(
+            f"Dropping message of at least {size} bytes; "
+            f"the limit is {self.max_frame_bytes} bytes."
+        )
@@ -0,0 +1,41 @@
+# transport/stdio/process_memory.py
+import os
+from typing import Optional
+
+
+def _children(pid: int):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as children_file:
+            return [int(child) for child in children_file.read().split()]
+    except (OSError, ValueError):
+        return []
+
+
+def _rss(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """
+    Return the resident memory of a process and its descendants, in bytes.
+
+    Servers are often launched through a wrapper (`uvx`, `npx`), so the children
+    are counted too. Returns None where /proc is not available.
+    """
+    if not os.path.isdir(f"/proc/{pid}"):
+        return None
+
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        total += _rss(current) or 0
+        pending.extend(_children(current))
+    return total
@@ -1,17 +1,30 @@
 # transport/stdio/stdio_client.py
-import json
 import logging
 import sys
 import traceback
+import weakref
 from contextlib import asynccontextmanager
+from typing import Optional
 
 import anyio
-from anyio.streams.text import TextReceiveStream
 
 from mcpcli.environment import get_default_environment
-from mcpcli.messages.message_types.json_rpc_message import JSONRPCMessage
+from mcpcli.messages.json_codec import decode_message, get_codec
+from mcpcli.transport.metered_stream import create_metered_stream
+from mcpcli.transport.stdio.line_framer import LineFramer
 from mcpcli.transport.stdio.stdio_server_parameters import StdioServerParameters
 
+# server processes, keyed by the write stream of their client
+_processes: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def server_process(write_stream) -> Optional[anyio.abc.Process]:
+    """Return the process behind a stdio_client's write stream, if any."""
+    try:
+        return _processes.get(write_stream)
+    except TypeError:
+        return None
+
 
 @asynccontextmanager
 async def stdio_client(server: StdioServerParameters):
@@ -23,9 +36,16 @@ async def stdio_client(server: StdioServerParameters):
     if not isinstance(server.args, (list, tuple)):
         raise ValueError("Server arguments must be a list or tuple.")
 
-    # create the the read and write streams
-    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
-    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+    # create the the read and write streams; buffered so a busy caller doesn't
+    # stall the server on a full stdout pipe
+    read_stream_writer, read_stream = create_metered_stream(
+        f"{server.command} read",
+        server.read_buffer_size,
+        server.notification_policy,
+    )
+    write_stream, write_stream_reader = create_metered_stream(
+        f"{server.command} write", server.write_buffer_size
+    )
 
     # start the subprocess
     process = await anyio.open_process(
@@ -38,45 +58,45 @@ async def stdio_client(server: StdioServerParameters):
     logging.debug(
         f"Subprocess started with PID {process.pid}, command: {server.command}"
     )
+    _processes[write_stream] = process
+
+    # decode messages with the fastest JSON codec available
+    codec = get_codec()
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
 
     # create a task to read from the subprocess' stdout
-    async def process_json_line(line: str, writer):
+    async def process_json_line(line: bytearray, writer):
         try:
-            logging.debug(f"Processing line: {line.strip()}")
-            data = json.loads(line)
-
-            # parse the json
-            logging.debug(f"Parsed JSON data: {data}")
+            # only format the payload when debugging; it can be megabytes
+            if debug:
+                logging.debug(f"Processing line: {_preview(line, None)}")
 
-            # validate the jsonrpc message
-            message = JSONRPCMessage.model_validate(data)
-            logging.debug(f"Validated JSONRPCMessage: {message}")
+            # parse the envelope; the payload is passed on as decoded
+            message = decode_message(line, codec)
 
             # send the message
             await writer.send(message)
-        except json.JSONDecodeError as exc:
+        except ValueError as exc:
             # not valid json
-            logging.error(f"JSON decode error: {exc}. Line: {line.strip()}")
+            logging.error(f"JSON decode error: {exc}. Line: {_preview(line)}")
         except Exception as exc:
             # other exception
-            logging.error(f"Error processing message: {exc}. Line: {line.strip()}")
+            logging.error(f"Error processing message: {exc}. Line: {_preview(line)}")
             logging.debug(f"Traceback:\n{traceback.format_exc()}")
 
     async def stdout_reader():
         """Read JSON-RPC messages from the server's stdout."""
         assert process.stdout, "Opened process is missing stdout"
-        buffer = ""
+        framer = LineFramer(server.max_frame_bytes)
         logging.debug("Starting stdout_reader")
         try:
             async with read_stream_writer:
-                async for chunk in TextReceiveStream(process.stdout):
-                    lines = (buffer + chunk).split("\n")
-                    buffer = lines.pop()
-                    for line in lines:
-                        if line.strip():
-                            await process_json_line(line, read_stream_writer)
-                if buffer.strip():
-                    await process_json_line(buffer, read_stream_writer)
+                async for chunk in process.stdout:
+                    for line in framer.feed(chunk):
+                        await process_json_line(line, read_stream_writer)
+                line = framer.finish()
+                if line:
+                    await process_json_line(line, read_stream_writer)
         except anyio.ClosedResourceError:
             logging.debug("Read stream closed.")
         except Exception as exc:
@@ -96,6 +116,9 @@ async def stdio_client(server: StdioServerParameters):
                     json_str = message.model_dump_json(exclude_none=True)
                     logging.debug(f"Sending: {json_str}")
                     await process.stdin.send((json_str + "\n").encode())
+
+            # no more messages; closing stdin tells the server to exit
+            await process.stdin.aclose()
         except anyio.ClosedResourceError:
             logging.debug("Write stream closed.")
         except Exception as exc:
@@ -130,6 +153,8 @@ async def stdio_client(server: StdioServerParameters):
         async with anyio.create_task_group() as tg, process:
             tg.start_soon(stdout_reader)
             tg.start_soon(stdin_writer)
+            if server.notification_policy == "spill":
+                tg.start_soon(read_stream_writer.drain_spill)
             yield read_stream, write_stream
 
         # exit the task group
@@ -144,3 +169,8 @@ async def stdio_client(server: StdioServerParameters):
         raise
     finally:
         await terminate_process()
+
+
+def _preview(line: bytearray, limit: Optional[int] = 200) -> str:
+    """Return the start of a raw message for logging."""
+    return bytes(line[:limit]).decode("utf-8", errors="replace").strip()
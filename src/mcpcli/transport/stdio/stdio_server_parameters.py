@@ -1,8 +1,19 @@
 # transport/stdio/stdio_server_parameters.py
 from pydantic import BaseModel, Field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional
+
+from mcpcli.transport.metered_stream import (
+    DEFAULT_NOTIFICATION_POLICY,
+    DEFAULT_READ_BUFFER_SIZE,
+    DEFAULT_WRITE_BUFFER_SIZE,
+)
+from mcpcli.transport.stdio.line_framer import DEFAULT_MAX_FRAME_BYTES
 
 class StdioServerParameters(BaseModel):
     command: str
     args: list[str] = Field(default_factory=list)
-    env: Optional[Dict[str, str]] = None
\ No newline at end of file
+    env: Optional[Dict[str, str]] = None
+    max_frame_bytes: int = DEFAULT_MAX_FRAME_BYTES
+    read_buffer_size: int = DEFAULT_READ_BUFFER_SIZE
+    write_buffer_size: int = DEFAULT_WRITE_BUFFER_SIZE
+    notification_policy: Literal["block", "drop", "spill"] = DEFAULT_NOTIFICATION_POLICY